@@ -0,0 +1,184 @@
+"""일괄 견적 생성
+
+영업 리드 CSV(주제, 산출물, 기간, 예산 열, 선택적으로 id 열)를 한 행씩 읽어 견적을 만들고
+결과를 NDJSON 또는 CSV 로 한 행씩 내보냅니다.
+입력을 모두 읽어 두지 않고, 동시에 처리 중인 행 수(concurrency)의 두 배까지만 미리 읽어
+입력 순서대로 결과를 내보냅니다.
+행별 견적 함수는 main.make_batch_quoter() 가 만들며, 같은 슬롯 조합은 견적 캐시에서 한 번만 생성됩니다.
+대화 요청이 밀리지 않도록 LLM 대기열의 BATCH_QUEUE_SHARE 비율까지만 일괄 견적을 넣습니다.
+HTTP 요청 본문은 응답을 스트리밍하는 동안 읽을 수 없으므로 먼저 임시 파일(작으면 메모리)에 받아 둡니다.
+
+    POST /batch/quotes?format=ndjson  (본문: CSV, Content-Type: text/csv, 헤더: X-Batch-Token: $BATCH_API_TOKEN)
+    python batch_quotes.py leads.csv --format csv --concurrency 8 > quotes.csv
+"""
+import argparse
+import asyncio
+import codecs
+import contextlib
+import csv
+import io
+import itertools
+import json
+import sys
+import tempfile
+from collections import deque
+from typing import IO, Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, List
+
+# 따옴표가 닫히지 않은 레코드가 이 줄 수를 넘으면 그 자리에서 끝냄 (셀 맨 앞의 따옴표 하나가 나머지 입력을 삼키지 않도록)
+MAX_RECORD_LINES = 100
+
+RESULT_FIELDS = [
+    "line", "id", "주제", "산출물", "기간", "예산", "categories", "catalog_total",
+    "status", "duplicate", "estimate", "error",
+]
+
+
+async def spool_body(chunks: AsyncIterable[bytes], max_memory: int = 1024 * 1024) -> IO[bytes]:
+    """요청 본문을 임시 파일에 받아 처음 위치로 되돌려 반환 (max_memory 를 넘으면 디스크에 기록)"""
+    spool = tempfile.SpooledTemporaryFile(max_size=max_memory)
+    async for chunk in chunks:
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+
+async def iter_file(f: IO[bytes], chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """파일을 청크 단위로 읽고 다 읽으면 닫음"""
+    try:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    finally:
+        f.close()
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """바이트 청크를 UTF-8(BOM 허용) 줄 단위로 나눔 (줄바꿈 포함)"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        lines = pending.splitlines(keepends=True)
+        pending = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        for line in lines:
+            yield line
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def iter_csv_records(chunks: AsyncIterable[bytes]) -> AsyncIterator[List[str]]:
+    """CSV 레코드를 하나씩 값 목록으로 변환 (따옴표 안의 줄바꿈 허용)
+
+    모은 줄 뒤에 빈 줄을 하나 덧붙여 csv.reader 로 읽고, 레코드를 끝내려고 그 빈 줄까지 읽었으면
+    따옴표 안에서 줄이 끝난 것이므로 다음 줄을 더 모읍니다.
+    """
+    lines: List[str] = []
+    async for line in iter_lines(chunks):
+        lines.append(line)
+        reader = csv.reader(itertools.chain(lines, ["\n"]))
+        values = next(reader, [])
+        if reader.line_num > len(lines) and len(lines) < MAX_RECORD_LINES:
+            continue
+        lines = []
+        yield values
+    if lines:  # 따옴표가 닫히지 않은 채 입력이 끝남
+        yield next(csv.reader(lines), [])
+
+
+async def iter_csv_rows(chunks: AsyncIterable[bytes]) -> AsyncIterator[Dict[str, str]]:
+    """CSV 를 한 레코드씩 dict 로 변환 (첫 줄은 헤더, 빈 레코드는 건너뜀)"""
+    header: List[str] = []
+    async for values in iter_csv_records(chunks):
+        if not any(value.strip() for value in values):
+            continue
+        if not header:
+            header = [value.strip() for value in values]
+            continue
+        yield dict(zip(header, values))
+
+
+async def quote_rows(rows: AsyncIterable[Dict[str, str]],
+                     quote: Callable[[int, Dict[str, str]], Awaitable[Dict[str, Any]]],
+                     concurrency: int = 4) -> AsyncIterator[Dict[str, Any]]:
+    """행마다 quote(행 번호, 행) 를 동시에 최대 concurrency 개 실행하고 입력 순서대로 결과를 내보냄"""
+    semaphore = asyncio.Semaphore(concurrency)
+    window = max(1, concurrency * 2)
+
+    async def limited(line: int, row: Dict[str, str]) -> Dict[str, Any]:
+        async with semaphore:
+            return await quote(line, row)
+
+    pending: "deque[asyncio.Future]" = deque()
+    line = 0
+    try:
+        async for row in rows:
+            line += 1
+            pending.append(asyncio.ensure_future(limited(line, row)))
+            while len(pending) >= window or (pending and pending[0].done()):
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        # 클라이언트 연결이 끊기는 등 중간에 멈추면 남은 행 처리 취소
+        for future in pending:
+            future.cancel()
+
+
+async def to_ndjson(records: AsyncIterable[Dict[str, Any]]) -> AsyncIterator[str]:
+    async for record in records:
+        yield json.dumps(record, ensure_ascii=False) + "\n"
+
+
+async def to_csv(records: AsyncIterable[Dict[str, Any]]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=RESULT_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    async for record in records:
+        row = dict(record)
+        row["categories"] = ", ".join(row.get("categories", ()))
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+async def run(args) -> Dict[str, int]:
+    import main
+
+    writer = to_csv if args.format == "csv" else to_ndjson
+    counts: Dict[str, int] = {}
+
+    async def counted(records: AsyncIterable[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        async for record in records:
+            counts[record["status"]] = counts.get(record["status"], 0) + 1
+            yield record
+
+    quote = main.make_batch_quoter()
+    source = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+    records = counted(quote_rows(iter_csv_rows(iter_file(source)), quote, args.concurrency))
+    output = open(args.output, "w", encoding="utf-8", newline="") if args.output != "-" else contextlib.nullcontext(sys.stdout)
+    with output as out:
+        async for text in writer(records):
+            out.write(text)
+            out.flush()
+    main.ESTIMATE_EXECUTOR.shutdown()
+    return counts
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="입력 CSV 경로 (- 이면 표준 입력)")
+    parser.add_argument("--output", "-o", default="-", help="출력 경로 (기본: 표준 출력)")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 생성할 견적 수")
+    counts = asyncio.run(run(parser.parse_args()))
+    print(f"📦 일괄 견적 완료: {counts}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,117 @@
+"""카카오 콜백 응답 방식과 결과 확인(폴링) 방식 비교
+
+같은 대화 흐름(주제 → 산출물 → 기간 → 예산)을 두 방식으로 재생합니다.
+- polling : 마지막 턴 이후 '견적 결과 확인' 턴을 poll-interval 마다 보내 결과를 받음
+- callback: 마지막 턴에 callbackUrl 을 담아 보내고, 로컬 콜백 스텁 서버가 결과를 받을 때까지 대기
+
+보고 항목: 대화당 웹훅 요청 수, 마지막 턴부터 결과 수신까지 걸린 시간, 콜백 재시도/실패 수
+
+    python benchmarks/bench_callback.py --users 100 --llm-latency 2.0 --callback-error-rate 0.1
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 결과 전달 방식만 비교하도록 LLM 호출 한도가 병목이 되지 않게 설정
+os.environ.setdefault("LLM_REQUESTS_PER_MINUTE", "100000")
+os.environ.setdefault("LLM_TOKENS_PER_MINUTE", "1000000000")
+
+import main  # noqa: E402
+from bench_webhook import (  # noqa: E402
+    BACKGROUND_TASKS, BUDGETS, OUTPUTS, PERIODS, TOPICS, call_asgi, install_llm_stub, percentile, skill_payload,
+)
+from estimate_cache import EstimateCache  # noqa: E402
+from stub_callback_server import start_server  # noqa: E402
+
+
+async def run_user(user_id: str, rng: random.Random, callback_base: str, poll_interval: float, max_polls: int,
+                   state, requests: List[int], delays: List[float]):
+    """대화 하나를 재생하고 웹훅 요청 수와 결과 수신 지연을 기록"""
+    turns = [f"{rng.choice(TOPICS)} 견적 문의", rng.choice(OUTPUTS), rng.choice(PERIODS), rng.choice(BUDGETS)]
+    sent = 0
+    for index, utterance in enumerate(turns):
+        payload = skill_payload(user_id, utterance)
+        if callback_base and index == len(turns) - 1:
+            payload["userRequest"]["callbackUrl"] = f"{callback_base}/callback/{user_id}"
+        await call_asgi("POST", "/kakao/webhook", payload)
+        sent += 1
+    finished_at = time.perf_counter()
+
+    for _ in range(max_polls):
+        await asyncio.sleep(poll_interval)
+        if callback_base:
+            if user_id in state.received:
+                delays.append(state.received[user_id][0] - finished_at)
+                break
+        else:
+            await call_asgi("POST", "/kakao/webhook", skill_payload(user_id, f"견적 결과 확인:{user_id}"))
+            sent += 1
+            if main.ESTIMATE_STATUS.get(user_id) in ("done", "failed"):
+                delays.append(time.perf_counter() - finished_at)
+                break
+    requests.append(sent)
+
+
+async def run_mode(name: str, args, callback_base: str, state):
+    requests: List[int] = []
+    delays: List[float] = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+    rng = random.Random(args.seed)
+    main.ESTIMATE_CACHE = EstimateCache()  # 앞 방식의 캐시된 견적을 재사용하지 않도록 비움
+
+    async def limited(index: int):
+        async with semaphore:
+            await run_user(f"{name}-{index}", random.Random(rng.random()), callback_base,
+                           # 콜백 수신 확인은 요청이 아니므로 짧은 간격으로 확인
+                           args.poll_interval if not callback_base else 0.01,
+                           args.max_polls if not callback_base else int(args.max_polls * args.poll_interval / 0.01),
+                           state, requests, delays)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(limited(i) for i in range(args.users)))
+    duration = time.perf_counter() - start
+    print(f"{name:<9} {sum(requests) / len(requests):>9.2f} {sum(requests):>9} {len(delays):>9} "
+          f"{percentile(delays, 50) * 1000:>9.1f} {percentile(delays, 95) * 1000:>9.1f} {duration:>8.2f}")
+
+
+async def run(args):
+    install_llm_stub(args.llm_latency)
+    server, state = start_server(0, error_rate=args.callback_error_rate)
+    callback_base = f"http://127.0.0.1:{server.server_address[1]}"
+    main.CALLBACK_CLIENT.allowed_hosts = ("127.0.0.1",)
+    main.CALLBACK_CLIENT.retry_base = 0.05
+
+    print(f"users={args.users} concurrency={args.concurrency} llm_latency={args.llm_latency}s "
+          f"poll_interval={args.poll_interval}s callback_error_rate={args.callback_error_rate}")
+    print(f"{'mode':<9} {'req/conv':>9} {'requests':>9} {'results':>9} {'p50(ms)':>9} {'p95(ms)':>9} {'time(s)':>8}")
+    try:
+        await run_mode("polling", args, "", state)
+        await run_mode("callback", args, callback_base, state)
+        if BACKGROUND_TASKS:
+            await asyncio.gather(*BACKGROUND_TASKS, return_exceptions=True)
+    finally:
+        await main.CALLBACK_CLIENT.close()
+        server.shutdown()
+    print(f"callback client: {main.CALLBACK_CLIENT.stats()}, stub: requests={state.requests} errors={state.errors}")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100, help="방식별 재생할 대화 수")
+    parser.add_argument("--concurrency", type=int, default=20, help="동시에 진행되는 대화 수")
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="LLM 스텁 응답 시간(초)")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="polling 방식의 결과 확인 간격(초)")
+    parser.add_argument("--max-polls", type=int, default=60)
+    parser.add_argument("--callback-error-rate", type=float, default=0.0, help="콜백 스텁의 500 응답 비율")
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main_cli()
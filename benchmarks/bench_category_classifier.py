@@ -0,0 +1,71 @@
+"""카테고리 추론 정확도/속도 비교
+
+정답 카테고리를 붙인 (주제, 산출물) 목록에 대해
+- keyword  : 키워드 규칙만 사용하고 맞는 키워드가 없으면 웹_플랫폼 (변경 전)
+- classifier: 키워드 규칙 + 키워드가 없을 때 카탈로그 분류기 (현재 infer_all_categories)
+의 정답률(정답 카테고리가 결과에 포함된 비율)과 결과 카테고리 수, 분류기 rank() 호출 시간을 측정합니다.
+
+    python benchmarks/bench_category_classifier.py --repeat 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+LABELLED = [
+    ("쇼핑몰", "웹사이트", "웹_플랫폼"), ("쇼핑몰", "홈페이지", "웹_플랫폼"), ("병원 예약", "예약 시스템", "웹_플랫폼"),
+    ("교육", "관리자 페이지", "웹_플랫폼"), ("사내 그룹웨어", "인트라넷", "웹_플랫폼"), ("재고 관리", "관리 시스템", "웹_플랫폼"),
+    ("배달", "앱", "모바일앱_플랫폼"), ("사주", "아이폰 어플", "모바일앱_플랫폼"), ("운동 기록", "스마트폰 어플리케이션", "모바일앱_플랫폼"),
+    ("택시 호출", "안드로이드", "모바일앱_플랫폼"), ("습관 관리", "모바일", "모바일앱_플랫폼"),
+    ("고객센터", "챗봇", "AI_챗봇"), ("고객 문의", "자동 응답", "AI_챗봇"), ("사내 규정", "질의응답 봇", "AI_챗봇"),
+    ("법률", "LLM 파인튜닝", "AI_챗봇"), ("심리", "상담 봇", "AI_챗봇"), ("음성인식", "음성 비서", "AI_챗봇"),
+    ("매출", "대시보드", "시각화_대시보드"), ("매출", "현황 분석", "시각화_대시보드"), ("마케팅", "KPI 리포트", "시각화_대시보드"),
+    ("경영", "Power BI 보고서", "시각화_대시보드"), ("에너지", "사용량 통계 화면", "시각화_대시보드"),
+    ("물류", "ETL 파이프라인", "데이터_엔지니어링"), ("뉴스", "크롤링", "데이터_엔지니어링"),
+    ("공공데이터", "데이터 수집 자동화", "데이터_엔지니어링"), ("주문", "DB 적재 스케줄러", "데이터_엔지니어링"),
+    ("로그", "Airflow 배치", "데이터_엔지니어링"), ("부동산", "매물 스크래핑", "데이터_엔지니어링"),
+]
+
+
+def keyword_only(topic: str, output: str):
+    labels = main.KEYWORD_MATCHER.labels(output)
+    return [category for category in main.CATEGORY_OUTPUT_KEYWORDS if ("output", category) in labels] or ["웹_플랫폼"]
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--verbose", action="store_true", help="틀린 항목 출력")
+    args = parser.parse_args()
+
+    print(f"labelled pairs: {len(LABELLED)}")
+    for name, infer in (("keyword", keyword_only), ("classifier", main.infer_all_categories)):
+        hits = 0
+        sizes = 0
+        for topic, output, expected in LABELLED:
+            categories = infer(topic, output)
+            hits += expected in categories
+            sizes += len(categories)
+            if args.verbose and expected not in categories:
+                print(f"  [{name}] {topic} / {output}: {categories} (정답 {expected})")
+        print(f"{name:<11} accuracy {hits / len(LABELLED):6.1%}  avg categories {sizes / len(LABELLED):.2f}")
+
+    texts = [f"{topic} {output}" for topic, output, _ in LABELLED]
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for text in texts:
+            main.CATEGORY_CLASSIFIER.rank(text)
+    seconds = (time.perf_counter() - start) / (args.repeat * len(texts))
+    start = time.perf_counter()
+    main.CategoryClassifier(main.CATALOG, main.CATEGORY_HINTS).rank(texts[0])  # 행렬은 첫 rank() 에서 만듦
+    build = time.perf_counter() - start
+    print(f"rank(): {seconds * 1e6:.1f} us/utterance, index build: {build * 1000:.1f} ms "
+          f"({main.CATEGORY_CLASSIFIER.matrix_t.shape[1]} documents x {main.CATEGORY_CLASSIFIER.dim} dims)")
+
+
+if __name__ == "__main__":
+    main_cli()
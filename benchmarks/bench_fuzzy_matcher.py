@@ -0,0 +1,87 @@
+"""유사 문자열 매칭 벤치마크
+
+difflib.get_close_matches 와 FuzzyMatcher 의 질의 지연 시간을 후보 사전 크기별로 비교하고,
+두 방식의 결과가 모두 같은지 확인합니다.
+
+    python benchmarks/bench_fuzzy_matcher.py
+    python benchmarks/bench_fuzzy_matcher.py --sizes 60 1000 50000 --queries 200
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from difflib import get_close_matches
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fuzzy_matcher import FuzzyMatcher  # noqa: E402
+
+# 실제 사용자 발화 형태의 질의
+SAMPLE_UTTERANCES = [
+    "쇼핑몰 만들고 싶어요", "교육용 플랫폼", "병원 예약 시스템", "사주 보는 앱", "심리 상담 챗봇",
+    "웹사이트", "관리자 페이지 필요해요", "대시보드랑 리포트", "안드로이드 앱", "업무 자동화",
+    "투자 정보 서비스", "배송 물류 관리", "경계선 지능 아동 학습", "보고서 요약", "견적 문의",
+]
+
+BASE_TERMS = [
+    "에너지", "전기", "교육", "심리", "사주", "건강", "병원", "진료", "의료", "정신건강",
+    "강의", "학습", "수강", "튜터링", "금융", "송금", "자산", "투자", "보험", "쇼핑몰",
+    "마켓", "결제", "리뷰", "추천", "음성인식", "이미지 생성", "챗GPT", "메신저",
+    "웹", "웹사이트", "챗봇", "ETL", "시스템", "앱", "사이트", "MVP", "UI", "대시보드",
+]
+
+
+def make_dictionary(size: int, seed: int = 0) -> list:
+    """기본 용어에 합성 도메인 용어를 더해 size 개의 후보 사전을 생성"""
+    rng = random.Random(seed)
+    syllables = [chr(code) for code in range(0xAC00, 0xAC00 + 11172, 37)]
+    terms = list(dict.fromkeys(BASE_TERMS))[:size]
+    seen = set(terms)
+    while len(terms) < size:
+        term = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 6)))
+        if rng.random() < 0.3:
+            term = rng.choice(BASE_TERMS) + " " + term
+        if term not in seen:
+            seen.add(term)
+            terms.append(term)
+    return terms
+
+
+def time_per_query(func, queries) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        func(query)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[60, 500, 5000, 20000, 50000])
+    parser.add_argument("--queries", type=int, default=100, help="사전 크기별 질의 수")
+    parser.add_argument("--cutoff", type=float, default=0.5)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    print(f"{'entries':>8} {'build(ms)':>10} {'difflib(ms)':>12} {'indexed(ms)':>12} {'speedup':>8}  same")
+    for size in args.sizes:
+        candidates = make_dictionary(size)
+        queries = [rng.choice(SAMPLE_UTTERANCES) for _ in range(args.queries)]
+
+        start = time.perf_counter()
+        matcher = FuzzyMatcher(candidates, cutoff=args.cutoff)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        def baseline(query):
+            matches = get_close_matches(query, candidates, n=1, cutoff=args.cutoff)
+            return matches[0] if matches else ""
+
+        same = all(baseline(q) == matcher.best_match(q) for q in set(queries))
+        difflib_ms = time_per_query(baseline, queries) * 1000
+        indexed_ms = time_per_query(matcher.best_match, queries) * 1000
+        print(f"{size:>8} {build_ms:>10.2f} {difflib_ms:>12.3f} {indexed_ms:>12.3f} "
+              f"{difflib_ms / indexed_ms:>7.1f}x  {'yes' if same else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""프롬프트 토큰 예산 리포트
+
+모든 카테고리 조합에 대해 압축하지 않은 프롬프트와 입력 토큰 예산에 맞춘 프롬프트의
+토큰 수, 선택된 압축 단계, 절약한 토큰 수, 응답 최대 토큰(max_tokens)을 보여주고
+plan() 호출 시간을 측정합니다.
+
+    python benchmarks/bench_prompt_budget.py --max-input-tokens 1000
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from prompt_budget import COMPACTION_LEVELS, completion_tokens, count_tokens  # noqa: E402
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-input-tokens", type=int, default=main.PROMPT_MAX_INPUT_TOKENS or 1000,
+                        help="시스템 메시지를 포함한 입력 토큰 예산 (PROMPT_MAX_INPUT_TOKENS 를 켜지 않았으면 1000)")
+    parser.add_argument("--repeat", type=int, default=200, help="조합별 plan() 반복 횟수")
+    args = parser.parse_args()
+
+    names = list(main.CATALOG.by_category)
+    combos = [list(c) for r in range(1, len(names) + 1) for c in itertools.combinations(names, r)]
+    request = ("🖋 주제: 쇼핑몰\n🧾 산출물: 웹, 앱", "5,000,000원", "쇼핑몰", "3개월")
+    budget = max(1, args.max_input_tokens - count_tokens(main.ESTIMATE_SYSTEM_MESSAGE))
+
+    print(f"input budget: {args.max_input_tokens} tokens (prompt {budget})")
+    print(f"{'categories':<48} {'full':>6} {'sent':>6} {'saved':>6} {'level':>6} {'max_tokens':>10}")
+    full_total = sent_total = 0
+    for combo in combos:
+        plan = main.PROMPT_ASSEMBLER.plan(*request[:1], combo, *request[1:], max_tokens=budget)
+        full_total += plan.full_tokens
+        sent_total += plan.prompt_tokens
+        max_tokens = completion_tokens(len(combo), main.GPT_COMPLETION_BASE_TOKENS,
+                                       main.GPT_COMPLETION_TOKENS_PER_CATEGORY, main.GPT_MAX_COMPLETION_TOKENS,
+                                       main.GPT_MIN_COMPLETION_TOKENS)
+        print(f"{'+'.join(combo):<48} {plan.full_tokens:>6} {plan.prompt_tokens:>6} {plan.saved_tokens:>6} "
+              f"{COMPACTION_LEVELS[plan.level] + ('' if plan.fits else '!'):>6} {max_tokens:>10}")
+    print(f"total: {full_total} → {sent_total} tokens ({1 - sent_total / full_total:.1%} saved)")
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for combo in combos:
+            main.PROMPT_ASSEMBLER.plan(*request[:1], combo, *request[1:], max_tokens=budget)
+    print(f"plan(): {(time.perf_counter() - start) / (args.repeat * len(combos)) * 1e6:.2f} us/prompt")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,106 @@
+"""프롬프트 조립 마이크로벤치마크
+
+기존 문자열 += 방식 빌더와 PromptAssembler 를 모든 카테고리 조합에 대해 비교하고,
+두 방식이 같은 프롬프트를 만드는지 확인합니다.
+
+    python benchmarks/bench_prompt_builder.py --repeat 2000
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import PROMPT_ASSEMBLER, SERVICE_CATEGORIES  # noqa: E402
+
+
+# 변경 전 빌더 (비교 기준)
+def legacy_build_prompt(user_input: str, service_categories: dict, categories: List[str], expected_budget: str = "", topic: str = "", period: str = "") -> str:
+    # 구조화된 입력 정보 표시
+    prompt = "🧾 사용자가 입력한 정보:\n"
+    prompt += f"- 주제: {topic}\n"
+    prompt += f"- 산출물: {user_input}\n"
+    prompt += f"- 기간: {period}\n"
+    prompt += f"- 예상 예산: {expected_budget}\n\n"
+    
+    # 중복 제거하면서 순서 유지
+    unique_categories = list(dict.fromkeys(categories))
+    prompt += f"💡 사용자가 요청한 주요 서비스 범주는 `{', '.join(unique_categories)}`입니다.\n\n"
+    
+    prompt += "🧾 각 카테고리에 대해 빠짐없이 견적을 제시해 주세요. 일부 항목 누락 없이 전체 범위를 고려해 주세요.\n"
+    prompt += "⚠️ 각 카테고리는 독립된 프로젝트 단위로 보고, 개별 견적을 제시해 주세요.\n"
+    prompt += "\n💡 동일한 카테고리명(`📂 웹 플랫폼`)은 한 번만 출력하고, 그 아래에 모든 단계와 금액을 나열해 주세요.\n"
+    prompt += "\n💡 각 카테고리별 비용 총합(소계)을 마지막 줄에 `💰 소계: ...원` 형식으로 표시해 주세요.\n\n"
+    prompt += "우리 회사는 다음과 같은 서비스 카테고리를 제공합니다:\n"
+
+    # 중복 제거된 카테고리로 순회
+    for category in unique_categories:
+        if category not in service_categories:
+            continue
+        prompt += f"\n📂 {category.replace('_', ' ')}\n"
+        for step, content in service_categories[category].items():
+            if isinstance(content, dict) and "features" in content:
+                cost = content.get("cost", 0)
+                features = " / ".join(content["features"])
+                prompt += f"  - {step.replace('_', ' ')}: {features} (비용: {cost:,}원)\n"
+            elif isinstance(content, dict):
+                for substep, subcontent in content.items():
+                    if "features" in subcontent:
+                        cost = subcontent.get("cost", 0)
+                        features = " / ".join(subcontent["features"])
+                        prompt += f"  - {step.replace('_', ' ')} > {substep}: {features} (비용: {cost:,}원)\n"
+
+    prompt += "\n다음 형식으로 각 카테고리에 대해 개별적으로 답변해 주세요:\n\n"
+    
+    # 예시 형식 추가
+    prompt += """📂 [카테고리명]
+- 필요한 단계: [금액]원
+- 예상 기간: [기간]
+💰 소계: [카테고리 총 금액]원
+
+이런 형식으로 각 카테고리별 견적을 제시한 후,
+
+💰 총 합계: [전체 금액]원
+"""
+
+    return prompt
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=1000, help="조합별 반복 횟수")
+    args = parser.parse_args()
+
+    names = list(SERVICE_CATEGORIES)
+    combos = [list(c) for r in range(1, len(names) + 1) for c in itertools.combinations(names, r)]
+    request = ("🖋 주제: 쇼핑몰\n🧾 산출물: 웹, 앱", "5,000,000원", "쇼핑몰", "3개월")
+
+    def run(build) -> float:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for combo in combos:
+                build(combo)
+        return (time.perf_counter() - start) / (args.repeat * len(combos))
+
+    def legacy(combo):
+        user_input, budget, topic, period = request
+        return legacy_build_prompt(user_input, SERVICE_CATEGORIES, combo, budget, topic, period)
+
+    def assembled(combo):
+        user_input, budget, topic, period = request
+        return PROMPT_ASSEMBLER.build(user_input, combo, budget, topic, period)
+
+    same = all(legacy(combo) == assembled(combo) for combo in combos)
+    legacy_us = run(legacy) * 1e6
+    assembled_us = run(assembled) * 1e6
+    print(f"category combinations: {len(combos)}, repeat: {args.repeat}")
+    print(f"legacy builder   : {legacy_us:8.2f} us/prompt")
+    print(f"prompt assembler : {assembled_us:8.2f} us/prompt  ({legacy_us / assembled_us:.1f}x)")
+    print(f"identical output : {'yes' if same else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
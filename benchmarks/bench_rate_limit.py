@@ -0,0 +1,60 @@
+"""레이트 리밋 상황의 LLM 스케줄러 동작 확인
+
+가짜 OpenAI 서버(429 응답 포함)를 띄우고 openai 클라이언트를 그쪽으로 연결한 뒤,
+여러 사용자의 견적 생성을 동시에 실행해 재시도/거절/완료 건수와 소요 시간을 보고합니다.
+
+    python benchmarks/bench_rate_limit.py --users 40 --error-rate 0.3
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from fake_openai_server import start_server  # noqa: E402
+from llm_scheduler import TokenBucket  # noqa: E402
+
+
+async def run(args):
+    server, state = start_server(0, latency=args.latency, error_rate=args.error_rate, rpm=args.server_rpm)
+    openai = main.get_openai()
+    openai.api_base = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    openai.api_key = "test"
+    main.LLM_SCHEDULER.retry_base = args.retry_base
+    main.LLM_SCHEDULER.request_bucket = TokenBucket(args.rpm)
+    main.LLM_SCHEDULER.token_bucket = TokenBucket(args.tpm)
+
+    start = time.perf_counter()
+    users = [f"rl-{i}" for i in range(args.users)]
+    # 사용자마다 다른 주제로 캐시 적중을 피함
+    await asyncio.gather(*(
+        main.process_gpt(user_id, f"🖋 주제: 주제{i}", f"주제{i}", "웹", "5,000,000원", "3개월")
+        for i, user_id in enumerate(users)
+    ))
+    duration = time.perf_counter() - start
+    server.shutdown()
+
+    statuses = [main.ESTIMATE_STATUS.get(user_id) for user_id in users]
+    print(f"users={args.users} duration={duration:.2f}s")
+    print(f"server: requests={state.requests} rate_limited={state.rate_limited}")
+    print(f"scheduler: {main.LLM_SCHEDULER.stats()}")
+    print(f"done={statuses.count('done')} failed={statuses.count('failed')}")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.3, help="가짜 서버 응답 지연(초)")
+    parser.add_argument("--error-rate", type=float, default=0.3, help="무작위 429 비율")
+    parser.add_argument("--server-rpm", type=int, default=0, help="가짜 서버의 분당 허용 요청 수")
+    parser.add_argument("--rpm", type=float, default=500, help="스케줄러의 분당 요청 한도")
+    parser.add_argument("--tpm", type=float, default=1_000_000, help="스케줄러의 분당 토큰 한도")
+    parser.add_argument("--retry-base", type=float, default=0.2, help="재시도 백오프 기본 시간(초)")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,90 @@
+"""결과 보관소 용량과 조회 시간 측정
+
+카탈로그 기준 견적으로 만든 결과를 사용자 수만큼 보관소에 기록한 뒤
+원문 대비 세그먼트 파일 크기, 메모리(hot) / 파일 조회 시간, 정리(compact) 시간을 보여줍니다.
+
+    python benchmarks/bench_result_store.py --users 20000 --hot-entries 256
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from bench_webhook import BUDGETS, OUTPUTS, PERIODS, TOPICS  # noqa: E402
+from result_store import ResultStore  # noqa: E402
+
+
+def make_records(count: int, rng: random.Random):
+    for index in range(count):
+        topic, output, period, budget = rng.choice(TOPICS), rng.choice(OUTPUTS), rng.choice(PERIODS), rng.choice(BUDGETS)
+        local = main.build_local_estimates(topic, output, budget)
+        yield f"user-{index}", {
+            "response": f"📊 카탈로그 기준 예상 견적:\n\n{local['full']}",
+            "user_input": main.build_user_input(topic, output, period, budget),
+            "shrunk": local["shrunk"],
+            "status": "done",
+        }
+
+
+def timed_gets(store: ResultStore, keys) -> float:
+    start = time.perf_counter()
+    for key in keys:
+        store.get(key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20000, help="기록할 결과 수")
+    parser.add_argument("--hot-entries", type=int, default=256)
+    parser.add_argument("--lookups", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    records = list(make_records(args.users, rng))
+    raw_bytes = sum(len(json.dumps(record, ensure_ascii=False).encode("utf-8")) for _, record in records)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "results.seg")
+        tracemalloc.start()
+        store = ResultStore(path, hot_entries=args.hot_entries)
+        start = time.perf_counter()
+        for key, record in records:
+            store.put(key, record)
+        put_us = (time.perf_counter() - start) / len(records) * 1e6
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        size = os.path.getsize(path)
+
+        recent = [key for key, _ in records[-args.hot_entries:]]
+        older = [rng.choice(records[:-args.hot_entries])[0] for _ in range(args.lookups)] if len(records) > args.hot_entries else []
+        hot_us = timed_gets(store, recent)
+        disk_us = timed_gets(ResultStore(path, hot_entries=0), older) if older else 0.0
+
+        # 절반을 덮어쓴 뒤 정리
+        for key, record in records[::2]:
+            store.put(key, record)
+        start = time.perf_counter()
+        freed = store.compact()
+        compact_ms = (time.perf_counter() - start) * 1000
+
+        reopen_start = time.perf_counter()
+        ResultStore(path).close()
+        reopen_ms = (time.perf_counter() - reopen_start) * 1000
+
+    print(f"results: {args.users}  raw: {raw_bytes:,} bytes  segment: {size:,} bytes ({size / raw_bytes:.1%})")
+    print(f"store memory (index + {args.hot_entries} hot): {current:,} bytes (peak {peak:,})")
+    print(f"put: {put_us:.1f} us  get(hot): {hot_us:.2f} us  get(file): {disk_us:.1f} us")
+    print(f"compact: {freed:,} bytes freed in {compact_ms:.1f} ms  reopen(index rebuild): {reopen_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main_cli()
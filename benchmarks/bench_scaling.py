@@ -0,0 +1,179 @@
+"""/kakao/webhook 다중 프로세스 처리량 측정
+
+워커 수를 바꿔 가며 gunicorn(gunicorn.conf.py)으로 앱을 띄우고, 여러 부하 프로세스가
+HTTP keep-alive 연결로 대화 흐름(주제 → 산출물 → 기간 → 예산)을 반복 전송해
+워커 수별 처리량(턴/초)과 응답 지연을 비교합니다.
+세션은 sqlite 저장소로 워커 간 공유되며, LLM 호출은 가짜 OpenAI 서버로 보냅니다.
+
+    python benchmarks/bench_scaling.py --workers 1 2 4 --clients 4 --threads 16 --duration 15
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_webhook import BUDGETS, OUTPUTS, PERIODS, TOPICS, percentile  # noqa: E402
+from fake_openai_server import start_server  # noqa: E402
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_healthy(port: int, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"서버가 {timeout}초 안에 시작되지 않았습니다 (port={port})")
+
+
+def start_app(workers: int, port: int, openai_base: str, data_dir: str) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        WEB_CONCURRENCY=str(workers),
+        PORT=str(port),
+        LOG_LEVEL="warning",
+        SESSION_BACKEND="sqlite",
+        SESSION_DB_PATH=os.path.join(data_dir, f"sessions-{workers}.db"),
+        OPENAI_API_BASE=openai_base,
+        OPENAI_API_KEY="test",
+        # 웹훅 처리량만 비교하도록 LLM 호출 한도가 병목이 되지 않게 설정
+        LLM_REQUESTS_PER_MINUTE="100000",
+        LLM_TOKENS_PER_MINUTE="1000000000",
+        LLM_MAX_QUEUE="100000",
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "main:app"], cwd=ROOT, env=env
+    )
+
+
+def load_client(port: int, threads: int, duration: float, seed: int, results):
+    """부하 프로세스: 스레드마다 연결 하나로 대화 흐름을 반복하고 턴별 지연을 수집"""
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def run(thread_index: int):
+        rng = random.Random(seed * 1000 + thread_index)
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        local: List[float] = []
+        conversation = 0
+        while time.monotonic() < deadline:
+            conversation += 1
+            user_id = f"scale-{seed}-{thread_index}-{conversation}"
+            for utterance in (f"{rng.choice(TOPICS)} 견적 문의", rng.choice(OUTPUTS),
+                              rng.choice(PERIODS), rng.choice(BUDGETS)):
+                body = json.dumps({
+                    "userRequest": {"user": {"id": user_id}, "utterance": utterance},
+                    "action": {"params": {}, "detailParams": {}},
+                }, ensure_ascii=False).encode("utf-8")
+                start = time.perf_counter()
+                try:
+                    conn.request("POST", "/kakao/webhook", body, {"Content-Type": "application/json"})
+                    response = conn.getresponse()
+                    response.read()
+                    ok = response.status == 200
+                except OSError:
+                    ok = False
+                    conn.close()
+                    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                if ok:
+                    local.append(time.perf_counter() - start)
+                else:
+                    with lock:
+                        errors[0] += 1
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=run, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    results.put((latencies, errors[0]))
+
+
+def measure(port: int, clients: int, threads: int, duration: float):
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=load_client, args=(port, threads, duration, seed, results))
+        for seed in range(clients)
+    ]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    latencies: List[float] = []
+    errors = 0
+    for _ in processes:
+        chunk, failed = results.get()
+        latencies.extend(chunk)
+        errors += failed
+    for process in processes:
+        process.join()
+    return latencies, errors, time.perf_counter() - start
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="비교할 gunicorn 워커 수")
+    parser.add_argument("--clients", type=int, default=4, help="부하 프로세스 수")
+    parser.add_argument("--threads", type=int, default=16, help="부하 프로세스당 동시 연결 수")
+    parser.add_argument("--duration", type=float, default=15, help="워커 수별 측정 시간(초)")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="가짜 OpenAI 서버 응답 지연(초)")
+    args = parser.parse_args()
+
+    server, _ = start_server(0, latency=args.llm_latency)
+    openai_base = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    data_dir = tempfile.mkdtemp(prefix="bench-scaling-")
+    print(f"cpus={multiprocessing.cpu_count()} clients={args.clients}x{args.threads} duration={args.duration}s")
+    print(f"{'workers':>7} {'turns':>8} {'turns/s':>9} {'speedup':>8} {'p50(ms)':>9} {'p99(ms)':>9} {'errors':>7}")
+
+    baseline = None
+    try:
+        for workers in args.workers:
+            port = free_port()
+            app = start_app(workers, port, openai_base, data_dir)
+            try:
+                wait_healthy(port)
+                latencies, errors, elapsed = measure(port, args.clients, args.threads, args.duration)
+            finally:
+                app.terminate()
+                try:
+                    app.wait(30)
+                except subprocess.TimeoutExpired:
+                    app.kill()
+                    app.wait()
+            throughput = len(latencies) / elapsed
+            baseline = baseline or throughput
+            print(f"{workers:>7} {len(latencies):>8} {throughput:>9.1f} {throughput / baseline:>7.2f}x "
+                  f"{percentile(latencies, 50) * 1000:>9.2f} {percentile(latencies, 99) * 1000:>9.2f} {errors:>7}")
+    finally:
+        server.shutdown()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main_cli()
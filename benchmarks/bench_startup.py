@@ -0,0 +1,85 @@
+"""서버 시작 시간 측정
+
+uvicorn 프로세스를 띄운 시점부터 /health 가 처음 200 을 응답할 때까지의 시간을
+시작 아티팩트 사용 여부별로 여러 번 측정합니다.
+첫 견적 요청 때로 미룬 openai 모듈 import 시간도 함께 보고합니다.
+
+    python benchmarks/bench_startup.py --runs 5
+"""
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_healthy(env: dict, timeout: float = 60) -> float:
+    """uvicorn 시작부터 /health 첫 정상 응답까지 걸린 시간(초)"""
+    port = free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+                conn.request("GET", "/health")
+                if conn.getresponse().status == 200:
+                    return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.005)
+        raise RuntimeError(f"/health 가 {timeout}초 안에 응답하지 않았습니다")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def import_seconds(statement: str) -> float:
+    """새 인터프리터에서 statement 실행에 걸린 시간(초)"""
+    code = f"import time; start = time.perf_counter(); {statement}; print(time.perf_counter() - start)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return float(result.stdout.strip())
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    artifact_path = os.path.join(tempfile.mkdtemp(prefix="bench-startup-"), "startup.artifact")
+    subprocess.run([sys.executable, "startup_artifact.py", artifact_path], cwd=ROOT, check=True,
+                   stdout=subprocess.DEVNULL)
+
+    modes = {
+        "build at import": dict(os.environ, STARTUP_ARTIFACT_PATH=""),
+        "mmap artifact": dict(os.environ, STARTUP_ARTIFACT_PATH=artifact_path),
+    }
+    print(f"{'mode':<16} {'median(ms)':>11} {'min(ms)':>9} {'max(ms)':>9}")
+    for name, env in modes.items():
+        samples = [time_to_healthy(env) for _ in range(args.runs)]
+        print(f"{name:<16} {statistics.median(samples) * 1000:>11.1f} {min(samples) * 1000:>9.1f} "
+              f"{max(samples) * 1000:>9.1f}")
+
+    main_import = statistics.median(import_seconds("import main") for _ in range(args.runs))
+    openai_import = statistics.median(import_seconds("import openai") for _ in range(args.runs))
+    print(f"import main: {main_import * 1000:.1f}ms, "
+          f"import openai (deferred to first estimate): {openai_import * 1000:.1f}ms")
+    os.remove(artifact_path)
+
+
+if __name__ == "__main__":
+    main_cli()
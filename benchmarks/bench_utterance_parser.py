@@ -0,0 +1,123 @@
+"""기간/예산 파싱 마이크로벤치마크
+
+실제 대화에서 모은 발화 목록에 대해 기존 방식(is_valid_period → normalize_period → normalize_budget,
+발화마다 정규식을 새로 만들어 단위별로 검색)과 parse_utterance 1회 호출(캐시 미사용/사용)을 비교하고,
+두 방식의 결과가 다른 발화를 보여줍니다.
+
+    python benchmarks/bench_utterance_parser.py --repeat 2000
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utterance_parser import parse_utterance  # noqa: E402
+
+UTTERANCES = [
+    "3개월", "6주", "2개월", "4개월 정도요", "한 달", "두 달 안에 가능할까요", "석 달", "2~3개월", "3개월에서 4개월",
+    "이삼개월", "6개월 이내", "12주", "1년은 걸릴 것 같아요", "최대한 빨리요", "잘 모르겠어요", "3 개월",
+    "500만원", "1000만원", "2000만원", "300만원 정도", "50만원", "5,000,000원", "1억", "1억 5천만원",
+    "삼백만원", "천만원 이하로", "300~500만원", "5천~7천만원", "예산은 2천만원이고 기간은 3개월",
+    "3개월, 500만원 정도", "예산이 백만원 정도 있어요", "1.5억", "10만원", "이천만원이요", "500 만원",
+    "쇼핑몰 견적 문의", "웹사이트와 앱", "사주 상담 앱 만들고 싶어요", "병원 예약 챗봇", "대시보드 만들어주세요",
+    "2024년 3월 오픈 예정", "10달러", "만원", "새로운 견적 문의", "견적 결과 확인:abc123",
+]
+
+
+# 변경 전 파서 (비교 기준)
+def legacy_is_valid_slot_answer(text: str) -> bool:
+    text = text.strip()
+    if len(text) < 3:
+        return False
+    lower = text.lower()
+    invalid_keywords = ["없", "모르", "모름", "몰라", "글쎄", "무", "잘 몰라", "기억 안", "생각 안"]
+    return not any(kw in lower for kw in invalid_keywords)
+
+
+def legacy_normalize_period(text: str) -> str:
+    if "개월" in text or "달" in text:
+        number = ''.join(filter(str.isdigit, text))
+        return f"{number}개월"
+    elif "주" in text:
+        number = ''.join(filter(str.isdigit, text))
+        return f"{number}주"
+    return text.strip()
+
+
+def legacy_normalize_budget(text: str) -> str:
+    if not any(unit in text for unit in ["원", "만원", "천원", "억", "조"]):
+        return ""
+    multipliers = {"조": 1000000000000, "억": 100000000, "만원": 10000, "천원": 1000, "원": 1}
+    text = text.replace(",", "")
+    for unit, multiplier in multipliers.items():
+        if unit in text:
+            match = re.search(r"(\d+)\s*" + unit, text)
+            if match:
+                amount = int(match.group(1)) * multiplier
+                return f"{amount:,}원"
+    if "원" in text:
+        match = re.search(r"(\d+)", text)
+        if match:
+            amount = int(match.group(1))
+            return f"{amount:,}원"
+    return ""
+
+
+def legacy_is_valid_period(text: str) -> bool:
+    text = text.strip()
+    if not legacy_is_valid_slot_answer(text):
+        return False
+    normalized = legacy_normalize_period(text)
+    return any(unit in normalized for unit in ["개월", "주"])
+
+
+def legacy_parse(text: str):
+    period = legacy_normalize_period(text) if legacy_is_valid_period(text) else ""
+    return period, legacy_normalize_budget(text)
+
+
+def single_pass_parse(text: str):
+    parsed = parse_utterance.__wrapped__(text)  # 캐시 없이 매번 파싱
+    return parsed.period, parsed.budget
+
+
+def cached_parse(text: str):
+    parsed = parse_utterance(text)
+    return parsed.period, parsed.budget
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    def run(parse) -> float:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for text in UTTERANCES:
+                parse(text)
+        return (time.perf_counter() - start) / (args.repeat * len(UTTERANCES))
+
+    legacy_seconds = run(legacy_parse)
+    single_seconds = run(single_pass_parse)
+    cached_seconds = run(cached_parse)
+
+    print(f"utterances: {len(UTTERANCES)}, repeat: {args.repeat}")
+    print(f"legacy parsers    : {1 / legacy_seconds:12,.0f} utterances/s ({legacy_seconds * 1e6:.2f} us)")
+    print(f"single-pass parser: {1 / single_seconds:12,.0f} utterances/s ({single_seconds * 1e6:.2f} us)"
+          f"  ({legacy_seconds / single_seconds:.1f}x)")
+    print(f"  + lru_cache     : {1 / cached_seconds:12,.0f} utterances/s ({cached_seconds * 1e6:.2f} us)"
+          f"  ({legacy_seconds / cached_seconds:.1f}x)")
+
+    print(f"\n{'utterance':<32} {'legacy (period, budget)':<36} single-pass (period, budget)")
+    for text in UTTERANCES:
+        before, after = legacy_parse(text), single_pass_parse(text)
+        if before != after:
+            print(f"{text:<32} {str(before):<36} {after}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""/kakao/webhook 대화 흐름 부하 테스트
+
+가상 사용자들이 카카오 스킬 요청(주제 → 산출물 → 기간 → 예산 → 견적 결과 확인)을
+동시에 재생하며 FastAPI 앱을 프로세스 안에서 직접 호출합니다.
+LLM 호출은 지연 시간을 설정할 수 있는 로컬 스텁으로 대체됩니다.
+
+보고 항목
+- 턴 종류별 응답 지연 p50 / p95 / p99
+- 처리량 (턴/초, 완료된 견적/초)
+- 이벤트 루프 지연 (5ms 주기 타이머의 밀림)
+- 세션 저장소 항목 수와 메모리 증가량
+
+    python benchmarks/bench_webhook.py --users 200 --concurrency 50 --llm-latency 2.0
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+TOPICS = ["쇼핑몰", "교육 플랫폼", "병원 예약", "사주 상담", "금융 자산 관리", "물류 배송", "심리 상담"]
+OUTPUTS = ["웹사이트", "앱", "웹사이트와 앱", "챗봇", "대시보드", "관리자 페이지"]
+PERIODS = ["2개월", "3개월", "6주", "4개월"]
+BUDGETS = ["300만원", "500만원", "1000만원", "2000만원", "50만원"]
+
+STUB_RESPONSE = "📂 웹 플랫폼\n- 기획 요구사항 정의: 1,000,000원\n💰 소계: 1,000,000원\n\n💰 총 합계: 1,000,000원\n"
+
+
+def install_llm_stub(latency: float, chunks: int = 20):
+    """LLM 호출을 지정한 지연 시간 동안 토큰을 흘려보내는 스텁으로 교체"""
+    def fake_completion(messages, max_tokens=1400, on_delta=None):
+        text = ""
+        step = len(STUB_RESPONSE) // chunks + 1
+        for i in range(0, len(STUB_RESPONSE), step):
+            time.sleep(latency / chunks)
+            text += STUB_RESPONSE[i:i + step]
+            if on_delta is not None and on_delta(text) is False:
+                break
+        return text
+
+    main.request_chat_completion = fake_completion
+
+
+# 응답 이후에도 실행 중인 앱 호출 (백그라운드 작업 포함)
+BACKGROUND_TASKS: set = set()
+
+
+async def call_asgi(method: str, path: str, body: dict = None) -> Tuple[float, dict]:
+    """ASGI 앱을 직접 호출하고 (응답까지 걸린 시간, JSON 응답)을 반환
+
+    응답 본문이 전송된 시점까지를 지연 시간으로 측정하며,
+    응답 이후 실행되는 백그라운드 작업은 별도 태스크로 계속 진행됩니다.
+    """
+    payload = json.dumps(body or {}, ensure_ascii=False).encode("utf-8")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": method, "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "server": ("bench", 80), "client": ("bench", 1),
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())],
+    }
+    received = False
+    chunks: List[bytes] = []
+    done = asyncio.get_running_loop().create_future()
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        await asyncio.Event().wait()  # 연결 유지 (disconnect 없음)
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body") and not done.done():
+                done.set_result(time.perf_counter())
+
+    start = time.perf_counter()
+    app_task = asyncio.create_task(main.app(scope, receive, send))
+    finished = await done
+    BACKGROUND_TASKS.add(app_task)
+    app_task.add_done_callback(BACKGROUND_TASKS.discard)
+    return finished - start, json.loads(b"".join(chunks) or b"{}")
+
+
+def skill_payload(user_id: str, utterance: str) -> dict:
+    return {
+        "userRequest": {"user": {"id": user_id}, "utterance": utterance},
+        "action": {"params": {}, "detailParams": {}},
+    }
+
+
+def response_text(data: dict) -> str:
+    return data.get("template", {}).get("outputs", [{}])[0].get("simpleText", {}).get("text", "")
+
+
+async def run_user(user_id: str, rng: random.Random, latencies: Dict[str, List[float]],
+                   poll_interval: float, max_polls: int) -> bool:
+    """한 사용자의 대화 흐름을 재생하고 최종 견적 수신 여부를 반환"""
+    turns = [
+        ("topic", f"{rng.choice(TOPICS)} 견적 문의"),
+        ("output", rng.choice(OUTPUTS)),
+        ("period", rng.choice(PERIODS)),
+        ("budget", rng.choice(BUDGETS)),
+    ]
+    for turn, utterance in turns:
+        elapsed, data = await call_asgi("POST", "/kakao/webhook", skill_payload(user_id, utterance))
+        latencies[turn].append(elapsed)
+
+    # 마지막 턴에서 견적 요청이 접수되지 않았으면 (슬롯 미충족) 결과 확인 생략
+    if "/result/" not in response_text(data):
+        return False
+
+    for _ in range(max_polls):
+        await asyncio.sleep(poll_interval)
+        elapsed, _ = await call_asgi("POST", "/kakao/webhook", skill_payload(user_id, f"견적 결과 확인:{user_id}"))
+        latencies["result"].append(elapsed)
+        if main.ESTIMATE_STATUS.get(user_id) in ("done", "failed"):
+            return True
+    return False
+
+
+async def monitor_loop_lag(samples: List[float], interval: float = 0.005):
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - start - interval)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def session_sizes() -> Dict[str, int]:
+    return {
+        "USER_SLOT_STATE": len(main.USER_SLOT_STATE),
+        "USER_INPUTS": len(main.USER_INPUTS),
+        "GPT_RESPONSES": len(main.GPT_RESPONSES),
+        "SHRUNK_RESPONSES": len(main.SHRUNK_RESPONSES),
+    }
+
+
+async def run(args) -> None:
+    install_llm_stub(args.llm_latency)
+    rng = random.Random(args.seed)
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    lag_samples: List[float] = []
+
+    tracemalloc.start()
+    memory_before = tracemalloc.get_traced_memory()[0]
+    lag_task = asyncio.create_task(monitor_loop_lag(lag_samples))
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    completed = 0
+
+    async def limited(index: int):
+        nonlocal completed
+        async with semaphore:
+            if await run_user(f"bench-{args.seed}-{index}", random.Random(rng.random()), latencies,
+                              args.poll_interval, args.max_polls):
+                completed += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(limited(i) for i in range(args.users)))
+    duration = time.perf_counter() - start
+
+    lag_task.cancel()
+    if BACKGROUND_TASKS:
+        await asyncio.gather(*BACKGROUND_TASKS, return_exceptions=True)
+    memory_after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    total_turns = sum(len(v) for v in latencies.values())
+    print(f"users={args.users} concurrency={args.concurrency} llm_latency={args.llm_latency}s duration={duration:.2f}s")
+    print(f"{'turn':<8} {'count':>6} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9} {'max(ms)':>9}")
+    for turn in ["topic", "output", "period", "budget", "result"]:
+        values = latencies.get(turn, [])
+        print(f"{turn:<8} {len(values):>6} {percentile(values, 50) * 1000:>9.2f} {percentile(values, 95) * 1000:>9.2f} "
+              f"{percentile(values, 99) * 1000:>9.2f} {max(values, default=0) * 1000:>9.2f}")
+    print(f"throughput: {total_turns / duration:.1f} turns/s, {completed / duration:.2f} estimates/s "
+          f"({completed}/{args.users} completed)")
+    print(f"event loop lag: p50={percentile(lag_samples, 50) * 1000:.2f}ms "
+          f"p99={percentile(lag_samples, 99) * 1000:.2f}ms max={max(lag_samples, default=0) * 1000:.2f}ms")
+    print(f"memory growth: {(memory_after - memory_before) / 1024:.1f} KiB, sessions: {session_sizes()}")
+    print(f"estimate queue: {main.ESTIMATE_EXECUTOR.stats()}")
+    print(f"estimate cache: {main.ESTIMATE_CACHE.stats()}")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100, help="재생할 대화(사용자) 수")
+    parser.add_argument("--concurrency", type=int, default=20, help="동시에 진행되는 대화 수")
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="LLM 스텁 응답 시간(초)")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="결과 확인 간격(초)")
+    parser.add_argument("--max-polls", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,133 @@
+"""로컬 가짜 OpenAI 서버
+
+/v1/chat/completions 요청에 지정한 지연 후 고정 견적을 반환하고,
+설정한 비율이나 분당 한도를 넘는 요청에는 429(rate limit) 를 응답합니다.
+stream=true 요청에는 SSE 청크로 응답합니다.
+
+    python benchmarks/fake_openai_server.py --port 8089 --latency 1.0 --rpm 30
+    OPENAI_API_BASE=http://127.0.0.1:8089/v1 OPENAI_API_KEY=test uvicorn main:app
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+COMPLETION_TEXT = (
+    "📂 웹 플랫폼\n- 기획 요구사항 정의: 1,000,000원\n- 프론트엔드 개발: 2,000,000원\n"
+    "💰 소계: 3,000,000원\n\n💰 총 합계: 3,000,000원\n"
+)
+
+
+class FakeOpenAIState:
+    def __init__(self, latency: float = 0.5, error_rate: float = 0.0, rpm: int = 0, retry_after: float = 0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rpm = rpm
+        self.retry_after = retry_after
+        self.requests = 0
+        self.rate_limited = 0
+        self._recent = deque()
+        self._lock = threading.Lock()
+
+    def admit(self) -> bool:
+        """이번 요청을 처리할지(True) 429로 거절할지(False) 결정"""
+        with self._lock:
+            self.requests += 1
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] > 60:
+                self._recent.popleft()
+            limited = random.random() < self.error_rate or (self.rpm and len(self._recent) >= self.rpm)
+            if limited:
+                self.rate_limited += 1
+                return False
+            self._recent.append(now)
+            return True
+
+
+def make_handler(state: FakeOpenAIState):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _json(self, status: int, payload: dict, headers: dict = None):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if not self.path.endswith("/chat/completions"):
+                return self._json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+
+            if not state.admit():
+                headers = {"Retry-After": str(state.retry_after)} if state.retry_after else None
+                return self._json(429, {"error": {
+                    "message": "Rate limit reached for requests", "type": "requests", "code": "rate_limit_exceeded",
+                }}, headers)
+
+            if request.get("stream"):
+                return self._stream()
+
+            time.sleep(state.latency)
+            self._json(200, {
+                "id": "chatcmpl-fake", "object": "chat.completion", "created": int(time.time()),
+                "model": request.get("model", "gpt-3.5-turbo"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": COMPLETION_TEXT},
+                             "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 1000, "completion_tokens": 100, "total_tokens": 1100},
+            })
+
+        def _stream(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            pieces = [COMPLETION_TEXT[i:i + 8] for i in range(0, len(COMPLETION_TEXT), 8)]
+            for piece in pieces:
+                time.sleep(state.latency / len(pieces))
+                chunk = {"id": "chatcmpl-fake", "object": "chat.completion.chunk",
+                         "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+                self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+            self.wfile.write(b"data: [DONE]\n\n")
+
+    return Handler
+
+
+def start_server(port: int = 0, **options):
+    """백그라운드 스레드에서 서버 시작 후 (server, state) 반환 (port=0 이면 임의 포트)"""
+    state = FakeOpenAIState(**options)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.5, help="응답 지연(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="무작위 429 비율 (0~1)")
+    parser.add_argument("--rpm", type=int, default=0, help="분당 허용 요청 수 (0이면 제한 없음)")
+    parser.add_argument("--retry-after", type=float, default=0, help="429 응답의 Retry-After 헤더(초)")
+    args = parser.parse_args()
+
+    server, _ = start_server(args.port, latency=args.latency, error_rate=args.error_rate,
+                             rpm=args.rpm, retry_after=args.retry_after)
+    print(f"fake OpenAI server: http://127.0.0.1:{server.server_address[1]}/v1")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
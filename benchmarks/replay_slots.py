@@ -0,0 +1,236 @@
+"""슬롯 추출 함수 재생 회귀 검사 + 처리량/할당 벤치마크
+
+기록해 둔 발화 코퍼스(slot_corpus.jsonl)를 슬롯 함수들에 다시 넣어
+1) 기록된 결과(expected)와 모두 같은지 확인하고 (다르면 종료 코드 1 → 최적화 전후 검사에 사용)
+2) 비교 기준 구현(기본: 최초 구현을 옮겨 둔 legacy)과 결과가 같은 비율,
+3) 함수별 초당 처리량과 호출당 메모리 할당(tracemalloc 최대 사용량, 남은 메모리)을 보여줍니다.
+
+코퍼스 형식 (한 줄에 발화 하나, expected 는 --record 로 현재 구현의 결과를 기록):
+    {"utterance": "3개월, 500만원 정도", "expected": {"normalize_period": "3개월", "normalize_budget": "5,000,000원", ...}}
+
+구현은 main(현재), legacy(최초 구현) 또는 같은 이름의 함수를 가진 모듈 경로(예: my_slots)로 지정합니다.
+모듈에 없는 함수는 건너뜁니다.
+
+    python benchmarks/replay_slots.py                      # 현재 구현 검사 + legacy 와 비교
+    python benchmarks/replay_slots.py --impl my_slots      # 새 구현이 기록된 결과와 같은지 검사
+    python benchmarks/replay_slots.py --record             # 의도한 동작 변경 후 expected 다시 기록
+"""
+import argparse
+import importlib
+import json
+import os
+import re
+import sys
+import time
+import tracemalloc
+from difflib import get_close_matches
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from bench_utterance_parser import legacy_normalize_budget, legacy_normalize_period  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "slot_corpus.jsonl")
+
+# 검사 항목 이름 → (함수 이름, 발화 뒤에 넘길 인자)
+CASES: Dict[str, Tuple[str, Tuple[Any, ...]]] = {
+    "is_likely_topic": ("is_likely_topic", ()),
+    "normalize_period": ("normalize_period", ()),
+    "normalize_budget": ("normalize_budget", ()),
+    "match_similar_slot_lightweight[topic]": ("match_similar_slot_lightweight", ("주제",)),
+    "match_similar_slot_lightweight[output]": ("match_similar_slot_lightweight", ("산출물",)),
+    "extract_slots": ("extract_slots", ()),
+}
+
+
+class Implementation(NamedTuple):
+    name: str
+    functions: Dict[str, Callable[..., Any]]
+    reset: Callable[[], None]  # 캐시 비우기 (--cold)
+
+
+# 최초 구현 (비교 기준, 키워드 목록은 현재 main 과 같은 것을 사용)
+def legacy_is_likely_topic(text: str) -> bool:
+    lower_text = text.lower().strip()
+    return any(entry in lower_text for entry in main.JUJAE_SYNONYMS)
+
+
+def legacy_match_similar_slot_lightweight(text: str, slot_type: str) -> str:
+    candidates = main.SANCHUL_ENTRIES if slot_type == "산출물" else main.JUJAE_ENTRIES
+    matches = get_close_matches(text, candidates, n=1, cutoff=0.5)
+    return matches[0] if matches else ""
+
+
+def legacy_normalize_period_slot(text: str) -> str:
+    # 최초 구현은 기간 슬롯에 답한 발화만 정규화했으므로 기간 단위가 없으면 빈 문자열로 비교
+    return legacy_normalize_period(text) if re.search(r"개월|달|주", text) else ""
+
+
+def _no_reset():
+    pass
+
+
+def _clear_main_caches():
+    main.parse_utterance.cache_clear()
+
+
+def load_implementation(name: str) -> Implementation:
+    if name == "main":
+        functions = {function: getattr(main, function) for function, _ in CASES.values()}
+        return Implementation("main", functions, _clear_main_caches)
+    if name == "legacy":
+        return Implementation("legacy", {
+            "is_likely_topic": legacy_is_likely_topic,
+            "normalize_period": legacy_normalize_period_slot,
+            "normalize_budget": legacy_normalize_budget,
+            "match_similar_slot_lightweight": legacy_match_similar_slot_lightweight,
+        }, _no_reset)
+    module = importlib.import_module(name)
+    functions = {function: getattr(module, function) for function, _ in CASES.values() if hasattr(module, function)}
+    return Implementation(name, functions, getattr(module, "reset_caches", _no_reset))
+
+
+def load_corpus(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def save_corpus(path: str, corpus: List[Dict[str, Any]]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for record in corpus:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def run_case(impl: Implementation, case: str, utterance: str) -> Any:
+    function, extra = CASES[case]
+    result = impl.functions[function](utterance, *extra)
+    return json.loads(json.dumps(result, ensure_ascii=False))  # 기록된 값(JSON)과 같은 형태로 비교
+
+
+def supported_cases(impl: Implementation, cases: List[str]) -> List[str]:
+    return [case for case in cases if CASES[case][0] in impl.functions]
+
+
+def measure_throughput(impl: Implementation, case: str, utterances: List[str], repeat: int, cold: bool) -> float:
+    """초당 호출 수 (cold 이면 반복마다 캐시를 비움)"""
+    function, extra = CASES[case]
+    func = impl.functions[function]
+    elapsed = 0.0
+    for _ in range(repeat):
+        if cold:
+            impl.reset()
+        start = time.perf_counter()
+        for utterance in utterances:
+            func(utterance, *extra)
+        elapsed += time.perf_counter() - start
+    return repeat * len(utterances) / elapsed if elapsed else 0.0
+
+
+def measure_allocations(impl: Implementation, case: str, utterances: List[str]) -> Tuple[float, int]:
+    """(호출당 평균 최대 할당 바이트, 전체 호출 후 남은 바이트) - 캐시를 비운 상태에서 한 번씩 호출"""
+    function, extra = CASES[case]
+    func = impl.functions[function]
+    impl.reset()
+    peaks = 0
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for utterance in utterances:
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            result = func(utterance, *extra)
+            peaks += tracemalloc.get_traced_memory()[1] - current
+            del result
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    return peaks / len(utterances), retained
+
+
+def check(impl: Implementation, corpus: List[Dict[str, Any]], cases: List[str], show: int) -> Dict[str, int]:
+    """기록된 결과와 다른 발화 수 (항목별)"""
+    mismatches: Dict[str, int] = {}
+    for case in cases:
+        mismatches[case] = 0
+        for record in corpus:
+            if case not in record.get("expected", {}):
+                continue
+            actual = run_case(impl, case, record["utterance"])
+            if actual != record["expected"][case]:
+                mismatches[case] += 1
+                if mismatches[case] <= show:
+                    print(f"  ✗ {case}({record['utterance']!r}): expected {record['expected'][case]!r}, got {actual!r}")
+    return mismatches
+
+
+def agreement(impl: Implementation, baseline: Implementation, corpus: List[Dict[str, Any]], case: str) -> float:
+    same = sum(run_case(impl, case, r["utterance"]) == run_case(baseline, case, r["utterance"]) for r in corpus)
+    return same / len(corpus)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--impl", default="main", help="검사할 구현 (main, legacy 또는 모듈 경로)")
+    parser.add_argument("--baseline", default="legacy", help="비교 기준 구현 (비우면 비교하지 않음)")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--record", action="store_true", help="--impl 의 결과를 코퍼스의 expected 로 기록")
+    parser.add_argument("--repeat", type=int, default=200, help="처리량 측정 시 코퍼스 반복 횟수")
+    parser.add_argument("--cold", action="store_true", help="처리량 측정 시 반복마다 캐시를 비움")
+    parser.add_argument("--no-perf", action="store_true", help="결과 검사만 수행")
+    parser.add_argument("--show", type=int, default=5, help="항목별로 보여줄 불일치 발화 수")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    impl = load_implementation(args.impl)
+    cases = supported_cases(impl, args.cases)
+
+    if args.record:
+        for record in corpus:
+            # 이름을 바꾸거나 없앤 항목의 기록은 버림
+            expected = {case: value for case, value in record.get("expected", {}).items() if case in CASES}
+            for case in cases:
+                expected[case] = run_case(impl, case, record["utterance"])
+            record["expected"] = expected
+        save_corpus(args.corpus, corpus)
+        print(f"📼 {len(corpus)}개 발화의 결과를 기록했습니다 ({impl.name}, {len(cases)}개 항목): {args.corpus}")
+        return
+
+    print(f"corpus: {args.corpus} ({len(corpus)} utterances)  impl: {impl.name}")
+    mismatches = check(impl, corpus, cases, args.show)
+    baseline: Optional[Implementation] = load_implementation(args.baseline) if args.baseline else None
+
+    utterances = [record["utterance"] for record in corpus]
+    header = f"{'case':<40} {'diff':>5}"
+    if baseline is not None:
+        header += f" {'same%':>6}"
+    if not args.no_perf:
+        header += f" {'ops/s':>12} {'peak B':>8} {'kept B':>8}"
+        if baseline is not None:
+            header += f" {'base ops/s':>12} {'speedup':>8} {'base peak':>9}"
+    print(header)
+    for case in cases:
+        row = f"{case:<40} {mismatches[case]:>5}"
+        compare = baseline is not None and CASES[case][0] in baseline.functions
+        if baseline is not None:
+            row += f" {agreement(impl, baseline, corpus, case):>6.0%}" if compare else f" {'-':>6}"
+        if not args.no_perf:
+            ops = measure_throughput(impl, case, utterances, args.repeat, args.cold)
+            peak, kept = measure_allocations(impl, case, utterances)
+            row += f" {ops:>12,.0f} {peak:>8.0f} {kept:>8}"
+            if compare:
+                base_ops = measure_throughput(baseline, case, utterances, args.repeat, args.cold)
+                base_peak, _ = measure_allocations(baseline, case, utterances)
+                row += f" {base_ops:>12,.0f} {ops / base_ops:>7.1f}x {base_peak:>9.0f}"
+        print(row)
+
+    failed = sum(mismatches.values())
+    if failed:
+        print(f"❌ 기록된 결과와 다른 결과 {failed}건")
+        sys.exit(1)
+    print("✅ 모든 결과가 기록된 결과와 같습니다")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,94 @@
+"""로컬 카카오 콜백 스텁 서버
+
+/callback/<id> 로 받은 스킬 응답을 수신 시각과 함께 기록합니다.
+설정한 비율만큼 500 을 응답해 콜백 재시도를 확인할 수 있습니다.
+
+    python benchmarks/stub_callback_server.py --port 8090 --error-rate 0.2
+    KAKAO_CALLBACK_HOSTS=127.0.0.1 uvicorn main:app
+    (스킬 요청의 userRequest.callbackUrl 에 http://127.0.0.1:8090/callback/<id> 지정)
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Tuple
+
+
+class CallbackStubState:
+    def __init__(self, error_rate: float = 0.0, latency: float = 0.0):
+        self.error_rate = error_rate
+        self.latency = latency
+        self.requests = 0
+        self.errors = 0
+        self.received: Dict[str, Tuple[float, Any]] = {}  # id → (수신 시각 perf_counter, 응답 본문)
+        self._lock = threading.Lock()
+
+    def record(self, callback_id: str, payload: Any) -> bool:
+        """이번 요청을 받아들일지(True) 500 으로 실패시킬지(False) 결정"""
+        with self._lock:
+            self.requests += 1
+            if random.random() < self.error_rate:
+                self.errors += 1
+                return False
+            self.received[callback_id] = (time.perf_counter(), payload)
+            return True
+
+
+def make_handler(state: CallbackStubState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # 클라이언트 연결 재사용 확인
+
+        def log_message(self, *args):
+            pass
+
+        def _json(self, status: int, payload: dict):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not self.path.startswith("/callback/"):
+                return self._json(404, {"status": "FAIL", "message": "not found"})
+            time.sleep(state.latency)
+            if not state.record(self.path[len("/callback/"):], payload):
+                return self._json(500, {"status": "FAIL", "message": "stub error"})
+            self._json(200, {"taskId": self.path.rsplit("/", 1)[-1], "status": "SUCCESS"})
+
+    return Handler
+
+
+def start_server(port: int = 0, **options):
+    """백그라운드 스레드에서 서버 시작 후 (server, state) 반환 (port=0 이면 임의 포트)"""
+    state = CallbackStubState(**options)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="무작위 500 비율 (0~1)")
+    parser.add_argument("--latency", type=float, default=0.0, help="응답 지연(초)")
+    args = parser.parse_args()
+
+    server, state = start_server(args.port, error_rate=args.error_rate, latency=args.latency)
+    print(f"stub callback server: http://127.0.0.1:{server.server_address[1]}/callback/<id>")
+    try:
+        while True:
+            time.sleep(5)
+            print(f"requests={state.requests} errors={state.errors} received={len(state.received)}")
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""서비스 카탈로그
+
+중첩 dict 형태의 SERVICE_CATEGORIES 를 단계 레코드 목록으로 평탄화하고,
+카테고리별 단계와 합계를 미리 만들어 둡니다.
+JSON/YAML 파일에서 읽을 수 있으며, CatalogFile 로 파일 변경 시 재시작 없이 다시 읽습니다.
+
+카탈로그 형식 (단계 아래에 하위 단계를 한 번 더 둘 수 있음)
+    {"카테고리": {"단계": {"features": [...], "outputs": [...], "cost": 100000},
+                  "단계": {"하위_단계": {"features": [...], "cost": 200000}}}}
+"""
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+class CatalogStep:
+    """카탈로그의 단계 하나 (하위 단계는 path 에 상위 단계와 함께 기록)"""
+    __slots__ = ("category", "path", "features", "outputs", "cost")
+
+    def __init__(self, category: str, path: Tuple[str, ...], features: Tuple[str, ...],
+                 outputs: Tuple[str, ...], cost: int):
+        self.category = category
+        self.path = path
+        self.features = features
+        self.outputs = outputs
+        self.cost = cost
+
+    @property
+    def label(self) -> str:
+        """표시용 단계 이름 (예: "AI 모델 개발 > 파인튜닝")"""
+        return " > ".join([self.path[0].replace("_", " "), *self.path[1:]])
+
+    def __repr__(self) -> str:
+        return f"CatalogStep({self.category!r}, {self.path!r}, cost={self.cost})"
+
+
+class ServiceCatalog:
+    """평탄화 + 색인된 서비스 카탈로그"""
+
+    def __init__(self, service_categories: dict):
+        self.nested = service_categories
+        self.fingerprint = hashlib.sha256(
+            json.dumps(service_categories, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:16]
+
+        steps: List[CatalogStep] = []
+        for category, category_steps in service_categories.items():
+            for step, content in category_steps.items():
+                if not isinstance(content, dict):
+                    continue
+                if "features" in content:
+                    steps.append(_make_step(category, (step,), content))
+                else:
+                    for substep, subcontent in content.items():
+                        if isinstance(subcontent, dict) and "features" in subcontent:
+                            steps.append(_make_step(category, (step, substep), subcontent))
+        self.steps: Tuple[CatalogStep, ...] = tuple(steps)
+
+        self.by_category: Dict[str, Tuple[CatalogStep, ...]] = {
+            category: tuple(s for s in steps if s.category == category) for category in service_categories
+        }
+        self.category_totals: Dict[str, int] = {
+            category: sum(s.cost for s in category_steps) for category, category_steps in self.by_category.items()
+        }
+
+    @property
+    def categories(self) -> List[str]:
+        return list(self.by_category)
+
+    def total(self, categories: Iterable[str]) -> int:
+        """선택된 카테고리 전체 범위 비용 합계 (중복 카테고리는 한 번만)"""
+        return sum(self.category_totals.get(category, 0) for category in dict.fromkeys(categories))
+
+    @classmethod
+    def from_file(cls, path: str) -> "ServiceCatalog":
+        """JSON 또는 YAML(.yaml/.yml, PyYAML 필요) 파일에서 카탈로그 로드"""
+        with open(path, encoding="utf-8") as f:
+            if path.endswith((".yaml", ".yml")):
+                try:
+                    import yaml
+                except ImportError:
+                    raise RuntimeError("YAML 카탈로그를 읽으려면 PyYAML 이 필요합니다. (pip install pyyaml)")
+                data = yaml.safe_load(f)
+            else:
+                data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"카탈로그 형식이 올바르지 않습니다: {path}")
+        return cls(data)
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+
+def _make_step(category: str, path: Tuple[str, ...], content: dict) -> CatalogStep:
+    return CatalogStep(
+        category, path,
+        tuple(content.get("features", ())),
+        tuple(content.get("outputs", ())),
+        int(content.get("cost", 0)),
+    )
+
+
+class CatalogFile:
+    """카탈로그 파일의 변경을 감지해 다시 읽기"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._mtime = None
+
+    def load(self) -> ServiceCatalog:
+        mtime = os.stat(self.path).st_mtime_ns
+        catalog = ServiceCatalog.from_file(self.path)
+        self._mtime = mtime
+        return catalog
+
+    def reload_if_changed(self) -> Optional[ServiceCatalog]:
+        """파일이 바뀌었으면 새 카탈로그를, 아니면 None 을 반환"""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        if mtime == self._mtime:
+            return None
+        return self.load()
@@ -0,0 +1,128 @@
+"""카탈로그 기반 카테고리 분류기
+
+카탈로그의 단계마다(단계 이름 + 기능 + 산출물) 문자 n-gram 을 해시한 TF-IDF 벡터를 만들어
+행렬로 미리 계산해 두고, 발화 벡터와의 코사인 유사도를 행렬-벡터 곱 한 번으로 구합니다.
+카테고리 점수는 그 카테고리 단계들 중 가장 높은 유사도이며, 키워드가 맞지 않는 발화
+("ETL 파이프라인", "매출 현황 분석" 등)의 카테고리를 추론할 때 사용합니다.
+
+- 해시는 crc32 를 사용해 프로세스가 달라도 같은 색인이 나오므로 시작 아티팩트에 그대로 저장할 수 있음
+- 발화 벡터는 희소하므로 해당 열만 모아 곱함 (전치 행렬을 저장해 열 접근이 연속 메모리)
+- numpy 와 행렬은 키워드가 맞지 않는 발화가 처음 들어올 때 불러오고 만듦 (서버 시작 시간 단축,
+  시작 아티팩트에는 해시한 n-gram 개수만 저장). numpy 가 없으면 분류하지 않음(빈 결과)
+"""
+import math
+import re
+import threading
+import zlib
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from catalog import ServiceCatalog
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_WORD_RE = re.compile(r"[0-9a-z가-힣]+")
+
+
+def char_ngrams(text: str, sizes: Tuple[int, ...] = (2, 3)) -> List[str]:
+    """단어 경계를 공백으로 표시한 문자 n-gram 목록 ("웹 앱" → " 웹", "웹 ", " 웹 ", ...)"""
+    padded = f" {' '.join(_WORD_RE.findall(text.lower().replace('_', ' ')))} "
+    return [padded[i:i + n] for n in sizes for i in range(len(padded) - n + 1) if padded[i:i + n].strip()]
+
+
+class CategoryClassifier:
+    """해시 문자 n-gram TF-IDF 최근접 단계 분류기"""
+
+    def __init__(self, catalog: ServiceCatalog, hints: Optional[Dict[str, Iterable[str]]] = None, dim: int = 1 << 12):
+        self.dim = dim
+        documents: Dict[str, List[str]] = {category: [] for category in catalog.by_category}
+        for category, steps in catalog.by_category.items():
+            for step in steps:
+                documents[category].append(" ".join([category, *step.path, *step.features, *step.outputs]))
+        # 카탈로그에 없는 표현(키워드 규칙, 동의어)은 카테고리별 문서 하나로 추가
+        for category, words in (hints or {}).items():
+            if category in documents:
+                documents[category].append(" ".join(words))
+
+        # 단계(문서)를 카테고리별로 연속 배치하고 카테고리별 문서 수를 기록
+        self.categories = [category for category, docs in documents.items() if docs]
+        self._sizes = [len(documents[category]) for category in self.categories]
+        self._rows = [Counter(self._hash(char_ngrams(doc))) for category in self.categories for doc in documents[category]]
+        self._init_vectors()
+
+    def _init_vectors(self) -> None:
+        self._np = None
+        self._vectors_lock = threading.Lock()
+        self._vectors_ready = False
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in ("_np", "_vectors_lock", "_vectors_ready", "_starts", "idf", "matrix_t"):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_vectors()
+
+    def _build_vectors(self) -> bool:
+        """IDF 와 전치 행렬을 처음 사용할 때 계산 (numpy 가 없으면 False)"""
+        if self._vectors_ready:
+            return self._np is not None
+        with self._vectors_lock:
+            if self._vectors_ready:
+                return self._np is not None
+            try:
+                import numpy as np
+            except ImportError:
+                print("⚠️ numpy 가 설치되어 있지 않아 카탈로그 기반 카테고리 추론을 사용하지 않습니다.")
+                self._vectors_ready = True
+                return False
+            self._np = np
+            rows = self._rows
+            self._starts = np.cumsum([0] + self._sizes[:-1])
+
+            df = Counter(index for row in rows for index in row)
+            self.idf = np.ones(self.dim, dtype=np.float32)
+            for index, count in df.items():
+                self.idf[index] = math.log((1 + len(rows)) / (1 + count)) + 1
+
+            # (dim, 문서 수) 전치 행렬: 발화에 나온 해시 색인의 행만 모아 곱함
+            self.matrix_t = np.zeros((self.dim, len(rows)), dtype=np.float32)
+            for column, row in enumerate(rows):
+                indices = np.fromiter(row.keys(), dtype=np.int64, count=len(row))
+                self.matrix_t[indices, column] = self._weights(row.values(), indices)
+            self._vectors_ready = True
+            return True
+
+    def _hash(self, grams: Iterable[str]) -> List[int]:
+        mask = self.dim - 1
+        return [zlib.crc32(gram.encode("utf-8")) & mask for gram in grams]
+
+    def _weights(self, counts: Iterable[int], indices: "np.ndarray") -> "np.ndarray":
+        """로그 TF × IDF 를 L2 정규화"""
+        np = self._np
+        weights = (1 + np.log(np.fromiter(counts, dtype=np.float32))) * self.idf[indices]
+        norm = float(np.linalg.norm(weights))
+        return weights / norm if norm else weights
+
+    def rank(self, text: str) -> List[Tuple[str, float]]:
+        """카테고리별 점수(가장 비슷한 단계와의 코사인 유사도)를 높은 순으로 반환"""
+        counts = Counter(self._hash(char_ngrams(text)))
+        if not counts or not self._build_vectors():
+            return [(category, 0.0) for category in self.categories]
+        np = self._np
+        indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        scores = self._weights(counts.values(), indices) @ self.matrix_t[indices]
+        best = np.maximum.reduceat(scores, self._starts)
+        order = np.argsort(-best, kind="stable")
+        return [(self.categories[i], float(best[i])) for i in order]
+
+    def predict(self, text: str, min_score: float = 0.2, relative: float = 0.8, limit: int = 2) -> List[Tuple[str, float]]:
+        """점수가 min_score 이상이고 1위 점수의 relative 배 이상인 카테고리 (최대 limit 개)"""
+        ranked = self.rank(text)
+        if not ranked or ranked[0][1] < min_score:
+            return []
+        cutoff = max(min_score, ranked[0][1] * relative)
+        return [(category, score) for category, score in ranked[:limit] if score >= cutoff]
@@ -0,0 +1,110 @@
+"""견적 응답 캐시
+
+정규화한 슬롯 값(주제, 산출물, 기간, 예산)과 추론된 카테고리, 서비스 카탈로그 해시를 키로
+GPT 견적 결과를 보관합니다. 같은 키의 요청이 동시에 들어오면 진행 중인 LLM 호출 하나를
+함께 기다립니다(single-flight). 호출한 요청이 취소되면 함께 기다리던 요청 중 하나가 다시 계산합니다.
+"""
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Tuple
+
+
+def make_estimate_key(topic: str, output: str, period: str, budget: str,
+                      categories: Iterable[str], fingerprint: str) -> Tuple[Hashable, ...]:
+    """슬롯 값을 정규화해 캐시 키 생성"""
+    outputs = tuple(sorted({part.strip().lower() for part in output.split(",") if part.strip()}))
+    return (
+        " ".join(topic.lower().split()),
+        outputs,
+        re.sub(r"\s+", "", period.lower()),
+        re.sub(r"\D", "", budget),
+        tuple(sorted(set(categories))),
+        fingerprint,
+    )
+
+
+class _OwnerCancelled(Exception):
+    """계산을 실행하던 요청이 취소됨 (함께 기다리던 요청에 CancelledError 대신 전달해 다시 계산하게 함)"""
+
+
+class EstimateCache:
+    """크기/TTL 제한이 있는 견적 캐시 + 동일 요청 단일 호출"""
+
+    def __init__(self, max_entries: int = 1000, ttl: float = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+        # 지표
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, key: Hashable) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def has(self, key: Hashable) -> bool:
+        """캐시에 있거나 계산 중인 키인지 확인 (지표에 영향 없음)"""
+        item = self._data.get(key)
+        return key in self._inflight or (item is not None and item[0] > time.monotonic())
+
+    async def get_or_compute(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """캐시에 있으면 바로 반환하고, 없으면 factory 를 한 번만 실행해 결과를 공유"""
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except _OwnerCancelled:
+                return await self.get_or_compute(key, factory)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await factory()
+        except asyncio.CancelledError:
+            future.set_exception(_OwnerCancelled())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 기다리는 요청이 없어도 경고가 남지 않도록 처리
+            raise
+        else:
+            self.set(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._data),
+            "in_flight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
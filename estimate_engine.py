@@ -0,0 +1,99 @@
+"""견적 생성 실행 엔진
+
+동기 LLM 호출을 전용 스레드 풀에서 실행해 이벤트 루프가 막히지 않도록 하고,
+동시 실행 수 제한, 호출별 타임아웃, 대기열 길이 지표를 제공합니다.
+"""
+import asyncio
+import functools
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class EstimateTimeoutError(Exception):
+    """LLM 호출이 제한 시간 안에 끝나지 않았을 때 발생"""
+
+
+class EstimateExecutor:
+    """LLM 호출을 제한된 동시성으로 실행하는 실행기
+
+    - 코루틴 함수는 그대로 await 하고, 일반 함수는 전용 스레드 풀에서 실행합니다.
+    - 동시에 실행되는 호출 수는 max_concurrency 로 제한되며, 초과분은 대기열에서 기다립니다.
+    - 타임아웃이 나도 스레드에서 실행 중인 호출은 멈출 수 없으므로, 그 호출이 실제로 끝날 때 슬롯을 돌려줍니다.
+    """
+
+    def __init__(self, max_concurrency: int = 8, timeout: float = 60.0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="estimate")
+
+        # 지표
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """func 를 실행하고 결과를 반환 (동시성 제한 및 타임아웃 적용)"""
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.running += 1
+        release = self._release
+        try:
+            if inspect.iscoroutinefunction(func):
+                call = func(*args, **kwargs)
+            else:
+                loop = asyncio.get_running_loop()
+                future = self._pool.submit(functools.partial(func, *args, **kwargs))
+                future.add_done_callback(lambda _: self._release_threadsafe(loop))
+                release = None  # 스레드의 호출이 끝나면 위 콜백에서 반환
+                call = asyncio.wrap_future(future)
+            result = await asyncio.wait_for(call, self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise EstimateTimeoutError(f"LLM 호출이 {self.timeout:g}초 안에 완료되지 않았습니다.")
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            if release is not None:
+                release()
+
+        self.completed += 1
+        return result
+
+    def _release(self) -> None:
+        self.running -= 1
+        self._semaphore.release()
+
+    def _release_threadsafe(self, loop: asyncio.AbstractEventLoop) -> None:
+        """스레드 풀에서 호출이 끝났을 때 이벤트 루프에서 슬롯 반환"""
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:  # 이벤트 루프가 이미 닫힘 (종료 중)
+            pass
+
+    @property
+    def queue_depth(self) -> int:
+        """실행 슬롯을 기다리는 호출 수"""
+        return self.waiting
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "timeout": self.timeout,
+            "queue_depth": self.waiting,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
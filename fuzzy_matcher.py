@@ -0,0 +1,67 @@
+"""색인 기반 유사 문자열 매칭기
+
+difflib.get_close_matches(query, candidates, n=1, cutoff) 와 같은 결과를 반환하되,
+문자 역색인으로 후보를 먼저 좁힌 뒤 가능성이 있는 후보만 SequenceMatcher 로 채점합니다.
+
+- 문자 역색인으로 질의와 공유하는 문자 수(= quick_ratio 의 분자)를 한 번에 계산
+- quick_ratio 상한이 cutoff 보다 낮은 후보는 채점하지 않음
+- 상한이 높은 후보부터 채점하고, 남은 후보의 상한이 현재 최고 점수보다 낮아지면 중단
+"""
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class FuzzyMatcher:
+    """후보 목록에 대해 가장 유사한 문자열 1개를 찾는 매칭기"""
+
+    def __init__(self, candidates: Iterable[str], cutoff: float = 0.5):
+        self.cutoff = cutoff
+        self.candidates: List[str] = list(dict.fromkeys(candidates))
+        self._lengths = [len(c) for c in self.candidates]
+        # 문자 → [(후보 번호, 해당 문자 개수)]
+        self._postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        for idx, candidate in enumerate(self.candidates):
+            for ch, count in Counter(candidate).items():
+                self._postings[ch].append((idx, count))
+
+    def best_match(self, query: str, cutoff: Optional[float] = None) -> str:
+        """가장 유사한 후보를 반환 (cutoff 미만이면 빈 문자열)"""
+        cutoff = self.cutoff if cutoff is None else cutoff
+        if not self.candidates:
+            return ""
+        if cutoff <= 0:
+            # 공유 문자가 없는 후보도 통과하므로 색인으로 좁힐 수 없음
+            bounds = [(1.0, idx) for idx in range(len(self.candidates))]
+        else:
+            bounds = self._upper_bounds(query, cutoff)
+
+        matcher = SequenceMatcher()
+        matcher.set_seq2(query)
+        best_score, best = -1.0, ""
+        for bound, idx in sorted(bounds, reverse=True):
+            if bound < best_score:
+                break
+            candidate = self.candidates[idx]
+            matcher.set_seq1(candidate)
+            score = matcher.ratio()
+            if score >= cutoff and (score, candidate) > (best_score, best):
+                best_score, best = score, candidate
+        return best
+
+    def _upper_bounds(self, query: str, cutoff: float) -> List[Tuple[float, int]]:
+        overlap: Dict[int, int] = defaultdict(int)
+        for ch, query_count in Counter(query).items():
+            for idx, count in self._postings.get(ch, ()):
+                overlap[idx] += count if count < query_count else query_count
+
+        query_len = len(query)
+        bounds = []
+        for idx, shared in overlap.items():
+            bound = 2.0 * shared / (self._lengths[idx] + query_len)
+            if bound >= cutoff:
+                bounds.append((bound, idx))
+        return bounds
+
+    def __len__(self) -> int:
+        return len(self.candidates)
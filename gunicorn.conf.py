@@ -0,0 +1,33 @@
+"""gunicorn 다중 프로세스 실행 설정
+
+    gunicorn -c gunicorn.conf.py main:app
+
+- 앱을 마스터 프로세스에서 한 번만 읽고(preload) 워커는 fork 로 물려받음
+  → 키워드 매처, 유사도 인덱스, 프롬프트 조각을 워커마다 다시 만들지 않음
+- fork 직전 gc.freeze() 로 물려받은 객체를 GC 대상에서 제외해 copy-on-write 페이지 복사를 줄임
+- 세션/결과는 워커 간 공유되도록 기본 저장소를 sqlite 로 사용 (SESSION_BACKEND 로 변경 가능)
+- LLM 호출 한도(LLM_REQUESTS_PER_MINUTE 등)는 워커마다 적용되므로 전체 한도를 워커 수로 나눠 설정
+- 견적 미리 생성(SPECULATIVE_ESTIMATES)은 프로세스별 캐시를 사용하므로 워커가 2개 이상이면 꺼짐
+"""
+import gc
+import multiprocessing
+import os
+
+# main 을 읽기 전에 설정해야 워커 간 세션이 공유됨
+os.environ.setdefault("SESSION_BACKEND", "sqlite")
+
+bind = f"0.0.0.0:{os.getenv('PORT', 8080)}"
+workers = int(os.getenv("WEB_CONCURRENCY", min(multiprocessing.cpu_count(), 4)))
+os.environ["WEB_CONCURRENCY"] = str(workers)  # main 에서 프로세스별 캐시에 의존하는 기능을 끄는 데 사용
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 120))
+graceful_timeout = 30
+keepalive = 5
+loglevel = os.getenv("LOG_LEVEL", "info")
+
+
+def when_ready(server):
+    # preload 로 만들어진 객체를 영구 세대로 옮겨 워커에서 GC 가 건드리지 않도록 함
+    gc.freeze()
+    server.log.info(f"preloaded app frozen ({gc.get_freeze_count()} objects), starting {workers} workers")
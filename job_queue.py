@@ -0,0 +1,184 @@
+"""견적 생성 작업 큐 (SQLite)
+
+웹 프로세스는 작업을 등록만 하고, 별도 워커 프로세스(worker.py)가 작업을 가져가 처리합니다.
+웹 프로세스가 재시작되거나 종료되어도 등록된 작업은 파일에 남아 이어서 처리됩니다.
+
+- 작업 상태: queued → running → done / failed
+- 작업 ID 는 사용자 ID 와 요청 내용(대화 ID 포함)으로 만들어 같은 턴을 여러 번 등록해도 한 번만 처리
+- running 상태로 lease 시간이 지난 작업(워커 비정상 종료)은 재시도 횟수가 남아 있으면 다시 가져갈 수 있음
+- 결과를 안내하기 전에 예외로 끝난 작업만 재시도 (대체 견적을 안내한 실패는 그대로 종료)
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class Job(NamedTuple):
+    job_id: str
+    user_id: str
+    payload: Dict[str, Any]
+    state: str
+    result: str
+    error: str
+    attempts: int
+    created_at: float
+
+
+def make_job_id(user_id: str, payload: Dict[str, Any]) -> str:
+    """사용자 ID + 요청 내용 기반의 작업 ID (같은 요청은 같은 ID, 턴마다 달라지는 추적 정보는 제외)"""
+    request = {key: value for key, value in payload.items() if key != "traceparent"}
+    raw = user_id + "\n" + json.dumps(request, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:24]
+
+
+class JobQueue:
+    def __init__(self, path: str, max_attempts: int = 3, lease_seconds: float = 120):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self._local = threading.local()
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " job_id TEXT PRIMARY KEY,"
+            " user_id TEXT NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " state TEXT NOT NULL,"
+            " result TEXT NOT NULL DEFAULT '',"
+            " error TEXT NOT NULL DEFAULT '',"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " created_at REAL NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " lease_until REAL NOT NULL DEFAULT 0)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, created_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS jobs_user ON jobs (user_id, created_at)")
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def enqueue(self, user_id: str, payload: Dict[str, Any]) -> str:
+        """작업 등록 (이미 등록된 작업이면 그대로 두고, 실패한 작업이면 다시 대기열에 넣음)"""
+        job_id = make_job_id(user_id, payload)
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR IGNORE INTO jobs (job_id, user_id, payload, state, created_at, updated_at)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, user_id, json.dumps(payload, ensure_ascii=False), QUEUED, now, now),
+        )
+        conn.execute(
+            "UPDATE jobs SET state = ?, attempts = 0, error = '', created_at = ?, updated_at = ?"
+            " WHERE job_id = ? AND state = ?",
+            (QUEUED, now, now, job_id, FAILED),
+        )
+        return job_id
+
+    def claim(self) -> Optional[Job]:
+        """가장 오래된 대기 작업(또는 lease 가 만료된 실행 중 작업)을 가져와 running 으로 표시"""
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 재시도 횟수를 다 쓴 채 lease 가 만료된 작업(처리 중 워커가 계속 죽는 작업)은 실패 처리
+            conn.execute(
+                "UPDATE jobs SET state = ?, error = ?, updated_at = ?"
+                " WHERE state = ? AND lease_until < ? AND attempts >= ?",
+                (FAILED, "lease expired", now, RUNNING, now, self.max_attempts),
+            )
+            row = conn.execute(
+                "SELECT job_id FROM jobs WHERE state = ? OR (state = ? AND lease_until < ? AND attempts < ?)"
+                " ORDER BY created_at LIMIT 1",
+                (QUEUED, RUNNING, now, self.max_attempts),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET state = ?, attempts = attempts + 1, lease_until = ?, updated_at = ?"
+                " WHERE job_id = ?",
+                (RUNNING, now + self.lease_seconds, now, row[0]),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get(row[0])
+
+    def touch(self, job_id: str) -> None:
+        """처리 중인 작업의 lease 연장 (다른 워커가 가져가지 않도록)"""
+        now = time.time()
+        self._connect().execute(
+            "UPDATE jobs SET lease_until = ?, updated_at = ? WHERE job_id = ? AND state = ?",
+            (now + self.lease_seconds, now, job_id, RUNNING),
+        )
+
+    def complete(self, job_id: str, result: str) -> None:
+        self._connect().execute(
+            "UPDATE jobs SET state = ?, result = ?, error = '', updated_at = ? WHERE job_id = ?",
+            (DONE, result, time.time(), job_id),
+        )
+
+    def fail(self, job_id: str, error: str, result: str = "", retry: bool = True) -> None:
+        """처리 실패 기록 (retry 이고 재시도 횟수가 남아 있으면 다시 대기열로)"""
+        self._connect().execute(
+            "UPDATE jobs SET state = CASE WHEN ? AND attempts < ? THEN ? ELSE ? END,"
+            " error = ?, result = ?, updated_at = ? WHERE job_id = ?",
+            (retry, self.max_attempts, QUEUED, FAILED, error, result, time.time(), job_id),
+        )
+
+    def get(self, job_id: str) -> Optional[Job]:
+        row = self._connect().execute(
+            "SELECT job_id, user_id, payload, state, result, error, attempts, created_at FROM jobs WHERE job_id = ?",
+            (job_id,),
+        ).fetchone()
+        return _row_to_job(row)
+
+    def latest_for_user(self, user_id: str) -> Optional[Job]:
+        row = self._connect().execute(
+            "SELECT job_id, user_id, payload, state, result, error, attempts, created_at FROM jobs"
+            " WHERE user_id = ? ORDER BY created_at DESC LIMIT 1",
+            (user_id,),
+        ).fetchone()
+        return _row_to_job(row)
+
+    def position(self, job: Job) -> int:
+        """대기 중인 작업의 순번 (1부터)"""
+        row = self._connect().execute(
+            "SELECT COUNT(*) FROM jobs WHERE state = ? AND created_at <= ?", (QUEUED, job.created_at)
+        ).fetchone()
+        return row[0]
+
+    def counts(self) -> Dict[str, int]:
+        rows = self._connect().execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        return {state: count for state, count in rows}
+
+    def purge(self, older_than: float) -> int:
+        """완료/실패 후 older_than 초가 지난 작업 삭제"""
+        return self._connect().execute(
+            "DELETE FROM jobs WHERE state IN (?, ?) AND updated_at < ?",
+            (DONE, FAILED, time.time() - older_than),
+        ).rowcount
+
+
+def _row_to_job(row) -> Optional[Job]:
+    if row is None:
+        return None
+    job_id, user_id, payload, state, result, error, attempts, created_at = row
+    return Job(job_id, user_id, json.loads(payload), state, result, error, attempts, created_at)
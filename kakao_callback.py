@@ -0,0 +1,104 @@
+"""카카오 스킬 콜백 응답 전송
+
+콜백(useCallback)을 켠 블록은 요청에 userRequest.callbackUrl 을 담아 보내며,
+스킬 서버는 5초 안에 {"useCallback": true} 로 먼저 응답한 뒤 1분 안에 최종 응답을 callbackUrl 로 보냅니다.
+CallbackClient 는 연결을 재사용하는 aiohttp 세션 하나로 최종 응답을 전송하고,
+네트워크 오류와 429/5xx 응답은 지터가 적용된 지수 백오프로 재시도합니다.
+요청 본문에 담긴 URL 로 요청을 보내므로 허용한 호스트(기본 kakao.com 및 하위 도메인)로만 전송합니다.
+aiohttp 는 첫 콜백을 보낼 때 불러옵니다 (서버 시작 시간 단축, 콜백을 쓰지 않으면 설치하지 않아도 됨).
+"""
+import asyncio
+import random
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    import aiohttp
+
+_aiohttp = None
+
+
+def get_aiohttp():
+    """aiohttp 모듈을 첫 콜백 전송 시 불러옴"""
+    global _aiohttp
+    if _aiohttp is None:
+        import aiohttp
+        _aiohttp = aiohttp
+    return _aiohttp
+
+
+class CallbackClient:
+    """카카오 콜백 URL 로 스킬 응답을 보내는 연결 풀 클라이언트"""
+
+    def __init__(self, allowed_hosts: Iterable[str] = ("kakao.com",), timeout: float = 10, max_retries: int = 3,
+                 retry_base: float = 0.5, pool_size: int = 100):
+        self.allowed_hosts = tuple(host.strip().lower() for host in allowed_hosts if host.strip())
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.pool_size = pool_size
+        self._session: Optional["aiohttp.ClientSession"] = None
+
+        # 지표
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+
+    def is_allowed(self, url: str) -> bool:
+        """허용한 호스트의 http(s) URL 인지 확인"""
+        try:
+            parts = urlsplit(url)
+            host = (parts.hostname or "").lower()
+        except ValueError:
+            return False
+        return parts.scheme in ("http", "https") and any(
+            host == allowed or host.endswith("." + allowed) for allowed in self.allowed_hosts
+        )
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        # 이벤트 루프 안에서 처음 사용할 때 생성 (gunicorn preload 후 워커별로 생성됨)
+        if self._session is None or self._session.closed:
+            aiohttp = get_aiohttp()
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def post(self, url: str, payload: Dict[str, Any]) -> bool:
+        """payload 를 url 로 전송 (성공 여부 반환, 4xx 응답은 재시도하지 않음)"""
+        if not self.is_allowed(url):
+            self.failed += 1
+            print(f"⚠️ 허용되지 않은 콜백 URL 입니다: {url}")
+            return False
+
+        aiohttp = get_aiohttp()
+        error = ""
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._get_session().post(url, json=payload) as response:
+                    await response.read()
+                    if response.status < 400:
+                        self.sent += 1
+                        return True
+                    retryable = response.status == 429 or response.status >= 500
+                    error = f"HTTP {response.status}"
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                retryable = True
+                error = str(e) or type(e).__name__
+            if not retryable or attempt == self.max_retries:
+                break
+            self.retries += 1
+            await asyncio.sleep(random.uniform(0, self.retry_base * 2 ** attempt))
+
+        self.failed += 1
+        print(f"⚠️ 콜백 전송 실패 ({error}): {url}")
+        return False
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"sent": self.sent, "failed": self.failed, "retries": self.retries}
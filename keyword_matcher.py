@@ -0,0 +1,115 @@
+"""다중 키워드 매칭기 (Aho–Corasick 오토마톤)
+
+주제/산출물/카테고리 키워드를 한 번에 등록해 오토마톤을 만들어 두고,
+발화를 한 번만 훑어서 모든 키워드의 위치와 라벨을 찾습니다.
+키워드 수와 상관없이 매칭 비용은 입력 길이에 비례합니다.
+"""
+from collections import deque
+from typing import Dict, FrozenSet, Hashable, Iterable, List, NamedTuple, Set, Tuple
+
+
+class KeywordHit(NamedTuple):
+    start: int  # 소문자로 변환한 입력 기준 시작 위치
+    end: int
+    keyword: str
+    labels: FrozenSet[Hashable]
+
+
+class KeywordMatcher:
+    """키워드 → 라벨 집합을 등록한 뒤 build() 로 오토마톤을 구성"""
+
+    def __init__(self):
+        self._labels: Dict[str, Set[Hashable]] = {}
+        self._goto: List[Dict[str, int]] = []
+        self._fail: List[int] = []
+        self._out: List[Tuple[Tuple[str, FrozenSet[Hashable]], ...]] = []
+        self._built = False
+
+    def add(self, keyword: str, label: Hashable) -> None:
+        keyword = keyword.lower()
+        if not keyword:
+            return
+        self._labels.setdefault(keyword, set()).add(label)
+        self._built = False
+
+    def add_many(self, keywords: Iterable[str], label: Hashable) -> None:
+        for keyword in keywords:
+            self.add(keyword, label)
+
+    def build(self) -> "KeywordMatcher":
+        goto: List[Dict[str, int]] = [{}]
+        out: List[List[Tuple[str, FrozenSet[Hashable]]]] = [[]]
+
+        # 1) 트라이 구성
+        for keyword, labels in self._labels.items():
+            node = 0
+            for ch in keyword:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                node = nxt
+            out[node].append((keyword, frozenset(labels)))
+
+        # 2) 실패 링크 계산 (BFS), 실패 노드의 출력은 미리 합쳐 둠
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in goto[node].items():
+                queue.append(nxt)
+                if node:
+                    f = fail[node]
+                    while f and ch not in goto[f]:
+                        f = fail[f]
+                    fail[nxt] = goto[f].get(ch, 0)
+                out[nxt].extend(out[fail[nxt]])
+
+        self._goto = goto
+        self._fail = fail
+        self._out = [tuple(o) for o in out]
+        self._built = True
+        return self
+
+    def _scan(self, text: str):
+        if not self._built:
+            self.build()
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                yield i, out[node]
+
+    def find_all(self, text: str) -> List[KeywordHit]:
+        """입력에 포함된 모든 키워드를 위치 순서대로 반환"""
+        hits = []
+        for i, outputs in self._scan(text.lower()):
+            for keyword, labels in outputs:
+                hits.append(KeywordHit(i - len(keyword) + 1, i + 1, keyword, labels))
+        hits.sort(key=lambda hit: (hit.start, hit.end))
+        return hits
+
+    def keywords_by_label(self, text: str) -> Dict[Hashable, Set[str]]:
+        """라벨별로 입력에 포함된 키워드 집합을 반환"""
+        found: Dict[Hashable, Set[str]] = {}
+        for _, outputs in self._scan(text.lower()):
+            for keyword, labels in outputs:
+                for label in labels:
+                    found.setdefault(label, set()).add(keyword)
+        return found
+
+    def labels(self, text: str) -> Set[Hashable]:
+        """입력에 포함된 키워드들의 라벨 집합을 반환"""
+        found: Set[Hashable] = set()
+        for _, outputs in self._scan(text.lower()):
+            for _, labels in outputs:
+                found |= labels
+        return found
+
+    def __len__(self) -> int:
+        return len(self._labels)
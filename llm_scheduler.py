@@ -0,0 +1,191 @@
+"""LLM 호출 스케줄러
+
+EstimateExecutor 앞단에서 외부 LLM 호출의 순서와 속도를 조절합니다.
+
+- 분당 요청 수 / 분당 토큰 수 토큰 버킷으로 호출 속도 제한
+- 레이트 리밋(429) 응답은 지터가 적용된 지수 백오프로 재시도
+- /result 를 조회 중인 사용자의 요청을 우선 처리
+- 대기열이 가득 차면 QueueFullError 로 즉시 거절하고, 대기 순번 조회 제공
+"""
+import asyncio
+import itertools
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from estimate_engine import EstimateExecutor
+
+PRIORITY_POLLING = 0  # 결과를 조회 중인 사용자
+PRIORITY_NORMAL = 1
+PRIORITY_SPECULATIVE = 2  # 사용자가 아직 요청하지 않은 미리 생성 견적
+PRIORITY_BATCH = 3  # 일괄 견적 (대화 중인 사용자 요청을 먼저 처리)
+
+
+class QueueFullError(Exception):
+    """LLM 대기열이 가득 차 요청을 받을 수 없을 때 발생"""
+
+
+class TokenBucket:
+    """분당 허용량 기반 토큰 버킷"""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """amount 만큼 사용할 수 있을 때까지 남은 시간 (0이면 바로 사용 가능)"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float):
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """openai.error.RateLimitError 또는 HTTP 429 응답 여부"""
+    return getattr(exc, "http_status", None) == 429 or type(exc).__name__ == "RateLimitError"
+
+
+def retry_after_seconds(exc: BaseException) -> float:
+    headers = getattr(exc, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class _Waiter:
+    __slots__ = ("key", "priority", "seq", "tokens", "future")
+
+    def __init__(self, key: str, priority: int, seq: int, tokens: int, future: asyncio.Future):
+        self.key = key
+        self.priority = priority
+        self.seq = seq
+        self.tokens = tokens
+        self.future = future
+
+    def order(self):
+        return (self.priority, self.seq)
+
+
+class LLMScheduler:
+    """우선순위 대기열 + 토큰 버킷 + 재시도를 적용해 실행기로 LLM 호출을 전달"""
+
+    def __init__(self, executor: EstimateExecutor, requests_per_minute: float = 500,
+                 tokens_per_minute: float = 90000, max_queue: int = 200, max_retries: int = 4,
+                 retry_base: float = 1.0, retry_max: float = 20.0):
+        self.executor = executor
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.max_queue = max_queue
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+
+        self._waiters: List[_Waiter] = []
+        self._active = 0
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+
+        # 지표
+        self.retries = 0
+        self.rejected = 0
+        self.rate_limited = 0
+
+    async def submit(self, key: str, func: Callable[[], Any], estimated_tokens: int = 3000,
+                     priority: int = PRIORITY_NORMAL) -> Any:
+        """func 를 대기열 순서와 호출 속도 제한에 맞춰 실행"""
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise QueueFullError(f"LLM 대기열이 가득 찼습니다 ({self.max_queue}건).")
+
+        seq = next(self._seq)
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(key, priority, seq, estimated_tokens)
+            try:
+                return await self.executor.run(func)
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    raise
+                self.rate_limited += 1
+                if attempt == self.max_retries:
+                    raise
+                self.retries += 1
+                delay = random.uniform(0, min(self.retry_max, self.retry_base * 2 ** attempt))
+                delay = max(delay, retry_after_seconds(e))
+            finally:
+                # 백오프 대기 중에는 실행 슬롯을 다른 요청에 양보
+                self._active -= 1
+                self._dispatch()
+            await asyncio.sleep(delay)
+
+    async def _acquire(self, key: str, priority: int, seq: int, tokens: int):
+        future = asyncio.get_running_loop().create_future()
+        waiter = _Waiter(key, priority, seq, tokens, future)
+        self._waiters.append(waiter)
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            elif future.done() and not future.cancelled():
+                self._active -= 1  # 슬롯을 받은 직후 취소된 경우 반납
+            self._dispatch()
+            raise
+
+    def _dispatch(self):
+        """실행 슬롯과 토큰 버킷이 허용하는 만큼 우선순위 순으로 대기 요청을 깨움"""
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+
+        while self._waiters and self._active < self.executor.max_concurrency:
+            waiter = min(self._waiters, key=_Waiter.order)
+            wait = max(self.request_bucket.wait_time(1), self.token_bucket.wait_time(waiter.tokens))
+            if wait > 0:
+                self._wakeup = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+            self.request_bucket.consume(1)
+            self.token_bucket.consume(waiter.tokens)
+            self._waiters.remove(waiter)
+            self._active += 1
+            waiter.future.set_result(None)
+
+    def promote(self, key: str, priority: int = PRIORITY_POLLING):
+        """결과를 조회 중인 사용자(또는 미리 생성 중인 견적을 실제로 요청한 사용자)의 대기 요청을 앞당김"""
+        for waiter in self._waiters:
+            if waiter.key == key and waiter.priority > priority:
+                waiter.priority = priority
+
+    def position(self, key: str) -> int:
+        """대기 순번 (1부터, 대기 중이 아니면 0)"""
+        for index, waiter in enumerate(sorted(self._waiters, key=_Waiter.order), start=1):
+            if waiter.key == key:
+                return index
+        return 0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": len(self._waiters),
+            "active": self._active,
+            "max_queue": self.max_queue,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,115 @@
+"""카탈로그 기반 로컬 견적 계산기
+
+서비스 카탈로그에 정의된 단계별 비용으로 카테고리 소계와 총 합계를 바로 계산하고,
+예산이 부족하면 핵심 단계를 우선하는 축소안(배낭 문제)을 구성합니다.
+LLM 응답 전 즉시 안내하는 견적과, LLM 호출 실패 시 대체 견적으로 사용합니다.
+"""
+from functools import reduce
+from math import gcd
+from typing import Dict, List, NamedTuple
+
+from catalog import ServiceCatalog
+
+# 단계 이름에 포함된 키워드로 우선순위 결정 (높을수록 핵심 단계, 해당 없으면 1)
+STEP_PRIORITIES = [
+    (3, ["기획", "개발", "구현", "mvp", "api", "수집", "프로토타입"]),
+    (2, ["전처리", "정제", "테스트", "qa", "평가", "배포", "적재", "설계"]),
+]
+
+# 축소안 계산 시 비용 단위 (비용을 이 단위로 올림해 DP 테이블 크기를 예산 / 단위 이하로 제한)
+BUDGET_UNIT = 10_000
+
+
+class EstimateLine(NamedTuple):
+    category: str
+    step: str  # 표시용 단계 이름 (예: "AI 모델 개발 > 파인튜닝")
+    cost: int
+    priority: int
+
+
+class LocalEstimate(NamedTuple):
+    lines: List[EstimateLine]
+    excluded: List[EstimateLine]
+    total: int
+
+
+def step_priority(step: str) -> int:
+    lower = step.lower()
+    for priority, keywords in STEP_PRIORITIES:
+        if any(kw in lower for kw in keywords):
+            return priority
+    return 1
+
+
+def catalog_steps(catalog: ServiceCatalog, categories: List[str]) -> List[EstimateLine]:
+    """선택된 카테고리의 모든 단계 (중첩 단계 포함)"""
+    return [
+        EstimateLine(category, step.label, step.cost, step_priority(step.path[0]))
+        for category in dict.fromkeys(categories)
+        for step in catalog.by_category.get(category, ())
+    ]
+
+
+def estimate_full(catalog: ServiceCatalog, categories: List[str]) -> LocalEstimate:
+    """선택된 카테고리 전체 범위 견적"""
+    lines = catalog_steps(catalog, categories)
+    return LocalEstimate(lines, [], sum(line.cost for line in lines))
+
+
+def estimate_within_budget(catalog: ServiceCatalog, categories: List[str], budget: int) -> LocalEstimate:
+    """예산 안에서 우선순위 합이 가장 큰 단계 조합을 선택 (동률이면 예산을 더 활용하는 조합)"""
+    steps = catalog_steps(catalog, categories)
+    total = sum(line.cost for line in steps)
+    if budget >= total:
+        return LocalEstimate(steps, [], total)
+
+    # 비용을 공약수 단위(BUDGET_UNIT 보다 작으면 BUDGET_UNIT 으로 올림)로 축소해 DP 테이블 크기를 줄임
+    # 올림한 비용으로 예산을 지키므로 선택된 단계의 실제 비용 합도 예산을 넘지 않음
+    unit = max(reduce(gcd, (line.cost for line in steps if line.cost), 0), BUDGET_UNIT)
+    weights = [-(-line.cost // unit) for line in steps]
+    capacity = min(max(budget, 0) // unit, sum(weights))
+    scale = sum(weights) + 1  # 우선순위 합을 먼저 비교하고 동률이면 비용 합 비교
+    values = [line.priority * scale + weight for line, weight in zip(steps, weights)]
+
+    best = [0] * (capacity + 1)
+    chosen: List[bytearray] = []
+    for weight, value in zip(weights, values):
+        take = bytearray(capacity + 1)
+        for c in range(capacity, weight - 1, -1):
+            candidate = best[c - weight] + value
+            if candidate > best[c]:
+                best[c] = candidate
+                take[c] = 1
+        chosen.append(take)
+
+    selected = [False] * len(steps)
+    c = capacity
+    for i in range(len(steps) - 1, -1, -1):
+        if chosen[i][c]:
+            selected[i] = True
+            c -= weights[i]
+
+    lines = [line for line, keep in zip(steps, selected) if keep]
+    excluded = [line for line, keep in zip(steps, selected) if not keep]
+    return LocalEstimate(lines, excluded, sum(line.cost for line in lines))
+
+
+def render_estimate(estimate: LocalEstimate) -> str:
+    """📂 카테고리 / 💰 소계 / 💰 총 합계 형식으로 출력"""
+    by_category: Dict[str, List[EstimateLine]] = {}
+    for line in estimate.lines:
+        by_category.setdefault(line.category, []).append(line)
+
+    parts = []
+    for category, lines in by_category.items():
+        block = [f"📂 {category.replace('_', ' ')}"]
+        block += [f"- {line.step}: {line.cost:,}원" for line in lines]
+        block.append(f"💰 소계: {sum(line.cost for line in lines):,}원")
+        parts.append("\n".join(block))
+    parts.append(f"💰 총 합계: {estimate.total:,}원")
+
+    if estimate.excluded:
+        upgrades = [f"- {line.category.replace('_', ' ')} · {line.step}: {line.cost:,}원" for line in estimate.excluded]
+        parts.append("⏭️ 향후 업그레이드 항목:\n" + "\n".join(upgrades))
+
+    return "\n\n".join(parts)
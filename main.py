@@ -1,25 +1,142 @@
-from fastapi import FastAPI, Request, BackgroundTasks
-from fastapi.responses import JSONResponse
-import openai
+from fastapi import FastAPI, Request, BackgroundTasks, Header, Query
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse
 from dotenv import load_dotenv
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Callable, Optional, Awaitable
 import uuid
-from difflib import get_close_matches
 import uvicorn
-import re
+import asyncio
+import json
+import hmac
+import time
+import threading
+from estimate_engine import EstimateExecutor, EstimateTimeoutError
+from llm_scheduler import LLMScheduler, QueueFullError, PRIORITY_BATCH, PRIORITY_NORMAL, PRIORITY_SPECULATIVE
+from session_store import SessionStore, create_session_store
+from keyword_matcher import KeywordMatcher
+from fuzzy_matcher import FuzzyMatcher
+from estimate_cache import EstimateCache, make_estimate_key
+from local_estimator import estimate_full, estimate_within_budget, render_estimate
+from prompt_builder import PromptAssembler
+from prompt_budget import COMPACTION_LEVELS, PromptPlan, completion_tokens, count_tokens
+from catalog import CatalogFile, ServiceCatalog
+from category_classifier import CategoryClassifier
+from metrics import MetricsRegistry
+from job_queue import JobQueue, QUEUED, RUNNING
+from startup_artifact import artifact_key, load_artifact, save_artifact
+from utterance_parser import parse_utterance
+from kakao_callback import CallbackClient
+from result_store import ResultStore
+from tracing import SPAN_KIND_CLIENT, SPAN_KIND_SERVER, FileSpanExporter, Tracer
+from batch_quotes import iter_csv_rows, iter_file, quote_rows, spool_body, to_csv, to_ndjson
 
 # 환경 변수 로드
 load_dotenv()
-openai.api_key = os.getenv("OPENAI_API_KEY")
 
 app = FastAPI()
 
-# 저장소 (실제 운영에서는 DB나 Redis 사용)
-GPT_RESPONSES: Dict[str, str] = {}
-USER_INPUTS: Dict[str, str] = {}
-USER_SLOT_STATE: Dict[str, Dict[str, str]] = {}
-SHRUNK_RESPONSES: Dict[str, str] = {}
+# GPT 호출 실행기 (이벤트 루프를 막지 않도록 별도 스레드 풀에서 제한된 동시성으로 실행)
+ESTIMATE_EXECUTOR = EstimateExecutor(
+    max_concurrency=int(os.getenv("GPT_MAX_CONCURRENCY", 8)),
+    timeout=float(os.getenv("GPT_TIMEOUT_SECONDS", 60)),
+)
+
+# LLM 호출 스케줄러 (호출 속도 제한, 429 재시도, 결과 조회 중인 사용자 우선, 대기열 상한)
+LLM_SCHEDULER = LLMScheduler(
+    ESTIMATE_EXECUTOR,
+    requests_per_minute=float(os.getenv("LLM_REQUESTS_PER_MINUTE", 500)),
+    tokens_per_minute=float(os.getenv("LLM_TOKENS_PER_MINUTE", 90000)),
+    max_queue=int(os.getenv("LLM_MAX_QUEUE", 200)),
+    max_retries=int(os.getenv("LLM_MAX_RETRIES", 4)),
+)
+GPT_ESTIMATED_TOKENS = int(os.getenv("GPT_ESTIMATED_TOKENS", 3000))  # 요청당 예상 토큰 (프롬프트 + 응답)
+
+# 지표 (METRICS_ENABLED=0 이면 기록하지 않음)
+METRICS = MetricsRegistry(enabled=os.getenv("METRICS_ENABLED", "1") == "1")
+SLOT_EXTRACTION_SECONDS = METRICS.histogram("kakao_slot_extraction_seconds", "웹훅 턴별 슬롯 추출 + 유사도 매칭 시간")
+PROMPT_BUILD_SECONDS = METRICS.histogram("estimate_prompt_build_seconds", "견적 프롬프트 생성 시간")
+LLM_QUEUE_WAIT_SECONDS = METRICS.histogram("llm_queue_wait_seconds", "LLM 실행 슬롯 대기 시간")
+LLM_CALL_SECONDS = METRICS.histogram("llm_call_seconds", "LLM 호출 시간")
+LLM_TOKENS = METRICS.counter("llm_tokens_total", "LLM 사용 토큰 수 (type=prompt|completion)")
+SLOT_TURNS = METRICS.counter("kakao_slot_turns_total", "슬롯 필링 턴 수 (result=prompt|complete)")
+PROMPT_TOKENS = METRICS.counter("estimate_prompt_tokens_total", "견적 프롬프트 토큰 수 (type=sent|saved)")
+PROMPT_COMPACTIONS = METRICS.counter("estimate_prompt_compaction_total", "압축 단계별 견적 프롬프트 수 (level=full|short|cost)")
+BATCH_ROWS = METRICS.counter("batch_quote_rows_total", "일괄 견적 행 수 (status=done|failed|invalid)")
+SPECULATIVE_RUNS = METRICS.counter("estimate_speculative_total", "미리 생성한 견적 수 (result=started|skipped|failed)")
+
+# 프롬프트 토큰 예산 (카탈로그 섹션을 예산에 맞게 압축, 응답 최대 토큰은 카테고리 수에 비례)
+PROMPT_MAX_INPUT_TOKENS = int(os.getenv("PROMPT_MAX_INPUT_TOKENS", 0))  # 0(기본)이면 압축하지 않음
+GPT_COMPLETION_BASE_TOKENS = int(os.getenv("GPT_COMPLETION_BASE_TOKENS", 400))
+GPT_COMPLETION_TOKENS_PER_CATEGORY = int(os.getenv("GPT_COMPLETION_TOKENS_PER_CATEGORY", 500))
+GPT_MIN_COMPLETION_TOKENS = int(os.getenv("GPT_MIN_COMPLETION_TOKENS", 1400))  # 기존 고정값 (카테고리가 적어도 이보다 줄이지 않음)
+GPT_MAX_COMPLETION_TOKENS = int(os.getenv("GPT_MAX_COMPLETION_TOKENS", 2000))
+
+# 스트리밍 설정 (생성 중인 견적을 주기적으로 세션에 반영)
+GPT_STREAMING = os.getenv("GPT_STREAMING", "1") == "1"
+GPT_STREAM_UPDATE_SECONDS = float(os.getenv("GPT_STREAM_UPDATE_SECONDS", 0.3))
+
+# 요청 추적 (TRACE_EXPORT_PATH 지정 시 웹훅 턴별 span 을 OTLP/JSON 으로 기록, 샘플링과 무관하게 느리거나 오류가 난 턴도 기록)
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "")
+TRACE_UTTERANCES = os.getenv("TRACE_UTTERANCES", "0") == "1"  # 발화 원문 기록 여부 (개인정보가 담길 수 있어 기본 꺼짐)
+TRACER = Tracer(
+    FileSpanExporter(TRACE_EXPORT_PATH) if TRACE_EXPORT_PATH else None,
+    sample_rate=float(os.getenv("TRACE_SAMPLE_RATE", 0.1)),
+    slow_seconds=float(os.getenv("TRACE_SLOW_SECONDS", 1.0)),
+)
+
+# 완료된 견적 보관소 (RESULT_STORE_PATH 지정 시 결과를 압축 세그먼트 파일에 보관하고,
+# 세션에는 RESULT_SESSION_TTL_SECONDS 동안만 두어 오래된 결과는 보관소에서 조회)
+RESULT_STORE_PATH = os.getenv("RESULT_STORE_PATH", "")
+RESULT_SESSION_TTL = float(os.getenv("RESULT_SESSION_TTL_SECONDS", 3600)) if RESULT_STORE_PATH else None
+RESULT_COMPACT_SECONDS = float(os.getenv("RESULT_COMPACT_SECONDS", 3600))
+RESULT_STORE = ResultStore(
+    RESULT_STORE_PATH,
+    hot_entries=int(os.getenv("RESULT_HOT_ENTRIES", 256)),
+    retention=float(os.getenv("RESULT_RETENTION_SECONDS", 7 * 86400)),
+) if RESULT_STORE_PATH else None
+
+# 저장소 (SESSION_BACKEND=sqlite 설정 시 여러 워커 프로세스 간 공유)
+GPT_RESPONSES: SessionStore = create_session_store("gpt_responses", ttl=RESULT_SESSION_TTL)
+USER_INPUTS: SessionStore = create_session_store("user_inputs", ttl=RESULT_SESSION_TTL)
+USER_SLOT_STATE: SessionStore = create_session_store("user_slot_state")
+SHRUNK_RESPONSES: SessionStore = create_session_store("shrunk_responses", ttl=RESULT_SESSION_TTL)
+ESTIMATE_STATUS: SessionStore = create_session_store("estimate_status", ttl=RESULT_SESSION_TTL)  # pending / streaming / done / failed
+KAKAO_CALLBACKS: SessionStore = create_session_store("kakao_callbacks")  # 견적 완료 시 결과를 보낼 콜백 URL
+SESSION_STORES = [GPT_RESPONSES, USER_INPUTS, USER_SLOT_STATE, SHRUNK_RESPONSES, ESTIMATE_STATUS, KAKAO_CALLBACKS]
+SESSION_SWEEP_SECONDS = float(os.getenv("SESSION_SWEEP_SECONDS", 60))
+
+# 카카오 콜백 응답 (블록에서 콜백을 켜면 마지막 턴에 바로 응답하고, 견적이 끝나면 callbackUrl 로 결과 전송)
+KAKAO_CALLBACK_ENABLED = os.getenv("KAKAO_CALLBACK_ENABLED", "1") == "1"
+KAKAO_CALLBACK_DEADLINE_SECONDS = float(os.getenv("KAKAO_CALLBACK_DEADLINE_SECONDS", 50))  # callbackUrl 유효 시간 1분
+CALLBACK_CLIENT = CallbackClient(
+    allowed_hosts=os.getenv("KAKAO_CALLBACK_HOSTS", "kakao.com").split(","),
+    timeout=float(os.getenv("KAKAO_CALLBACK_TIMEOUT", 5)),
+    max_retries=int(os.getenv("KAKAO_CALLBACK_MAX_RETRIES", 3)),
+)
+
+# 견적 미리 생성 (SPECULATIVE_ESTIMATES=1 이면 예산을 묻는 동안 전체 범위 견적을 생성해 캐시에 보관,
+# 캐시는 프로세스별이므로 웹 워커가 하나(WEB_CONCURRENCY, gunicorn.conf.py 가 설정)인 inline 방식에서만 동작)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", 1))
+SPECULATIVE_ESTIMATES = os.getenv("SPECULATIVE_ESTIMATES", "0") == "1"
+if SPECULATIVE_ESTIMATES and WEB_CONCURRENCY > 1:
+    # 다른 워커에 미리 생성한 견적은 실제 요청에서 쓰이지 않고 LLM 호출만 늘어남
+    print(f"⚠️ 웹 워커가 {WEB_CONCURRENCY}개라 견적 미리 생성(SPECULATIVE_ESTIMATES)을 사용하지 않습니다.")
+    SPECULATIVE_ESTIMATES = False
+
+# 일괄 견적 (POST /batch/quotes, batch_quotes.py) 동시 생성 수 상한
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", 4))
+BATCH_API_TOKEN = os.getenv("BATCH_API_TOKEN", "")  # X-Batch-Token 헤더로 확인 (비우면 API 를 사용하지 않음)
+BATCH_QUEUE_SHARE = float(os.getenv("BATCH_QUEUE_SHARE", 0.25))  # 일괄 견적이 쓸 수 있는 LLM 대기열 비율 (최소 1건)
+
+# 견적 생성 방식 (inline: 웹 프로세스의 백그라운드 작업, sqlite: 작업 큐에 등록 후 worker.py 가 처리)
+ESTIMATE_QUEUE = os.getenv("ESTIMATE_QUEUE", "inline")
+JOB_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", "estimate_jobs.db")
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", 300))
+JOB_QUEUE: Optional[JobQueue] = (
+    JobQueue(JOB_QUEUE_PATH, max_attempts=JOB_MAX_ATTEMPTS, lease_seconds=JOB_LEASE_SECONDS)
+    if ESTIMATE_QUEUE == "sqlite" else None
+)
 
 # 서비스 카테고리 데이터
 SERVICE_CATEGORIES = {
@@ -181,6 +298,37 @@ SERVICE_CATEGORIES = {
     }
 }
 
+# 서비스 카탈로그 (SERVICE_CATALOG_PATH 로 JSON/YAML 파일 지정 시 파일 변경을 감지해 다시 읽음)
+SERVICE_CATALOG_PATH = os.getenv("SERVICE_CATALOG_PATH", "")
+CATALOG_RELOAD_SECONDS = float(os.getenv("CATALOG_RELOAD_SECONDS", 10))
+CATALOG_FILE = CatalogFile(SERVICE_CATALOG_PATH) if SERVICE_CATALOG_PATH else None
+CATALOG: ServiceCatalog = CATALOG_FILE.load() if CATALOG_FILE else ServiceCatalog(SERVICE_CATEGORIES)
+
+# 견적 응답 캐시 (동일 슬롯 조합 재사용 + 동시 요청 단일 호출)
+ESTIMATE_CACHE = EstimateCache(
+    max_entries=int(os.getenv("ESTIMATE_CACHE_SIZE", 1000)),
+    ttl=float(os.getenv("ESTIMATE_CACHE_TTL", 3600)),
+)
+
+METRICS.counter_func("estimate_cache_hits_total", "견적 캐시 적중 수", lambda: ESTIMATE_CACHE.hits)
+METRICS.counter_func("estimate_cache_misses_total", "견적 캐시 미스 수", lambda: ESTIMATE_CACHE.misses)
+METRICS.counter_func("estimate_cache_coalesced_total", "진행 중인 동일 요청에 합류한 수", lambda: ESTIMATE_CACHE.coalesced)
+METRICS.gauge("estimate_queue_depth", "LLM 호출 대기열 길이", lambda: LLM_SCHEDULER.queue_depth)
+METRICS.gauge("estimate_running", "실행 중인 LLM 호출 수", lambda: ESTIMATE_EXECUTOR.running)
+METRICS.counter_func("llm_retries_total", "레이트 리밋으로 재시도한 LLM 호출 수", lambda: LLM_SCHEDULER.retries)
+METRICS.counter_func("llm_rate_limited_total", "레이트 리밋(429) 응답 수", lambda: LLM_SCHEDULER.rate_limited)
+METRICS.counter_func("llm_rejected_total", "대기열 초과로 거절된 요청 수", lambda: LLM_SCHEDULER.rejected)
+METRICS.counter_func("kakao_callback_sent_total", "전송한 카카오 콜백 수", lambda: CALLBACK_CLIENT.sent)
+METRICS.counter_func("kakao_callback_failed_total", "전송에 실패한 카카오 콜백 수", lambda: CALLBACK_CLIENT.failed)
+METRICS.counter_func("kakao_callback_retries_total", "재시도한 카카오 콜백 전송 수", lambda: CALLBACK_CLIENT.retries)
+METRICS.gauge("active_sessions", "슬롯 상태가 저장된 사용자 수", lambda: len(USER_SLOT_STATE))
+METRICS.counter_func("trace_spans_exported_total", "기록한 추적 span 수", lambda: TRACER.exported)
+METRICS.counter_func("trace_spans_dropped_total", "샘플링에서 제외된 추적 span 수", lambda: TRACER.dropped)
+if RESULT_STORE is not None:
+    METRICS.gauge("result_store_entries", "보관 중인 완료 견적 수", lambda: len(RESULT_STORE))
+    METRICS.gauge("result_store_segment_bytes", "결과 세그먼트 파일 크기", lambda: RESULT_STORE.stats()["segment_bytes"])
+    METRICS.counter_func("result_store_disk_hits_total", "세그먼트 파일에서 읽은 결과 조회 수", lambda: RESULT_STORE.disk_hits)
+
 # 산출물 관련 키워드
 SANCHUL_ENTRIES = [
     "웹", "웹사이트", "챗봇", "ETL", "시스템", "앱", "사이트", "MVP", "UI", "대시보드",
@@ -203,250 +351,577 @@ JUJAE_ENTRIES = [
 
 JUJAE_SYNONYMS = [kw.lower() for kw in JUJAE_ENTRIES]  # 소문자 비교용 리스트
 
+# 대표 카테고리 추론 규칙 (위에서부터 우선 적용: 카테고리, 산출물 키워드, 주제 키워드)
+PRIMARY_CATEGORY_RULES = [
+    ("모바일앱_플랫폼", ["앱", "ios", "안드로이드", "모바일"], []),
+    ("웹_플랫폼", ["웹", "사이트", "플랫폼", "관리자", "ui", "페이지"], []),
+    ("AI_챗봇", ["챗봇", "ai", "대화", "질의응답"], ["대화", "상담", "응답", "질문"]),
+    ("시각화_대시보드", ["대시보드", "시각화", "분석", "리포트"], ["데이터", "분석", "통계", "현황"]),
+]
+
+# 산출물 키워드 기반 전체 카테고리 추론 규칙
+CATEGORY_OUTPUT_KEYWORDS = {
+    "웹_플랫폼": ["웹", "사이트", "플랫폼"],
+    "모바일앱_플랫폼": ["앱", "ios", "안드로이드", "모바일"],
+    "AI_챗봇": ["챗봇", "대화", "ai"],
+    "시각화_대시보드": ["분석", "대시보드", "리포트"],
+}
+
+# 카테고리 분류기에 카탈로그 단계와 함께 넣는 카테고리별 표현 (카탈로그에 없는 동의어)
+CATEGORY_HINTS = {
+    "웹_플랫폼": ["웹", "웹사이트", "홈페이지", "사이트", "플랫폼", "관리자 페이지", "쇼핑몰", "예약 시스템"],
+    "모바일앱_플랫폼": ["앱", "어플", "어플리케이션", "모바일", "스마트폰", "아이폰", "ios", "안드로이드"],
+    "AI_챗봇": ["챗봇", "봇", "상담 봇", "자동 응답", "고객 문의", "질의응답", "대화", "ai", "llm", "gpt"],
+    "시각화_대시보드": ["대시보드", "시각화", "리포트", "보고서", "분석", "현황", "통계", "kpi", "매출 분석"],
+    "데이터_엔지니어링": ["etl", "데이터 파이프라인", "크롤링", "스크래핑", "데이터 수집", "db", "데이터 웨어하우스"],
+}
+CATEGORY_MIN_SCORE = float(os.getenv("CATEGORY_MIN_SCORE", 0.2))  # 분류기 결과를 채택하는 최소 유사도
+
+# 슬롯 순서와 비어 있을 때 보내는 질문
+SLOT_ORDER = ["주제", "산출물", "기간", "예상_견적"]
+SLOT_PROMPTS = {
+    "주제": "📝 프로젝트 주제를 알려주세요! (예: 쇼핑몰, 교육 플랫폼 등)",
+    "산출물": "📦 어떤 산출물을 원하시나요? (예: 웹사이트, 앱, 관리자 페이지 등)",
+    "기간": "⌛ 예상 개발 기간을 알려주세요! (예: 2개월, 3주 등)",
+    "예상_견적": "💰 대략 어느 정도의 예산을 생각하고 계신가요? (예: 100만원, 2000만원 등)",
+}
+SLOT_TRACE_NAMES = {"주제": "topic", "산출물": "output", "기간": "period", "예상_견적": "budget"}  # span 속성 이름
+
+def build_keyword_matcher() -> KeywordMatcher:
+    """주제/산출물/카테고리 키워드를 하나의 매칭기로 구성 (시작 시 1회)"""
+    matcher = KeywordMatcher()
+    matcher.add_many(JUJAE_ENTRIES, "주제")
+    matcher.add_many(SANCHUL_ENTRIES, "산출물")
+    for category, output_keywords, topic_keywords in PRIMARY_CATEGORY_RULES:
+        matcher.add_many(output_keywords, ("primary_output", category))
+        matcher.add_many(topic_keywords, ("primary_topic", category))
+    for category, output_keywords in CATEGORY_OUTPUT_KEYWORDS.items():
+        matcher.add_many(output_keywords, ("output", category))
+    return matcher.build()
+
+FUZZY_MATCH_CUTOFF = float(os.getenv("FUZZY_MATCH_CUTOFF", 0.5))
+
+def build_startup_objects() -> Dict[str, Any]:
+    """키워드 매칭기, 유사 문자열 색인, 카테고리별 프롬프트 조각 구성"""
+    return {
+        "keyword_matcher": build_keyword_matcher(),
+        "fuzzy_matchers": {
+            "주제": FuzzyMatcher(JUJAE_ENTRIES, cutoff=FUZZY_MATCH_CUTOFF),
+            "산출물": FuzzyMatcher(SANCHUL_ENTRIES, cutoff=FUZZY_MATCH_CUTOFF),
+        },
+        "prompt_levels": PromptAssembler(CATALOG).levels,
+        "category_classifier": CategoryClassifier(CATALOG, CATEGORY_HINTS),
+    }
+
+# 시작 아티팩트 (STARTUP_ARTIFACT_PATH 지정 시 미리 만든 객체를 mmap 으로 읽고, 없거나 오래되었으면 새로 저장)
+STARTUP_ARTIFACT_PATH = os.getenv("STARTUP_ARTIFACT_PATH", "")
+STARTUP_ARTIFACT_KEY = artifact_key(
+    JUJAE_ENTRIES, SANCHUL_ENTRIES, PRIMARY_CATEGORY_RULES, CATEGORY_OUTPUT_KEYWORDS,
+    FUZZY_MATCH_CUTOFF, CATEGORY_HINTS, CATALOG.fingerprint,
+)
+
+def load_startup_objects() -> Dict[str, Any]:
+    if not STARTUP_ARTIFACT_PATH:
+        return build_startup_objects()
+    objects = load_artifact(STARTUP_ARTIFACT_PATH, STARTUP_ARTIFACT_KEY)
+    if objects is None:
+        objects = build_startup_objects()
+        try:
+            save_artifact(STARTUP_ARTIFACT_PATH, STARTUP_ARTIFACT_KEY, objects)
+        except OSError as e:
+            print(f"⚠️ 시작 아티팩트를 저장하지 못했습니다 ({STARTUP_ARTIFACT_PATH}): {e}")
+    return objects
+
+STARTUP_OBJECTS = load_startup_objects()
+
+# 키워드 매칭기와 유사 문자열 매칭기 (슬롯별 후보 색인)
+KEYWORD_MATCHER: KeywordMatcher = STARTUP_OBJECTS["keyword_matcher"]
+FUZZY_MATCHERS: Dict[str, FuzzyMatcher] = STARTUP_OBJECTS["fuzzy_matchers"]
+
+# 카테고리별 프롬프트 조각 (시작 시 1회 렌더링, 카탈로그 변경 시 다시 렌더링)
+PROMPT_ASSEMBLER = PromptAssembler(CATALOG, levels=STARTUP_OBJECTS["prompt_levels"])
+
+# 키워드가 맞지 않을 때 사용하는 카탈로그 기반 카테고리 분류기 (카탈로그 변경 시 다시 생성)
+CATEGORY_CLASSIFIER: CategoryClassifier = STARTUP_OBJECTS["category_classifier"]
+
 def match_similar_slot_lightweight(text: str, slot_type: str) -> str:
     """문자열 유사도 기반으로 가장 유사한 주제 또는 산출물을 반환"""
-    candidates = SANCHUL_ENTRIES if slot_type == "산출물" else JUJAE_ENTRIES
-    matches = get_close_matches(text, candidates, n=1, cutoff=0.5)  # cutoff 값을 0.5로 낮춤
-    return matches[0] if matches else ""
-
-def is_likely_output(text: str) -> bool:
-    """산출물 슬롯에 들어갈 가능성이 높은지 판단"""
-    lower_text = text.lower().strip()
-    return any(entry in lower_text for entry in SANCHUL_SYNONYMS)
+    matcher = FUZZY_MATCHERS["산출물" if slot_type == "산출물" else "주제"]
+    return matcher.best_match(text)
 
 def is_likely_topic(text: str) -> bool:
     """주제 슬롯에 들어갈 가능성이 높은지 판단"""
-    lower_text = text.lower().strip()
-    return any(entry in lower_text for entry in JUJAE_SYNONYMS)
+    return "주제" in KEYWORD_MATCHER.labels(text.strip())
 
-def is_valid_slot_answer(text: str) -> bool:
-    """사용자 입력의 유효성을 검사합니다."""
-    text = text.strip()
-    if len(text) < 3:
-        return False
-    lower = text.lower()
-    invalid_keywords = ["없", "모르", "모름", "몰라", "글쎄", "무", "잘 몰라", "기억 안", "생각 안"]
-    return not any(kw in lower for kw in invalid_keywords)
+def extract_outputs(text: str) -> List[str]:
+    """발화에 포함된 산출물 키워드 목록 (정렬, 중복 제거)"""
+    return sorted(KEYWORD_MATCHER.keywords_by_label(text).get("산출물", ()))
+
+def extract_slots(utterance: str) -> Dict[str, str]:
+    """발화 하나에서 키워드/수량이 정확히 일치하는 슬롯을 모두 추출"""
+    slots = {}
+    tokens = utterance.replace(",", " ").replace("을", "").replace("를", "").split()
+    for token in tokens:
+        token = token.strip().lower()
+        if is_likely_topic(token):
+            slots["주제"] = token
+            break
+    outputs = extract_outputs(utterance)
+    if outputs:
+        slots["산출물"] = ", ".join(outputs)
+    parsed = parse_utterance(utterance)
+    if parsed.period:
+        slots["기간"] = parsed.period
+    if parsed.budget:
+        slots["예상_견적"] = parsed.budget
+    return slots
 
 def normalize_period(text: str) -> str:
-    """기간 입력을 표준 형식으로 정규화"""
-    if "개월" in text or "달" in text:
-        number = ''.join(filter(str.isdigit, text))
-        return f"{number}개월"
-    elif "주" in text:
-        number = ''.join(filter(str.isdigit, text))
-        return f"{number}주"
-    return text.strip()
+    """기간 입력을 표준 형식으로 정규화 (예: 3개월, 2~3개월, 6주)"""
+    return parse_utterance(text).period
 
 def normalize_budget(text: str) -> str:
-    """사용자가 입력한 금액 문자열을 숫자로 정규화"""
-    # 금액 단위가 명시되지 않으면 무시
-    if not any(unit in text for unit in ["원", "만원", "천원", "억", "조"]):
-        return ""
-    
-    # 단위별 승수 정의
-    multipliers = {
-        "조": 1000000000000,
-        "억": 100000000,
-        "만원": 10000,
-        "천원": 1000,
-        "원": 1
-    }
-    
-    text = text.replace(",", "")
-    
-    # 숫자와 단위를 모두 포함하는 패턴 매칭
-    for unit, multiplier in multipliers.items():
-        if unit in text:
-            match = re.search(r"(\d+)\s*" + unit, text)
-            if match:
-                amount = int(match.group(1)) * multiplier
-                return f"{amount:,}원"
-    
-    # 단순 숫자 추출 (단위가 '원'인 경우)
-    if "원" in text:
-        match = re.search(r"(\d+)", text)
-        if match:
-            amount = int(match.group(1))
-            return f"{amount:,}원"
-            
-    return ""
-
-def is_valid_period(text: str) -> bool:
-    """기간 입력의 유효성을 검사하고 정규화를 시도합니다."""
-    text = text.strip()
-    if not is_valid_slot_answer(text):  # 기본 유효성 검사
-        return False
-    
-    # 정규화 시도
-    normalized = normalize_period(text)
-    return any(unit in normalized for unit in ["개월", "주"])
+    """사용자가 입력한 금액 문자열을 숫자로 정규화 (예: 5,000,000원)"""
+    return parse_utterance(text).budget
 
 def infer_primary_category(topic: str, output: str) -> str:
     """사용자 입력을 기반으로 가장 적합한 서비스 카테고리를 추론합니다."""
-    output = output.lower()
-    topic = topic.lower()
-    
-    # 모바일 앱 관련 키워드
-    if any(kw in output for kw in ["앱", "ios", "안드로이드", "모바일"]):
-        return "모바일앱_플랫폼"
-    
-    # 웹 플랫폼 관련 키워드
-    elif any(kw in output for kw in ["웹", "사이트", "플랫폼", "관리자", "ui", "페이지"]):
-        return "웹_플랫폼"
-    
-    # AI 챗봇 관련 키워드
-    elif any(kw in output for kw in ["챗봇", "ai", "대화", "질의응답"]) or \
-         any(kw in topic for kw in ["대화", "상담", "응답", "질문"]):
-        return "AI_챗봇"
-    
-    # 데이터/시각화 관련 키워드
-    elif any(kw in output for kw in ["대시보드", "시각화", "분석", "리포트"]) or \
-         any(kw in topic for kw in ["데이터", "분석", "통계", "현황"]):
-        return "시각화_대시보드"
-    
-    # 기본값은 웹 플랫폼
-    return "웹_플랫폼"
+    output_labels = KEYWORD_MATCHER.labels(output)
+    topic_labels = KEYWORD_MATCHER.labels(topic)
+
+    # 규칙 순서대로 산출물 또는 주제 키워드가 포함된 첫 카테고리 선택
+    for category, _, _ in PRIMARY_CATEGORY_RULES:
+        if ("primary_output", category) in output_labels or ("primary_topic", category) in topic_labels:
+            return category
+
+    # 키워드가 없으면 카탈로그 분류기 1순위, 그래도 없으면 웹 플랫폼
+    predicted = CATEGORY_CLASSIFIER.predict(f"{topic} {output}", CATEGORY_MIN_SCORE, limit=1)
+    return predicted[0][0] if predicted else "웹_플랫폼"
 
 def infer_all_categories(topic: str, output: str) -> List[str]:
     """여러 산출물에 기반하여 적합한 서비스 카테고리 목록 추론"""
-    topic = topic.lower()
-    output = output.lower()
-    categories = set()
+    output_labels = KEYWORD_MATCHER.labels(output)
+    categories = [category for category in CATEGORY_OUTPUT_KEYWORDS if ("output", category) in output_labels]
 
-    # 웹/앱 관련
-    if any(kw in output for kw in ["웹", "사이트", "플랫폼"]):
-        categories.add("웹_플랫폼")
-
-    # 모바일 앱 관련
-    if any(kw in output for kw in ["앱", "ios", "안드로이드", "모바일"]):
-        categories.add("모바일앱_플랫폼")
+    # 키워드가 없으면 카탈로그 분류기로 추론하고, 그래도 없으면 웹 플랫폼 (최소 1개 보장)
+    if not categories:
+        categories = [category for category, _ in CATEGORY_CLASSIFIER.predict(f"{topic} {output}", CATEGORY_MIN_SCORE)]
+    if not categories:
+        categories.append("웹_플랫폼")  # 기본값
 
-    # 챗봇 관련
-    if any(kw in output for kw in ["챗봇", "대화", "ai"]):
-        categories.add("AI_챗봇")
+    return categories
 
-    # 시각화/데이터 분석
-    if any(kw in output for kw in ["분석", "대시보드", "리포트"]):
-        categories.add("시각화_대시보드")
+def build_prompt_multicategory(user_input: str, service_categories: dict, categories: List[str], expected_budget: str = "", topic: str = "", period: str = "",
+                               max_input_tokens: int = 0) -> PromptPlan:
+    # 기본 카탈로그는 미리 렌더링된 조각을 사용하고, 다른 카탈로그는 그때그때 렌더링
+    with PROMPT_BUILD_SECONDS.time():
+        assembler = PROMPT_ASSEMBLER
+        if service_categories is not assembler.catalog.nested:
+            assembler = PromptAssembler(ServiceCatalog(service_categories))
+        return assembler.plan(user_input, categories, expected_budget, topic, period, max_input_tokens)
 
-    # 최소 1개 이상의 카테고리 보장
-    if not categories:
-        categories.add("웹_플랫폼")  # 기본값
+def build_user_input(topic: str, output: str, period: str, expected_budget: str) -> str:
+    """GPT 프롬프트와 결과 화면에 쓰는 입력 정보"""
+    return "\n".join([
+        f"🖋 주제: {topic}",
+        f"🧾 산출물: {output}",
+        f"🕒 기간: {period}",
+        f"💰 예산: {expected_budget}"
+    ])
 
-    return list(categories)
+def full_scope_budget(categories: List[str]) -> str:
+    """카탈로그 기준 전체 견적 금액 (이 금액 이상의 예산이면 축소 없이 전체 범위로 견적)"""
+    return f"{CATALOG.total(categories):,}원"
 
-def build_prompt_multicategory(user_input: str, service_categories: dict, categories: List[str], expected_budget: str = "", topic: str = "", period: str = "") -> str:
-    # 구조화된 입력 정보 표시
-    prompt = "🧾 사용자가 입력한 정보:\n"
-    prompt += f"- 주제: {topic}\n"
-    prompt += f"- 산출물: {user_input}\n"
-    prompt += f"- 기간: {period}\n"
-    prompt += f"- 예상 예산: {expected_budget}\n\n"
-    
-    # 중복 제거하면서 순서 유지
-    unique_categories = list(dict.fromkeys(categories))
-    prompt += f"💡 사용자가 요청한 주요 서비스 범주는 `{', '.join(unique_categories)}`입니다.\n\n"
-    
-    prompt += "🧾 각 카테고리에 대해 빠짐없이 견적을 제시해 주세요. 일부 항목 누락 없이 전체 범위를 고려해 주세요.\n"
-    prompt += "⚠️ 각 카테고리는 독립된 프로젝트 단위로 보고, 개별 견적을 제시해 주세요.\n"
-    prompt += "\n💡 동일한 카테고리명(`📂 웹 플랫폼`)은 한 번만 출력하고, 그 아래에 모든 단계와 금액을 나열해 주세요.\n"
-    prompt += "\n💡 각 카테고리별 비용 총합(소계)을 마지막 줄에 `💰 소계: ...원` 형식으로 표시해 주세요.\n\n"
-    prompt += "우리 회사는 다음과 같은 서비스 카테고리를 제공합니다:\n"
-
-    # 중복 제거된 카테고리로 순회
-    for category in unique_categories:
-        if category not in service_categories:
-            continue
-        prompt += f"\n📂 {category.replace('_', ' ')}\n"
-        for step, content in service_categories[category].items():
-            if isinstance(content, dict) and "features" in content:
-                cost = content.get("cost", 0)
-                features = " / ".join(content["features"])
-                prompt += f"  - {step.replace('_', ' ')}: {features} (비용: {cost:,}원)\n"
-            elif isinstance(content, dict):
-                for substep, subcontent in content.items():
-                    if "features" in subcontent:
-                        cost = subcontent.get("cost", 0)
-                        features = " / ".join(subcontent["features"])
-                        prompt += f"  - {step.replace('_', ' ')} > {substep}: {features} (비용: {cost:,}원)\n"
-
-    prompt += "\n다음 형식으로 각 카테고리에 대해 개별적으로 답변해 주세요:\n\n"
-    
-    # 예시 형식 추가
-    prompt += """📂 [카테고리명]
-- 필요한 단계: [금액]원
-- 예상 기간: [기간]
-💰 소계: [카테고리 총 금액]원
+def parse_budget_value(expected_budget: str) -> int:
+    """예산 문자열(예: 5,000,000원, 300~500만원)에서 금액(범위면 상한) 추출"""
+    return parse_utterance(expected_budget).budget_value
 
-이런 형식으로 각 카테고리별 견적을 제시한 후,
+def build_local_estimates(topic: str, output: str, expected_budget: str) -> Dict[str, str]:
+    """카탈로그 기준 전체 견적과 (예산 부족 시) 축소안을 즉시 계산"""
+    categories = infer_all_categories(topic, output)
+    full = estimate_full(CATALOG, categories)
+    estimates = {"full": render_estimate(full), "shrunk": ""}
 
-💰 총 합계: [전체 금액]원
-"""
+    budget_value = parse_budget_value(expected_budget)
+    if 0 < budget_value < full.total:
+        reduced = estimate_within_budget(CATALOG, categories, budget_value)
+        estimates["shrunk"] = f"✂️ 예산 {expected_budget}에 맞춘 축소안\n\n{render_estimate(reduced)}"
+    return estimates
 
-    return prompt
+ESTIMATE_SYSTEM_MESSAGE = "당신은 IT 견적 전문가입니다. 예산이 제한적인 경우, 우선순위를 고려하여 실현 가능한 최소 범위의 견적을 제시해야 합니다."
 
-def call_gpt_estimate_fitting_budget(user_input: str, topic: str, output: str, expected_budget: str, period: str) -> str:
+def call_gpt_estimate_fitting_budget(user_input: str, topic: str, output: str, expected_budget: str, period: str,
+                                     on_delta: Optional[Callable[[str], Any]] = None) -> str:
     """예산에 맞춘 견적을 바로 생성 (GPT 1회 호출로 처리)"""
-    prompt = build_prompt_multicategory(
-        user_input, SERVICE_CATEGORIES,
-        infer_all_categories(topic, output),
-        expected_budget, topic, period
-    )
-
+    categories = infer_all_categories(topic, output)
     min_reasonable_budget = 300_000
-    budget_value = 0
-    match = re.search(r"(\d+)", expected_budget.replace(",", ""))
-    if match:
-        budget_value = int(match.group(1))
+    budget_value = parse_budget_value(expected_budget)
 
     # 예산 부족시 우선순위 기반 축소안 요청
+    prefix = ""
     if budget_value < min_reasonable_budget:
-        prompt = (
+        prefix = (
             f"❗ 사용자의 입력 예산이 {expected_budget}으로 제한적입니다.\n"
             "예산이 부족한 경우, 다음 원칙에 따라 우선순위 기반으로 축소안을 설계해 주세요:\n\n"
             "1️⃣ 핵심 기능 우선: 서비스의 핵심 가치를 전달할 수 있는 필수 기능을 우선 포함\n"
             "2️⃣ MVP 중심: 최소 기능 제품(MVP) 구성에 필요한 단계만 우선 선택\n"
             "3️⃣ 단계별 축소: 각 단계에서 필수적인 기능만 남기고 부가 기능은 제외\n"
             "4️⃣ 우선순위 제시: 제외된 기능들은 향후 업그레이드 항목으로 별도 안내\n\n"
-            + prompt
         )
 
-    response = openai.ChatCompletion.create(
-        model="gpt-3.5-turbo",
-        messages=[{
+    # 시스템 메시지와 축소안 지시문을 뺀 나머지 예산 안에서 카탈로그 섹션 압축
+    max_input_tokens = 0
+    if PROMPT_MAX_INPUT_TOKENS:
+        max_input_tokens = max(1, PROMPT_MAX_INPUT_TOKENS - count_tokens(ESTIMATE_SYSTEM_MESSAGE) - count_tokens(prefix))
+    plan = build_prompt_multicategory(
+        user_input, CATALOG.nested, categories,
+        expected_budget, topic, period, max_input_tokens
+    )
+    PROMPT_TOKENS.inc(plan.prompt_tokens, type="sent")
+    PROMPT_TOKENS.inc(plan.saved_tokens, type="saved")
+    PROMPT_COMPACTIONS.inc(level=COMPACTION_LEVELS[plan.level])
+    if not plan.fits:
+        print(f"⚠️ 프롬프트가 입력 토큰 예산을 넘습니다: {plan.prompt_tokens} > {max_input_tokens} (카테고리 {len(categories)}개)")
+
+    max_tokens = completion_tokens(
+        len(set(categories)), GPT_COMPLETION_BASE_TOKENS, GPT_COMPLETION_TOKENS_PER_CATEGORY, GPT_MAX_COMPLETION_TOKENS,
+        GPT_MIN_COMPLETION_TOKENS
+    )
+    TRACER.current_span().set_attributes(**{
+        "llm.prompt_tokens": plan.prompt_tokens,
+        "llm.prompt_compaction": COMPACTION_LEVELS[plan.level],
+        "llm.max_tokens": max_tokens,
+        "llm.streaming": on_delta is not None,
+    })
+    with LLM_CALL_SECONDS.time():
+        return request_chat_completion([{
             "role": "system", 
-            "content": "당신은 IT 견적 전문가입니다. 예산이 제한적인 경우, 우선순위를 고려하여 실현 가능한 최소 범위의 견적을 제시해야 합니다."
+            "content": ESTIMATE_SYSTEM_MESSAGE
         }, {
             "role": "user", 
-            "content": prompt
-        }],
+            "content": prefix + plan.prompt
+        }], max_tokens=max_tokens, on_delta=on_delta)
+
+_openai = None
+
+def get_openai():
+    """openai 모듈을 첫 견적 요청 시 불러와 설정 (서버 시작 시간 단축)"""
+    global _openai
+    if _openai is None:
+        import openai
+        openai.api_key = os.getenv("OPENAI_API_KEY")
+        _openai = openai
+    return _openai
+
+def request_chat_completion(messages: List[Dict[str, str]], max_tokens: int = 1400,
+                            on_delta: Optional[Callable[[str], Any]] = None) -> str:
+    """OpenAI ChatCompletion 호출 (테스트 시 가짜 함수로 교체 가능)
+
+    on_delta 가 주어지면 스트리밍으로 받아 지금까지 생성된 전체 텍스트를 전달하고,
+    on_delta 가 False 를 반환하면 스트림을 중단합니다.
+    """
+    response = get_openai().ChatCompletion.create(
+        model="gpt-3.5-turbo",
+        messages=messages,
         temperature=0.7,
-        max_tokens=1400
+        max_tokens=max_tokens,
+        request_timeout=ESTIMATE_EXECUTOR.timeout,
+        stream=on_delta is not None
     )
-    return response.choices[0].message.content
+    if on_delta is None:
+        LLM_TOKENS.inc(response.usage.prompt_tokens, type="prompt")
+        LLM_TOKENS.inc(response.usage.completion_tokens, type="completion")
+        return response.choices[0].message.content
 
-# 비동기 GPT 요청 처리
-async def process_gpt(user_id: str, user_input: str, topic: str = "", output: str = "", expected_budget: str = "", period: str = ""):
+    # 스트리밍 응답에는 사용량 정보가 없으므로 청크 수를 생성 토큰 수로 집계
+    text = ""
+    chunks = 0
+    for chunk in response:
+        chunks += 1
+        text += chunk["choices"][0]["delta"].get("content", "")
+        if on_delta(text) is False:
+            break
+    LLM_TOKENS.inc(chunks, type="completion")
+    return text
+
+async def publish_local_estimate(user_id: str, user_input: str, topic: str, output: str, expected_budget: str) -> Dict[str, str]:
+    """카탈로그 기준 견적을 먼저 안내하고, 예산이 부족하면 축소안도 저장 (축소안 계산은 스레드에서 실행)"""
     USER_INPUTS[user_id] = user_input
-    GPT_RESPONSES[user_id] = "⏳ 요청을 처리 중입니다. 잠시만 기다려주세요..."
+    local = await asyncio.to_thread(build_local_estimates, topic, output, expected_budget)
+    GPT_RESPONSES[user_id] = (
+        "⏳ AI 상세 견적을 생성 중입니다. 잠시 후 다시 확인해주세요.\n\n"
+        f"📊 카탈로그 기준 예상 견적:\n\n{local['full']}"
+    )
+    if local["shrunk"]:
+        SHRUNK_RESPONSES[user_id] = local["shrunk"]
+    else:
+        SHRUNK_RESPONSES.pop(user_id, None)
+    ESTIMATE_STATUS[user_id] = "pending"
+    return local
+
+async def generate_estimate(key: str, user_input: str, topic: str, output: str, expected_budget: str, period: str,
+                            on_delta: Optional[Callable[[str], Any]] = None, priority: int = PRIORITY_NORMAL) -> str:
+    """캐시 → 동일 요청 합류 → LLM 스케줄러 순서로 GPT 견적 생성 (key: 스케줄러 대기열의 요청자)"""
+    categories = infer_all_categories(topic, output)
+    prompt_input, prompt_budget = user_input, expected_budget
+    if SPECULATIVE_ESTIMATES:
+        full_budget = full_scope_budget(categories)
+        if parse_budget_value(expected_budget) >= parse_budget_value(full_budget):
+            # 예산이 전체 견적 이상이면 미리 생성한 전체 범위 견적과 같은 키/프롬프트 사용
+            prompt_input, prompt_budget = build_user_input(topic, output, period, full_budget), full_budget
+            LLM_SCHEDULER.promote(key, priority)
+    cache_key = make_estimate_key(topic, output, period, prompt_budget, categories, CATALOG.fingerprint)
+    enqueued_at = time.perf_counter()
+    span = TRACER.current_span()
+    span.set_attributes(**{"estimate.categories": categories, "estimate.cached": ESTIMATE_CACHE.has(cache_key)})
+
+    def run_estimate() -> str:
+        # 실행기 스레드에는 컨텍스트가 이어지지 않으므로 부모 span 을 직접 전달
+        with TRACER.span("llm.chat_completion", kind=SPAN_KIND_CLIENT, parent=span) as llm_span:
+            queue_wait = time.perf_counter() - enqueued_at
+            LLM_QUEUE_WAIT_SECONDS.observe(queue_wait)
+            llm_span.set_attribute("llm.queue_wait_ms", round(queue_wait * 1000, 1))
+            return call_gpt_estimate_fitting_budget(prompt_input, topic, output, prompt_budget, period, on_delta=on_delta)
+
+    return await ESTIMATE_CACHE.get_or_compute(
+        cache_key, lambda: LLM_SCHEDULER.submit(key, run_estimate, GPT_ESTIMATED_TOKENS, priority=priority)
+    )
+
+# 비동기 GPT 요청 처리 (최종 상태와 응답을 반환)
+async def process_gpt(user_id: str, user_input: str, topic: str = "", output: str = "", expected_budget: str = "", period: str = ""):
+    local = await publish_local_estimate(user_id, user_input, topic, output, expected_budget)
+
+    # 스트리밍 중 생성된 부분 견적을 일정 간격으로 반영 (실행기 스레드에서 호출됨)
+    # 완료 처리와 같은 잠금 안에서 확인 후 기록해, 끝난 뒤에 부분 견적이 최종 결과를 덮어쓰지 않게 함
+    stream = {"finished": False, "started": False, "last_update": 0.0}
+    stream_lock = threading.Lock()
+
+    def on_delta(partial: str):
+        now = time.monotonic()
+        with stream_lock:
+            if stream["finished"]:  # 타임아웃 등으로 처리가 끝났으면 스트림 중단
+                return False
+            if now - stream["last_update"] < GPT_STREAM_UPDATE_SECONDS:
+                return True
+            stream["last_update"] = now
+            if not stream["started"]:
+                stream["started"] = True
+                ESTIMATE_STATUS[user_id] = "streaming"
+            GPT_RESPONSES[user_id] = f"✍️ AI 견적을 작성 중입니다...\n\n{partial}"
+        return True
 
-    response = call_gpt_estimate_fitting_budget(user_input, topic, output, expected_budget, period)
-    GPT_RESPONSES[user_id] = response
+    try:
+        response = await generate_estimate(
+            user_id, user_input, topic, output, expected_budget, period,
+            on_delta=on_delta if GPT_STREAMING else None
+        )
+        status = "done"
+    except QueueFullError as e:
+        TRACER.current_span().record_error(e)
+        status = "failed"
+        response = (
+            "🚦 현재 견적 요청이 많아 AI 견적을 생성하지 못해 카탈로그 기준 견적을 안내드립니다.\n"
+            "잠시 후 '새로운 견적 문의'로 다시 요청해주세요.\n\n"
+            + (local["shrunk"] or local["full"])
+        )
+    except EstimateTimeoutError as e:
+        TRACER.current_span().record_error(e)
+        status = "failed"
+        response = (
+            "⚠️ AI 견적 생성 시간이 초과되어 카탈로그 기준 견적을 안내드립니다.\n\n"
+            + (local["shrunk"] or local["full"])
+        )
+    except Exception as e:
+        TRACER.current_span().record_error(e)
+        status = "failed"
+        response = (
+            f"⚠️ AI 견적 생성 중 오류가 발생해 카탈로그 기준 견적을 안내드립니다.\n(오류 내용: {str(e)})\n\n"
+            + (local["shrunk"] or local["full"])
+        )
+    with stream_lock:
+        stream["finished"] = True
+        GPT_RESPONSES[user_id] = response
+        ESTIMATE_STATUS[user_id] = status
+    TRACER.current_span().set_attribute("estimate.status", status)
+    archive_result(user_id, status, response)
+    return status, response
+
+def archive_result(user_id: str, status: str, response: str):
+    """완료된 견적을 결과 보관소에 기록 (세션이 만료된 뒤에도 조회할 수 있도록)"""
+    if RESULT_STORE is None:
+        return
+    try:
+        RESULT_STORE.put(user_id, {
+            "response": response,
+            "user_input": USER_INPUTS.get(user_id, ""),
+            "shrunk": SHRUNK_RESPONSES.get(user_id, ""),
+            "status": status,
+        })
+    except OSError as e:
+        print(f"⚠️ 견적 결과를 보관하지 못했습니다 ({RESULT_STORE_PATH}): {e}")
+
+def archived_result(user_id: str) -> Optional[Dict[str, str]]:
+    """세션에 없는 사용자의 보관된 견적 결과"""
+    if RESULT_STORE is None:
+        return None
+    try:
+        return RESULT_STORE.get(user_id)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ 보관된 견적 결과를 읽지 못했습니다 ({RESULT_STORE_PATH}): {e}")
+        return None
+
+async def send_result_callback(user_id: str, callback_url: str) -> bool:
+    """현재 견적 결과를 카카오 콜백 URL 로 전송 (아직 생성 중이면 결과 확인 버튼을 함께 보냄)"""
+    payload = await get_result(user_id)
+    if ESTIMATE_STATUS.get(user_id) not in ("done", "failed"):
+        payload["template"]["quickReplies"].insert(0, {
+            "messageText": f"견적 결과 확인:{user_id}",
+            "action": "message",
+            "label": "견적 결과 확인"
+        })
+    return await CALLBACK_CLIENT.post(callback_url, payload)
+
+async def process_gpt_with_callback(user_id: str, *estimate_args: str):
+    """견적을 생성하고 결과를 콜백으로 전송
+
+    콜백 유효 시간 안에 끝나지 않으면 그때까지의 견적(카탈로그 기준 또는 작성 중인 내용)을 보내고
+    생성은 계속 진행해 '견적 결과 확인'으로 볼 수 있게 합니다.
+    """
+    task = asyncio.ensure_future(process_gpt(user_id, *estimate_args))
+    try:
+        await asyncio.wait_for(asyncio.shield(task), KAKAO_CALLBACK_DEADLINE_SECONDS)
+    except asyncio.TimeoutError:
+        pass
+    await send_pending_callback(user_id)
+    await task
+
+async def send_pending_callback(user_id: str) -> bool:
+    """등록된 콜백 URL 이 남아 있으면 꺼내서 현재 결과를 전송 (웹 프로세스와 워커 중 먼저 꺼낸 쪽만 전송)"""
+    callback_url = KAKAO_CALLBACKS.pop(user_id, None)
+    if not callback_url:
+        return False
+    return await send_result_callback(user_id, callback_url)
+
+async def send_callback_at_deadline(user_id: str, callback_url: str):
+    """작업 큐 사용 시 콜백 유효 시간이 지나도록 워커가 결과를 보내지 않았으면 그때까지의 결과를 전송
+
+    작업이 대기열에서 기다리는 동안에는 워커가 콜백을 알 수 없으므로 웹 프로세스에서 시간을 잽니다.
+    """
+    await asyncio.sleep(KAKAO_CALLBACK_DEADLINE_SECONDS)
+    if KAKAO_CALLBACKS.get(user_id) == callback_url:  # 그 사이 새 대화에서 등록한 콜백은 건드리지 않음
+        await send_pending_callback(user_id)
+
+async def speculate_estimate(user_id: str, topic: str, output: str, period: str):
+    """예산을 묻는 동안 전체 범위 견적을 미리 생성해 캐시에 저장
+
+    예산이 전체 견적 이상이면 process_gpt 가 이 결과를 그대로 사용하고,
+    부족하면 축소 견적을 따로 생성합니다. 실제 요청보다 낮은 우선순위로 실행합니다.
+    """
+    categories = infer_all_categories(topic, output)
+    budget = full_scope_budget(categories)
+    cache_key = make_estimate_key(topic, output, period, budget, categories, CATALOG.fingerprint)
+    # 이미 준비됐거나 대기열이 절반 이상 찼으면 건너뜀
+    if ESTIMATE_CACHE.has(cache_key) or LLM_SCHEDULER.queue_depth * 2 >= LLM_SCHEDULER.max_queue:
+        SPECULATIVE_RUNS.inc(result="skipped")
+        return
+    SPECULATIVE_RUNS.inc(result="started")
+    user_input = build_user_input(topic, output, period, budget)
+
+    def run_estimate() -> str:
+        return call_gpt_estimate_fitting_budget(user_input, topic, output, budget, period)
+
+    try:
+        await ESTIMATE_CACHE.get_or_compute(
+            cache_key,
+            lambda: LLM_SCHEDULER.submit(user_id, run_estimate, GPT_ESTIMATED_TOKENS, priority=PRIORITY_SPECULATIVE)
+        )
+    except Exception as e:
+        SPECULATIVE_RUNS.inc(result="failed")
+        print(f"⚠️ 견적 미리 생성 실패 ({user_id}): {e}")
+
+def make_batch_quoter() -> Callable[[int, Dict[str, str]], Awaitable[Dict[str, Any]]]:
+    """일괄 견적 행 처리 함수 생성 (같은 일괄 요청 안에서 앞 행과 슬롯 조합이 같은 행은 duplicate 로 표시)"""
+    seen = set()
+
+    async def quote(line: int, row: Dict[str, str]) -> Dict[str, Any]:
+        topic = (row.get("주제") or "").strip()
+        raw_output = (row.get("산출물") or "").strip()
+        output = ", ".join(extract_outputs(raw_output)) or raw_output
+        period = normalize_period(row.get("기간") or "")
+        budget = normalize_budget(row.get("예산") or row.get("예상_견적") or "")
+        record = {
+            "line": line, "id": row.get("id", ""), "주제": topic, "산출물": output, "기간": period, "예산": budget,
+            "categories": [], "catalog_total": 0, "status": "invalid", "duplicate": False, "estimate": "", "error": "",
+        }
+        missing = [name for name, value in (("주제", topic), ("산출물", output), ("기간", period), ("예산", budget)) if not value]
+        if missing:
+            record["error"] = f"값이 없거나 인식할 수 없습니다: {', '.join(missing)}"
+            BATCH_ROWS.inc(status="invalid")
+            return record
+
+        categories = infer_all_categories(topic, output)
+        key = make_estimate_key(topic, output, period, budget, categories, CATALOG.fingerprint)
+        record["categories"] = categories
+        record["catalog_total"] = CATALOG.total(categories)
+        record["duplicate"] = key in seen
+        seen.add(key)
+        # 대화 요청이 밀리지 않도록 대기열이 일괄 견적 몫만큼 차 있으면 빠질 때까지 기다림
+        while LLM_SCHEDULER.queue_depth >= max(1, LLM_SCHEDULER.max_queue * BATCH_QUEUE_SHARE):
+            await asyncio.sleep(0.5)
+        try:
+            record["estimate"] = await generate_estimate(
+                "batch", build_user_input(topic, output, period, budget), topic, output, budget, period,
+                priority=PRIORITY_BATCH
+            )
+            record["status"] = "done"
+        except Exception as e:
+            # 카탈로그 기준 견적으로 대신 안내
+            local = await asyncio.to_thread(build_local_estimates, topic, output, budget)
+            record["status"] = "failed"
+            record["error"] = str(e) or type(e).__name__
+            record["estimate"] = local["shrunk"] or local["full"]
+        BATCH_ROWS.inc(status=record["status"])
+        return record
+
+    return quote
+
+@app.post("/batch/quotes")
+async def batch_quotes(request: Request, output_format: str = Query("ndjson", alias="format"),
+                       concurrency: int = BATCH_MAX_CONCURRENCY, token: str = Header("", alias="X-Batch-Token")):
+    """CSV(주제, 산출물, 기간, 예산[, id]) 일괄 견적 → 행마다 NDJSON 또는 CSV 로 스트리밍"""
+    if not BATCH_API_TOKEN or not hmac.compare_digest(token.encode("utf-8"), BATCH_API_TOKEN.encode("utf-8")):
+        return JSONResponse({"error": "일괄 견적 API 토큰이 없거나 올바르지 않습니다."}, status_code=403)
+    body = await spool_body(request.stream())
+    records = quote_rows(iter_csv_rows(iter_file(body)), make_batch_quoter(), max(1, min(concurrency, BATCH_MAX_CONCURRENCY)))
+    if output_format == "csv":
+        return StreamingResponse(to_csv(records), media_type="text/csv")
+    return StreamingResponse(to_ndjson(records), media_type="application/x-ndjson")
 
 @app.post("/kakao/webhook")
 async def kakao_webhook(request: Request, background_tasks: BackgroundTasks):
-    """카카오톡 웹훅 엔드포인트"""
+    """카카오톡 웹훅 엔드포인트 (턴마다 추적 span 기록)"""
+    with TRACER.span("kakao.webhook", kind=SPAN_KIND_SERVER):
+        return await handle_webhook_turn(request, background_tasks)
+
+async def handle_webhook_turn(request: Request, background_tasks: BackgroundTasks):
+    """웹훅 턴 처리 (결과 조회 → 상태 초기화 → 슬롯 필링 → 견적 요청)"""
     # 변수 초기화
+    span = TRACER.current_span()
     user_id = ""
     utterance = ""
     params = {}
     detail_params = {}
+    user_state = None
 
     try:
         body = await request.json()
         user_id = body.get("userRequest", {}).get("user", {}).get("id", str(uuid.uuid4()))
         utterance = body.get("userRequest", {}).get("utterance", "")
+        callback_url = body.get("userRequest", {}).get("callbackUrl", "")
+        span.set_attribute("kakao.user_id", user_id)
+        if TRACE_UTTERANCES:
+            span.set_attribute("kakao.utterance", utterance[:200])
         
         # 파라미터 추출 (상세 파라미터 우선, 없으면 일반 파라미터 사용)
         params = body.get("action", {}).get("params", {})
@@ -455,11 +930,13 @@ async def kakao_webhook(request: Request, background_tasks: BackgroundTasks):
         # 견적 결과 확인 요청 처리
         if utterance.startswith("견적 결과 확인:"):
             result_user_id = utterance.split("견적 결과 확인:")[-1].strip()
+            span.set_attribute("kakao.branch", "result")
             return await get_result(result_user_id)
             
         # 축소 견적 확인 요청 처리
         if utterance.startswith("축소 견적 확인:"):
             shrunk_user_id = utterance.split("축소 견적 확인:")[-1].strip()
+            span.set_attribute("kakao.branch", "shrunk")
             return await get_shrunk_result(shrunk_user_id)
 
         # 새로운 견적 문의 시 상태 초기화
@@ -467,14 +944,29 @@ async def kakao_webhook(request: Request, background_tasks: BackgroundTasks):
             USER_SLOT_STATE.pop(user_id, None)
             USER_INPUTS.pop(user_id, None)
             GPT_RESPONSES.pop(user_id, None)
+            SHRUNK_RESPONSES.pop(user_id, None)
+            ESTIMATE_STATUS.pop(user_id, None)
+            KAKAO_CALLBACKS.pop(user_id, None)
+            span.add_event("session.reset")
         
         # 슬롯 필링 중인지 여부 확인
-        in_slot_filling = user_id in USER_SLOT_STATE and any(
-            USER_SLOT_STATE[user_id].get(slot, "") == "" for slot in ["주제", "산출물", "기간", "예상_견적"]
+        existing_state = USER_SLOT_STATE.get(user_id)
+        in_slot_filling = existing_state is not None and any(
+            existing_state.get(slot, "") == "" for slot in ["주제", "산출물", "기간", "예상_견적"]
         )
         
-        # 처리 가능 여부 확인 → 슬롯 필링 중이면 검사 건너뜀
-        if not in_slot_filling and not any(keyword in utterance for keyword in ["포트폴리오", "가격", "견적", "비용", "프로젝트", "개발", "제작"]):
+        # 발화 하나에서 찾을 수 있는 슬롯 (예: "쇼핑몰 앱 3개월 500만원")
+        slot_started = time.perf_counter()
+        with TRACER.span("slot.extract") as extract_span:
+            found_slots = extract_slots(utterance)
+            extract_span.set_attributes(**{f"slot.{SLOT_TRACE_NAMES[slot]}": value for slot, value in found_slots.items()})
+        span.set_attribute("slot.in_progress", in_slot_filling)
+
+        # 처리 가능 여부 확인 → 슬롯 필링 중이거나 슬롯 정보가 2개 이상이면 검사 건너뜀
+        if (not in_slot_filling and len(found_slots) < 2
+                and not any(keyword in utterance for keyword in ["포트폴리오", "가격", "견적", "비용", "프로젝트", "개발", "제작"])):
+            SLOT_EXTRACTION_SECONDS.observe(time.perf_counter() - slot_started)  # 슬롯 추출만 (유사도 매칭 없음)
+            span.set_attribute("kakao.branch", "out_of_scope")
             return JSONResponse(content={
                 "version": "2.0",
                 "template": {
@@ -492,77 +984,30 @@ async def kakao_webhook(request: Request, background_tasks: BackgroundTasks):
             })
     
         # 기존 상태 없으면 초기화
-        if user_id not in USER_SLOT_STATE:
-            USER_SLOT_STATE[user_id] = {"주제": "", "산출물": "", "기간": "", "예상_견적": "", "retry_count": 0}
+        if existing_state is None:
+            # conversation_id: 대화(새로운 견적 문의 전까지)마다 새로 만들어 작업 ID 에 포함
+            existing_state = {"주제": "", "산출물": "", "기간": "", "예상_견적": "", "retry_count": 0,
+                              "conversation_id": uuid.uuid4().hex}
             
-        user_state = USER_SLOT_STATE[user_id]
-        
-        # 토큰화 및 전처리
-        tokens = utterance.replace(",", " ").replace("을", "").replace("를", "").split()
-        tokens = [t.strip().lower() for t in tokens]
-        
-        # 주제가 비어 있으면 토큰에서 매칭 시도
-        if user_state["주제"] == "":
-            for token in tokens:
-                if is_likely_topic(token):
-                    user_state["주제"] = token
-                    break
-            if user_state["주제"] == "":
-                topic_match = match_similar_slot_lightweight(utterance, "주제")
-                if topic_match:
-                    user_state["주제"] = topic_match
-                else:
-                    return JSONResponse(content={
-                        "version": "2.0",
-                        "template": {
-                            "outputs": [{
-                                "simpleText": {
-                                    "text": "📝 프로젝트 주제를 알려주세요! (예: 쇼핑몰, 교육 플랫폼 등)"
-                                }
-                            }]
-                        }
-                    })
-        
-        # 산출물이 비어 있으면 여러 토큰에서 추출
-        if user_state["산출물"] == "":
-            matched_outputs = [entry for entry in SANCHUL_SYNONYMS if entry in utterance.lower()]
-            if matched_outputs:
-                user_state["산출물"] = ", ".join(sorted(set(matched_outputs)))
-            else:
-                output_match = match_similar_slot_lightweight(utterance, "산출물")
-                if output_match:
-                    user_state["산출물"] = output_match
-                else:
-                    return JSONResponse(content={
-                        "version": "2.0",
-                        "template": {
-                            "outputs": [{
-                                "simpleText": {
-                                    "text": "📦 어떤 산출물을 원하시나요? (예: 웹사이트, 앱, 관리자 페이지 등)"
-                                }
-                            }]
-                        }
-                    })
-        
-        # 기간 입력이 없으면 요청
-        if user_state["기간"] == "":
-            if is_valid_period(utterance):
-                user_state["기간"] = normalize_period(utterance)
-            else:
-                return JSONResponse(content={
-                    "version": "2.0",
-                    "template": {
-                        "outputs": [{
-                            "simpleText": {
-                                "text": "⌛ 예상 개발 기간을 알려주세요! (예: 2개월, 3주 등)"
-                            }
-                        }]
-                    }
-                })
+        user_state = existing_state
+
+        # 이번 턴에 답을 요청했던 슬롯 (유사도 매칭은 이 슬롯에만 적용)
+        user_state.setdefault("예상_견적", "")
+        asked_slot = next((slot for slot in SLOT_ORDER if user_state[slot] == ""), None)
 
-        # 예상 견적 슬롯 추가
-        if "예상_견적" not in user_state:
-            user_state["예상_견적"] = ""
+        # 찾은 슬롯 중 비어 있는 것을 모두 채움
+        for slot, value in found_slots.items():
+            if user_state[slot] == "":
+                user_state[slot] = value
+        matcher = "token" if asked_slot in found_slots else "none"
+        if asked_slot in ("주제", "산출물") and user_state[asked_slot] == "":
+            matcher = "fuzzy"
+            with TRACER.span("slot.fuzzy_match", **{"slot.name": SLOT_TRACE_NAMES[asked_slot]}) as match_span:
+                user_state[asked_slot] = match_similar_slot_lightweight(utterance, asked_slot)
+                match_span.set_attribute("slot.value", user_state[asked_slot])
+        SLOT_EXTRACTION_SECONDS.observe(time.perf_counter() - slot_started)  # 슬롯 추출 + 유사도 매칭
+        if asked_slot is not None:
+            span.set_attributes(**{"slot.asked": SLOT_TRACE_NAMES[asked_slot], "slot.matcher": matcher})
 
         # 견적 결과 응답에 포함되었을 경우 추출해서 저장
         if user_state["예상_견적"] == "" and utterance.startswith("견적 결과 확인:"):
@@ -574,22 +1019,32 @@ async def kakao_webhook(request: Request, background_tasks: BackgroundTasks):
                         user_state["예상_견적"] = line.strip()
                         break
 
-        # 견적이 비어 있으면 다시 물어보기
-        if user_state["예상_견적"] == "":
-            normalized = normalize_budget(utterance)
-            if normalized:
-                user_state["예상_견적"] = normalized
-            else:
-                return JSONResponse(content={
-                    "version": "2.0",
-                    "template": {
-                        "outputs": [{
-                            "simpleText": {
-                                "text": "💰 대략 어느 정도의 예산을 생각하고 계신가요? (예: 100만원, 2000만원 등)"
-                            }
-                        }]
-                    }
-                })
+        # 아직 비어 있는 첫 번째 슬롯을 요청
+        missing_slot = next((slot for slot in SLOT_ORDER if user_state[slot] == ""), None)
+        if missing_slot is not None:
+            SLOT_TURNS.inc(result="prompt")
+            # 같은 슬롯을 다시 묻는 턴 (답을 인식하지 못해 반복되는 대화 추적용)
+            span.set_attributes(**{
+                "kakao.branch": "slot_prompt",
+                "slot.missing": SLOT_TRACE_NAMES[missing_slot],
+                "slot.repeated": in_slot_filling and missing_slot == asked_slot,
+            })
+            if missing_slot == "예상_견적" and SPECULATIVE_ESTIMATES and JOB_QUEUE is None:
+                # 남은 슬롯이 예산뿐이면 카테고리가 정해졌으므로 응답 후 전체 범위 견적을 미리 생성
+                span.add_event("estimate.enqueued", mode="speculative")
+                background_tasks.add_task(
+                    TRACER.bind("estimate.speculate", speculate_estimate), user_id, user_state["주제"], user_state["산출물"], user_state["기간"]
+                )
+            return JSONResponse(content={
+                "version": "2.0",
+                "template": {
+                    "outputs": [{
+                        "simpleText": {
+                            "text": SLOT_PROMPTS[missing_slot]
+                        }
+                    }]
+                }
+            })
         
         # 상세 파라미터가 있는 경우 우선 적용
         for slot in ["주제", "산출물", "기간", "예상_견적"]:
@@ -600,24 +1055,58 @@ async def kakao_webhook(request: Request, background_tasks: BackgroundTasks):
         
         # 모든 슬롯이 채워진 경우에만 GPT 요청 처리
         if user_state["주제"] != "" and user_state["산출물"] != "" and user_state["기간"] != "" and user_state["예상_견적"] != "":
-            user_input_parts = [
-                f"🖋 주제: {user_state['주제']}",
-                f"🧾 산출물: {user_state['산출물']}",
-                f"🕒 기간: {user_state['기간']}",
-                f"💰 예산: {user_state['예상_견적']}"
-            ]
-            user_input = "\n".join(user_input_parts)
+            user_input = build_user_input(user_state["주제"], user_state["산출물"], user_state["기간"], user_state["예상_견적"])
             
             USER_INPUTS[user_id] = user_input
-            background_tasks.add_task(
-                process_gpt,
-                user_id,
-                user_input,
-                user_state["주제"],
-                user_state["산출물"],
-                user_state["예상_견적"],
-                user_state["기간"]
-            )
+            SLOT_TURNS.inc(result="complete")
+            span.set_attribute("kakao.branch", "estimate")
+
+            # 콜백을 사용할 수 있으면 결과 확인 턴 없이 견적이 끝나는 대로 결과를 보냄
+            use_callback = KAKAO_CALLBACK_ENABLED and bool(callback_url) and CALLBACK_CLIENT.is_allowed(callback_url)
+            if use_callback:
+                KAKAO_CALLBACKS[user_id] = callback_url
+            else:
+                KAKAO_CALLBACKS.pop(user_id, None)
+
+            if JOB_QUEUE is not None:
+                # 작업 큐에 등록하고 워커가 처리 (같은 턴이 다시 들어와도 작업은 하나)
+                queued = JOB_QUEUE.counts().get(QUEUED, 0)
+                await publish_local_estimate(user_id, user_input, user_state["주제"], user_state["산출물"], user_state["예상_견적"])
+                JOB_QUEUE.enqueue(user_id, {
+                    # 같은 턴의 재전송은 같은 작업, 새로운 견적 문의 후 같은 내용은 새 작업
+                    "conversation_id": user_state.setdefault("conversation_id", uuid.uuid4().hex),
+                    "user_input": user_input,
+                    "topic": user_state["주제"],
+                    "output": user_state["산출물"],
+                    "expected_budget": user_state["예상_견적"],
+                    "period": user_state["기간"],
+                    "traceparent": span.traceparent,  # 워커의 견적 생성 span 을 이 턴에 이어 붙임
+                })
+                span.add_event("estimate.enqueued", mode="job_queue", queue_depth=queued, callback=use_callback)
+                if use_callback:
+                    background_tasks.add_task(send_callback_at_deadline, user_id, callback_url)
+            else:
+                queued = LLM_SCHEDULER.queue_depth
+                span.add_event("estimate.enqueued", mode="inline", queue_depth=queued, callback=use_callback)
+                background_tasks.add_task(
+                    TRACER.bind("estimate.generate", process_gpt_with_callback if use_callback else process_gpt),
+                    user_id,
+                    user_input,
+                    user_state["주제"],
+                    user_state["산출물"],
+                    user_state["예상_견적"],
+                    user_state["기간"]
+                )
+
+            if use_callback:
+                return JSONResponse(content={
+                    "version": "2.0",
+                    "useCallback": True,
+                    "data": {
+                        "text": "📝 모든 정보를 받았어요! AI 견적을 생성하고 있어요. 완료되면 바로 보내드릴게요."
+                                + (f"\n\n⏳ 현재 {queued}건의 견적이 먼저 대기 중이에요." if queued else "")
+                    }
+                })
             
             return JSONResponse(content={
                 "version": "2.0",
@@ -625,6 +1114,7 @@ async def kakao_webhook(request: Request, background_tasks: BackgroundTasks):
                     "outputs": [{
                         "simpleText": {
                             "text": f"📝 모든 정보를 받았어요! 몇 초 후 결과를 확인해주세요.\n\n👉 확인: /result/{user_id}"
+                                    + (f"\n\n⏳ 현재 {queued}건의 견적이 먼저 대기 중이에요." if queued else "")
                         }
                     }],
                     "quickReplies": [{
@@ -636,6 +1126,8 @@ async def kakao_webhook(request: Request, background_tasks: BackgroundTasks):
             })
             
     except Exception as e:
+        span.set_attribute("kakao.branch", "error")
+        span.record_error(e)
         return JSONResponse(content={
             "version": "2.0",
             "template": {
@@ -646,20 +1138,50 @@ async def kakao_webhook(request: Request, background_tasks: BackgroundTasks):
                 }]
             }
         })
+    finally:
+        # 변경된 슬롯 상태를 저장소에 반영
+        if user_state is not None:
+            USER_SLOT_STATE[user_id] = user_state
 
 @app.get("/result/{user_id}")
 async def get_result(user_id: str):
-    """결과 조회 엔드포인트"""
-    response_text = GPT_RESPONSES.get(user_id, "❌ 존재하지 않는 요청 ID이거나 아직 처리 중입니다.")
+    """결과 조회 엔드포인트 (세션이 만료된 결과는 결과 보관소에서 조회)"""
+    response_text = GPT_RESPONSES.get(user_id)
     user_input = USER_INPUTS.get(user_id, "입력 정보가 없습니다.")
+    has_shrunk = user_id in SHRUNK_RESPONSES
+    archived = archived_result(user_id) if response_text is None else None
+    if archived is not None:
+        response_text, user_input, has_shrunk = archived["response"], archived["user_input"], bool(archived["shrunk"])
+    elif response_text is None:
+        response_text = "❌ 존재하지 않는 요청 ID이거나 아직 처리 중입니다."
+
+    # 작업 큐 사용 시 워커가 기록한 작업 상태 기준으로 안내
+    job = JOB_QUEUE.latest_for_user(user_id) if JOB_QUEUE is not None else None
+    if job is not None and job.payload.get("user_input") == USER_INPUTS.get(user_id):
+        if job.state == QUEUED:
+            position = JOB_QUEUE.position(job)
+            response_text = f"⏳ 현재 대기열 {position}번째입니다. 곧 AI 견적 생성을 시작합니다.\n\n{response_text}"
+        elif job.state != RUNNING:
+            response_text = job.result or response_text
+    else:
+        # 결과를 기다리는 사용자의 요청을 우선 처리하고 대기 순번 안내
+        LLM_SCHEDULER.promote(user_id)
+        position = LLM_SCHEDULER.position(user_id)
+        if position:
+            response_text = f"⏳ 현재 대기열 {position}번째입니다. 곧 AI 견적 생성을 시작합니다.\n\n{response_text}"
     
     quick_replies = [{
         "messageText": "새로운 견적 문의",
         "action": "message",
         "label": "새로운 견적 문의"
     }]
+    if has_shrunk:
+        quick_replies.insert(0, {
+            "messageText": f"축소 견적 확인:{user_id}",
+            "action": "message",
+            "label": "예산 맞춤 축소안"
+        })
 
-    
     return {
         "version": "2.0",
         "template": {
@@ -673,10 +1195,131 @@ async def get_result(user_id: str):
     }
 
 
+@app.get("/result/{user_id}/stream")
+async def stream_result(user_id: str):
+    """견적 생성 과정을 Server-Sent Events 로 전달 (웹 클라이언트용)"""
+    async def events():
+        last_text = None
+        deadline = time.monotonic() + ESTIMATE_EXECUTOR.timeout + 30
+        while time.monotonic() < deadline:
+            status = ESTIMATE_STATUS.get(user_id)
+            text = GPT_RESPONSES.get(user_id)
+            if text is not None and text != last_text:
+                last_text = text
+                payload = json.dumps({"status": status, "text": text}, ensure_ascii=False)
+                yield f"event: estimate\ndata: {payload}\n\n"
+            if status not in ("pending", "streaming"):
+                break
+            await asyncio.sleep(GPT_STREAM_UPDATE_SECONDS)
+        yield f"event: end\ndata: {json.dumps({'status': ESTIMATE_STATUS.get(user_id)})}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@app.get("/shrunk/{user_id}")
+async def get_shrunk_result(user_id: str):
+    """예산 맞춤 축소 견적 조회 엔드포인트"""
+    response_text = SHRUNK_RESPONSES.get(user_id)
+    user_input = USER_INPUTS.get(user_id, "입력 정보가 없습니다.")
+    archived = archived_result(user_id) if response_text is None and user_id not in GPT_RESPONSES else None
+    if archived is not None and archived["shrunk"]:
+        response_text, user_input = archived["shrunk"], archived["user_input"]
+    elif response_text is None:
+        response_text = "❌ 축소 견적이 없습니다. 예산이 전체 견적 이상이거나 아직 처리 중입니다."
+
+    return {
+        "version": "2.0",
+        "template": {
+            "outputs": [{
+                "simpleText": {
+                    "text": f"{response_text}\n\n🗂️ 입력 정보:\n{user_input}"
+                }
+            }],
+            "quickReplies": [{
+                "messageText": f"견적 결과 확인:{user_id}",
+                "action": "message",
+                "label": "AI 견적 확인"
+            }, {
+                "messageText": "새로운 견적 문의",
+                "action": "message",
+                "label": "새로운 견적 문의"
+            }]
+        }
+    }
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus 지표 엔드포인트"""
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/health")
 async def health_check():
     """헬스 체크 엔드포인트"""
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "estimate_queue": ESTIMATE_EXECUTOR.stats(),
+        "llm_scheduler": LLM_SCHEDULER.stats(),
+        "estimate_cache": ESTIMATE_CACHE.stats(),
+        "job_queue": JOB_QUEUE.counts() if JOB_QUEUE is not None else None,
+        "kakao_callback": CALLBACK_CLIENT.stats(),
+        "result_store": RESULT_STORE.stats() if RESULT_STORE is not None else None,
+        "tracing": TRACER.stats(),
+    }
+
+async def sweep_session_stores():
+    """만료된 세션을 주기적으로 정리"""
+    while True:
+        await asyncio.sleep(SESSION_SWEEP_SECONDS)
+        for store in SESSION_STORES:
+            store.sweep()
+
+async def compact_result_store():
+    """보관 기간이 지난 결과를 주기적으로 세그먼트 파일에서 정리"""
+    while True:
+        await asyncio.sleep(RESULT_COMPACT_SECONDS)
+        try:
+            freed = await asyncio.to_thread(RESULT_STORE.compact)
+        except OSError as e:
+            print(f"⚠️ 결과 보관소를 정리하지 못했습니다 ({RESULT_STORE_PATH}): {e}")
+            continue
+        if freed:
+            print(f"🗜️ 결과 보관소 정리: {freed:,} bytes")
+
+def apply_catalog(catalog: ServiceCatalog):
+    """새 카탈로그로 교체하고 프롬프트 조각과 카테고리 분류기를 다시 만듦"""
+    global CATALOG, CATEGORY_CLASSIFIER
+    CATALOG = catalog
+    PROMPT_ASSEMBLER.refresh(catalog)
+    CATEGORY_CLASSIFIER = CategoryClassifier(catalog, CATEGORY_HINTS)
+
+async def watch_catalog_file():
+    """카탈로그 파일이 바뀌면 재시작 없이 다시 읽기"""
+    while True:
+        await asyncio.sleep(CATALOG_RELOAD_SECONDS)
+        try:
+            catalog = CATALOG_FILE.reload_if_changed()
+        except Exception as e:
+            print(f"⚠️ 카탈로그를 다시 읽지 못했습니다 ({SERVICE_CATALOG_PATH}): {e}")
+            continue
+        if catalog is not None:
+            apply_catalog(catalog)
+            print(f"📂 카탈로그를 다시 읽었습니다: {len(catalog)}개 단계")
+
+@app.on_event("startup")
+async def start_background_tasks():
+    app.state.background_loops = [asyncio.create_task(sweep_session_stores())]
+    if CATALOG_FILE is not None:
+        app.state.background_loops.append(asyncio.create_task(watch_catalog_file()))
+    if RESULT_STORE is not None:
+        app.state.background_loops.append(asyncio.create_task(compact_result_store()))
+
+@app.on_event("shutdown")
+async def shutdown_background_tasks():
+    for task in app.state.background_loops:
+        task.cancel()
+    await CALLBACK_CLIENT.close()
+    ESTIMATE_EXECUTOR.shutdown()
+    if RESULT_STORE is not None:
+        RESULT_STORE.close()
 
 # 직접 실행 시 서버 구동
 if __name__ == "__main__":
@@ -0,0 +1,74 @@
+"""프롬프트 토큰 예산 관리
+
+프롬프트 토큰 수를 로컬에서 세고(tiktoken 이 설치되어 있으면 사용, 없으면 문자 종류별 근사치),
+입력 토큰 예산에 맞게 카탈로그 섹션의 압축 단계를 고르며,
+카테고리 수에 비례해 응답 최대 토큰(max_tokens)을 정합니다.
+
+압축 단계 (prompt_builder.render_category_section)
+    0 full  : 단계별 기능 목록 전체 + 비용
+    1 short : 단계별 기능 앞 몇 개만 + 비용
+    2 cost  : 단계 이름과 비용만
+"""
+import math
+import re
+from typing import NamedTuple
+
+COMPACTION_LEVELS = ("full", "short", "cost")
+
+# tiktoken 이 없을 때 사용하는 근사 규칙 (cl100k_base 기준으로 약간 크게 잡음)
+# 한글 음절 1토큰, 영문/숫자 4글자당 1토큰, 줄바꿈 1토큰, 기타 기호 1토큰, 이모지 등 그 밖의 문자 2토큰
+_APPROX_RE = re.compile(r"(?P<hangul>[가-힣])|(?P<word>[A-Za-z0-9]+)|(?P<space>\s+)|(?P<ascii>[\x21-\x7e])|(?P<other>.)")
+
+_encoding = None  # tiktoken 인코딩 (사용할 수 없으면 False)
+
+
+def _get_encoding():
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:  # 미설치이거나 인코딩 파일을 받을 수 없는 환경
+            _encoding = False
+    return _encoding
+
+
+def approximate_tokens(text: str) -> int:
+    tokens = 0
+    for match in _APPROX_RE.finditer(text):
+        kind = match.lastgroup
+        if kind == "hangul" or kind == "ascii":
+            tokens += 1
+        elif kind == "word":
+            tokens += math.ceil(len(match.group()) / 4)
+        elif kind == "space":
+            tokens += match.group().count("\n")
+        else:
+            tokens += 2
+    return tokens
+
+
+def count_tokens(text: str) -> int:
+    """프롬프트 토큰 수 (tiktoken 이 없으면 근사치)"""
+    encoding = _get_encoding()
+    if encoding:
+        return len(encoding.encode(text))
+    return approximate_tokens(text)
+
+
+def completion_tokens(category_count: int, base: int = 400, per_category: int = 500, cap: int = 2000,
+                      floor: int = 1400) -> int:
+    """카테고리 수에 비례한 응답 최대 토큰 (카테고리별 견적 블록 + 총 합계, 기존 고정값 floor 아래로는 줄이지 않음)"""
+    return max(floor, min(cap, base + per_category * max(1, category_count)))
+
+
+class PromptPlan(NamedTuple):
+    prompt: str
+    level: int  # 선택된 압축 단계 (COMPACTION_LEVELS 의 인덱스)
+    prompt_tokens: int  # 선택된 프롬프트 토큰 수
+    full_tokens: int  # 압축하지 않았을 때의 토큰 수
+    fits: bool  # 입력 토큰 예산 안에 들어왔는지 (가장 압축해도 넘치면 False)
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.full_tokens - self.prompt_tokens
@@ -0,0 +1,122 @@
+"""견적 프롬프트 조립기
+
+카테고리별 카탈로그 섹션(단계, 기능 목록, 비용)을 미리 렌더링해 두고,
+요청마다 사용자 입력 헤더와 미리 만든 조각들을 이어 붙여 프롬프트를 만듭니다.
+카탈로그가 바뀌면 refresh() 로 조각을 다시 렌더링합니다.
+조각은 압축 단계별(prompt_budget.COMPACTION_LEVELS)로 만들어 두고, plan() 은 입력 토큰 예산에
+들어가는 가장 덜 압축된 단계를 고릅니다.
+"""
+from typing import Dict, Iterable, List, Optional
+
+from catalog import CatalogStep, ServiceCatalog
+from prompt_budget import COMPACTION_LEVELS, PromptPlan, count_tokens
+
+SHORT_FEATURE_COUNT = 2  # short 단계에서 단계별로 남기는 기능 수
+
+INSTRUCTIONS = (
+    "🧾 각 카테고리에 대해 빠짐없이 견적을 제시해 주세요. 일부 항목 누락 없이 전체 범위를 고려해 주세요.\n"
+    "⚠️ 각 카테고리는 독립된 프로젝트 단위로 보고, 개별 견적을 제시해 주세요.\n"
+    "\n💡 동일한 카테고리명(`📂 웹 플랫폼`)은 한 번만 출력하고, 그 아래에 모든 단계와 금액을 나열해 주세요.\n"
+    "\n💡 각 카테고리별 비용 총합(소계)을 마지막 줄에 `💰 소계: ...원` 형식으로 표시해 주세요.\n\n"
+    "우리 회사는 다음과 같은 서비스 카테고리를 제공합니다:\n"
+)
+
+ANSWER_FORMAT = """
+다음 형식으로 각 카테고리에 대해 개별적으로 답변해 주세요:
+
+📂 [카테고리명]
+- 필요한 단계: [금액]원
+- 예상 기간: [기간]
+💰 소계: [카테고리 총 금액]원
+
+이런 형식으로 각 카테고리별 견적을 제시한 후,
+
+💰 총 합계: [전체 금액]원
+"""
+
+
+def render_category_section(category: str, steps: Iterable[CatalogStep], level: int = 0) -> str:
+    """카테고리 하나의 카탈로그 섹션 렌더링 (level: 압축 단계)"""
+    lines = [f"\n📂 {category.replace('_', ' ')}\n"]
+    for step in steps:
+        if level == 0:
+            lines.append(f"  - {step.label}: {' / '.join(step.features)} (비용: {step.cost:,}원)\n")
+        elif level == 1:
+            features = " / ".join(step.features[:SHORT_FEATURE_COUNT])
+            if len(step.features) > SHORT_FEATURE_COUNT:
+                features += f" 외 {len(step.features) - SHORT_FEATURE_COUNT}개"
+            lines.append(f"  - {step.label}: {features} ({step.cost:,}원)\n")
+        else:
+            lines.append(f"  - {step.label}: {step.cost:,}원\n")
+    return "".join(lines)
+
+
+class PromptAssembler:
+    """미리 렌더링한 카탈로그 조각으로 프롬프트를 조립"""
+
+    # 지시문과 답변 형식의 토큰 수 (카탈로그와 무관하므로 한 번만 계산)
+    FIXED_TOKENS = count_tokens(INSTRUCTIONS) + count_tokens(ANSWER_FORMAT)
+
+    def __init__(self, catalog: ServiceCatalog, levels: Optional[List[Dict[str, str]]] = None):
+        if levels is None:
+            self.refresh(catalog)
+        else:
+            # 미리 렌더링해 둔 조각 사용 (시작 아티팩트)
+            self.catalog = catalog
+            self._set_levels(levels)
+
+    def refresh(self, catalog: ServiceCatalog) -> None:
+        """카탈로그 변경 시 카테고리 섹션을 압축 단계별로 다시 렌더링"""
+        self.catalog = catalog
+        self._set_levels([
+            {
+                category: render_category_section(category, steps, level)
+                for category, steps in catalog.by_category.items()
+            }
+            for level in range(len(COMPACTION_LEVELS))
+        ])
+
+    def _set_levels(self, levels: List[Dict[str, str]]) -> None:
+        self.levels = levels
+        self.sections = levels[0]
+        self.section_tokens = [
+            {category: count_tokens(section) for category, section in sections.items()}
+            for sections in levels
+        ]
+
+    @staticmethod
+    def _header(user_input: str, categories: List[str], expected_budget: str, topic: str, period: str) -> str:
+        return (
+            "🧾 사용자가 입력한 정보:\n"
+            f"- 주제: {topic}\n"
+            f"- 산출물: {user_input}\n"
+            f"- 기간: {period}\n"
+            f"- 예상 예산: {expected_budget}\n\n"
+            f"💡 사용자가 요청한 주요 서비스 범주는 `{', '.join(categories)}`입니다.\n\n"
+        )
+
+    def build(self, user_input: str, categories: List[str], expected_budget: str = "",
+              topic: str = "", period: str = "", level: int = 0) -> str:
+        # 중복 제거하면서 순서 유지
+        unique_categories = list(dict.fromkeys(categories))
+        sections = self.levels[level]
+        return "".join([
+            self._header(user_input, unique_categories, expected_budget, topic, period),
+            INSTRUCTIONS,
+            *(sections[category] for category in unique_categories if category in sections),
+            ANSWER_FORMAT,
+        ])
+
+    def plan(self, user_input: str, categories: List[str], expected_budget: str = "",
+             topic: str = "", period: str = "", max_tokens: int = 0) -> PromptPlan:
+        """입력 토큰 예산(max_tokens, 0 이면 제한 없음)에 맞는 압축 단계로 프롬프트 생성"""
+        unique_categories = list(dict.fromkeys(categories))
+        base = count_tokens(self._header(user_input, unique_categories, expected_budget, topic, period)) \
+            + self.FIXED_TOKENS
+        totals = [
+            base + sum(tokens.get(category, 0) for category in unique_categories)
+            for tokens in self.section_tokens
+        ]
+        level = next((i for i, total in enumerate(totals) if not max_tokens or total <= max_tokens), len(totals) - 1)
+        prompt = self.build(user_input, unique_categories, expected_budget, topic, period, level)
+        return PromptPlan(prompt, level, totals[level], totals[0], not max_tokens or totals[level] <= max_tokens)
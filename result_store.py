@@ -0,0 +1,275 @@
+"""완료된 견적 결과 보관소
+
+세션 저장소는 진행 중인 대화와 최근 결과만 짧게 보관하고, 완료된 견적은 이 보관소에 남겨
+며칠 뒤에도 '견적 결과 확인'으로 조회할 수 있게 합니다.
+
+- 결과는 zlib 으로 압축해 추가 전용(append-only) 세그먼트 파일에 기록하고,
+  메모리에는 사용자별 파일 위치 색인과 최근 결과 몇 개(hot_entries)만 둠
+- 레코드: 헤더(crc32, 코덱, 키 길이, 본문 길이, 저장 시각) + 키 + 압축한 JSON 본문
+  (본문 길이 0 은 삭제 표시, 같은 키는 나중 레코드가 우선)
+- 기록과 정리는 잠금 파일(path.lock)의 flock 으로 직렬화하므로 여러 워커 프로세스가 같은 파일을 공유할 수 있음
+  (조회할 때마다 파일 크기와 inode 를 확인해 다른 프로세스가 추가한 레코드나 교체한 파일을 먼저 반영하고,
+  메모리의 최근 결과는 색인의 저장 시각과 같을 때만 사용)
+- compact() 는 보관 기간(retention)이 지난 결과와 덮어쓴 레코드를 빼고 새 파일로 교체
+- 비정상 종료로 끝이 잘린 레코드는 다음 기록 시 잘라냄
+
+환경 변수 (main.py)
+- RESULT_STORE_PATH: 세그먼트 파일 경로 (비우면 사용하지 않음)
+- RESULT_RETENTION_SECONDS: 결과 보관 기간 (기본 7일)
+- RESULT_HOT_ENTRIES: 압축하지 않고 메모리에 둘 최근 결과 수
+"""
+import contextlib
+import fcntl
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# crc32, 코덱, 키 길이, 본문 길이, 저장 시각(unix time)
+_HEADER = struct.Struct("<IBHId")
+
+CODEC_ZLIB = 0
+CODEC_ZLIB_DICT = 1  # 아래 사전을 미리 넣은 zlib (사전을 바꾸면 새 코덱 번호를 추가해야 기존 레코드를 읽을 수 있음)
+
+# 견적 결과에 반복해서 나오는 문구 (짧은 결과도 처음부터 압축되도록 zlib 사전으로 사용)
+ZDICT_V1 = "\n".join([
+    "🖋 주제: ", "🧾 산출물: ", "🕒 기간: ", "💰 예산: ", "개월", "주",
+    "📂 시각화 대시보드", "📂 AI 챗봇", "📂 데이터 엔지니어링", "📂 웹 플랫폼", "📂 모바일앱 플랫폼",
+    "- 기획 요구사항 정의: ", "- 프론트엔드 개발: ", "- 백엔드 개발: ", "- 테스트 QA: ",
+    "- 필요한 단계: ", "- 예상 기간: ", "💰 소계: ", "💰 총 합계: ", ",000,000원", "00,000원",
+    "📊 카탈로그 기준 예상 견적:", "✂️ 예산 ", "에 맞춘 축소안", "⏭️ 향후 업그레이드 항목:", "⚠️ AI 견적 생성 중 오류가 발생해 카탈로그 기준 견적을 안내드립니다.",
+    '{"response": "', '", "user_input": "', '", "shrunk": "', '", "status": "done"}',
+]).encode("utf-8")
+
+_CHUNK = 1 << 20
+
+
+class ResultStore:
+    """최근 결과는 메모리, 나머지는 압축 세그먼트 파일에 두는 결과 보관소"""
+
+    def __init__(self, path: str, hot_entries: int = 256, retention: float = 7 * 86400, level: int = 6):
+        self.path = path
+        self.hot_entries = hot_entries
+        self.retention = retention
+        self.level = level
+        # 키 → (저장 시각, 결과) - 저장 시각이 색인과 다르면 다른 프로세스가 덮어쓰거나 지운 결과
+        self._hot: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # 키 → (레코드 위치, 레코드 길이, 저장 시각)
+        self._index: Dict[str, Tuple[int, int, float]] = {}
+        self._lock = threading.RLock()
+        self._fd = -1
+        self._inode = 0
+        self._scanned = 0  # 색인에 반영한 파일 끝 위치
+
+        # 지표
+        self.hot_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.compactions = 0
+        self._open()
+
+    # 파일 / 색인
+
+    def _open(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        self._inode = os.fstat(self._fd).st_ino
+        self._index = {}
+        self._scanned = 0
+        self._scan()
+
+    @contextlib.contextmanager
+    def _file_lock(self):
+        """프로세스 간 잠금 (fork 한 워커끼리 잠금을 공유하지 않도록 매번 잠금 파일을 새로 열어 사용)"""
+        fd = os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def _records(self, start: int) -> Iterator[Tuple[int, int, str, float, bool]]:
+        """start 부터 온전한 레코드를 (위치, 길이, 키, 저장 시각, 삭제 여부) 로 읽음 (잘리거나 깨진 레코드에서 멈춤)"""
+        buffer = b""
+        base = start
+        while True:
+            chunk = os.pread(self._fd, _CHUNK, base + len(buffer))
+            if not chunk:
+                return
+            buffer += chunk
+            pos = 0
+            while len(buffer) - pos >= _HEADER.size:
+                crc, _, key_length, payload_length, saved_at = _HEADER.unpack_from(buffer, pos)
+                size = _HEADER.size + key_length + payload_length
+                if len(buffer) - pos < size:
+                    break
+                if zlib.crc32(memoryview(buffer)[pos + 4:pos + size]) != crc:
+                    return
+                key = buffer[pos + _HEADER.size:pos + _HEADER.size + key_length].decode("utf-8")
+                yield base + pos, size, key, saved_at, payload_length == 0
+                pos += size
+            buffer = buffer[pos:]
+            base += pos
+
+    def _scan(self) -> None:
+        """색인 이후에 추가된 레코드를 색인에 반영"""
+        for offset, size, key, saved_at, deleted in self._records(self._scanned):
+            if deleted:
+                self._index.pop(key, None)
+            else:
+                self._index[key] = (offset, size, saved_at)
+            self._scanned = offset + size
+
+    def _refresh(self) -> None:
+        """다른 프로세스가 파일을 교체했으면 다시 열고, 파일이 늘어났으면 새로 추가된 레코드만 읽음"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._open()
+            return
+        if stat.st_ino != self._inode:
+            self._open()
+        elif stat.st_size > self._scanned:
+            self._scan()
+
+    def _append(self, key: str, payload: bytes, codec: int, saved_at: float) -> None:
+        key_bytes = key.encode("utf-8")
+        body = _HEADER.pack(0, codec, len(key_bytes), len(payload), saved_at)[4:] + key_bytes + payload
+        record = struct.pack("<I", zlib.crc32(body)) + body
+        with self._file_lock():
+            self._refresh()
+            # 비정상 종료로 잘린 레코드가 끝에 있으면 잘라내고 이어서 기록
+            if os.fstat(self._fd).st_size > self._scanned:
+                os.truncate(self._fd, self._scanned)
+            os.write(self._fd, record)
+        if payload:
+            self._index[key] = (self._scanned, len(record), saved_at)
+        else:
+            self._index.pop(key, None)
+        self._scanned += len(record)
+
+    def _read(self, key: str, entry: Tuple[int, int, float]) -> Dict[str, Any]:
+        offset, size, _ = entry
+        data = os.pread(self._fd, size, offset)
+        _, codec, key_length, _, _ = _HEADER.unpack_from(data)
+        payload = data[_HEADER.size + key_length:]
+        if codec == CODEC_ZLIB_DICT:
+            raw = zlib.decompressobj(zdict=ZDICT_V1).decompress(payload)
+        else:
+            raw = zlib.decompress(payload)
+        return json.loads(raw)
+
+    def _remember(self, key: str, saved_at: float, record: Dict[str, Any]) -> None:
+        self._hot[key] = (saved_at, record)
+        self._hot.move_to_end(key)
+        while len(self._hot) > self.hot_entries:
+            self._hot.popitem(last=False)
+
+    # 공개 API
+
+    def put(self, key: str, record: Dict[str, Any]) -> None:
+        """결과 기록 (같은 키의 이전 결과를 대체)"""
+        compressor = zlib.compressobj(self.level, zdict=ZDICT_V1)
+        raw = json.dumps(record, ensure_ascii=False).encode("utf-8")
+        payload = compressor.compress(raw) + compressor.flush()
+        saved_at = time.time()
+        with self._lock:
+            self._append(key, payload, CODEC_ZLIB_DICT, saved_at)
+            self._remember(key, saved_at, record)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """보관 기간 안의 결과 (없으면 None)"""
+        expires_before = time.time() - self.retention
+        with self._lock:
+            self._refresh()
+            entry = self._index.get(key)
+            if entry is None or entry[2] < expires_before:
+                self._hot.pop(key, None)
+                self.misses += 1
+                return None
+            cached = self._hot.get(key)
+            if cached is not None and cached[0] == entry[2]:
+                self._hot.move_to_end(key)
+                self.hot_hits += 1
+                return cached[1]
+            record = self._read(key, entry)
+            self._remember(key, entry[2], record)
+            self.disk_hits += 1
+            return record
+
+    def delete(self, key: str) -> bool:
+        """결과 삭제 (삭제 표시 레코드를 추가)"""
+        with self._lock:
+            self._hot.pop(key, None)
+            self._refresh()
+            if key not in self._index:
+                return False
+            self._append(key, b"", CODEC_ZLIB, time.time())
+            return True
+
+    def compact(self) -> int:
+        """보관 기간이 지났거나 대체된 레코드를 빼고 파일을 다시 쓴 뒤 줄어든 바이트 수를 반환
+
+        살아 있는 레코드를 복사하는 동안에는 잠그지 않고, 그동안 다른 기록이 추가한 끝부분만
+        잠근 상태에서 이어 붙인 뒤 파일을 교체합니다.
+        """
+        expires_before = time.time() - self.retention
+        with self._lock:
+            self._refresh()
+            live = sorted(entry for entry in self._index.values() if entry[2] >= expires_before)
+            old_size, copied_until, fd = self._scanned, self._scanned, self._fd
+        if sum(size for _, size, _ in live) == old_size:
+            return 0
+
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as out:
+            for offset, size, _ in live:
+                out.write(os.pread(fd, size, offset))
+            with self._file_lock(), self._lock:
+                try:
+                    replaced = os.stat(self.path).st_ino != self._inode
+                except FileNotFoundError:
+                    replaced = True
+                if replaced:  # 다른 프로세스가 먼저 정리함
+                    out.close()
+                    os.unlink(tmp_path)
+                    self._open()
+                    return 0
+                # 복사하는 동안 추가된 레코드를 이어 붙임
+                self._scan()
+                while copied_until < self._scanned:
+                    chunk = os.pread(fd, min(_CHUNK, self._scanned - copied_until), copied_until)
+                    out.write(chunk)
+                    copied_until += len(chunk)
+                out.flush()
+                os.fsync(out.fileno())
+                os.replace(tmp_path, self.path)
+                previous = self._scanned
+                self._open()
+                self.compactions += 1
+                return previous - self._scanned
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fd >= 0:
+                os.close(self._fd)
+                self._fd = -1
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "indexed": len(self._index),
+            "hot": len(self._hot),
+            "segment_bytes": self._scanned,
+            "hot_hits": self.hot_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "compactions": self.compactions,
+        }
@@ -0,0 +1,240 @@
+"""세션 저장소
+
+사용자별 슬롯 상태, 입력 정보, GPT 응답을 보관하는 저장소입니다.
+dict 와 같은 방식(get / [] / pop / in)으로 사용할 수 있으며 두 가지 백엔드를 제공합니다.
+
+- memory: 프로세스 내 LRU + TTL 저장소 (최대 항목 수 제한, 주기적 만료 정리)
+- sqlite: 파일 기반 저장소 (여러 uvicorn 워커 프로세스 간 공유)
+
+환경 변수
+- SESSION_BACKEND: memory(기본) 또는 sqlite
+- SESSION_TTL_SECONDS: 마지막 기록 이후 보관 시간 (기본 86400초)
+- SESSION_MAX_ENTRIES: 저장소별 최대 항목 수 (기본 10000)
+- SESSION_DB_PATH: sqlite 파일 경로 (기본 sessions.db)
+"""
+import abc
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+_MISSING = object()
+
+
+class SessionStore(abc.ABC):
+    """세션 저장소 공통 인터페이스 (메서드를 빠뜨린 백엔드는 만들 때 TypeError)"""
+
+    @abc.abstractmethod
+    def get(self, key: str, default: Any = None) -> Any:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> bool:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def sweep(self) -> int:
+        """만료된 항목을 정리하고 삭제한 개수를 반환"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        """값을 꺼내고 삭제 (백엔드는 다른 요청/프로세스와 같은 값을 두 번 꺼내지 않도록 원자적으로 구현)"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        self.delete(key)
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.set(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        if not self.delete(key):
+            raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at")
+
+    def __init__(self, value: Any, expires_at: float):
+        self.value = value
+        self.expires_at = expires_at
+
+
+class MemorySessionStore(SessionStore):
+    """프로세스 내 LRU + TTL 저장소"""
+
+    def __init__(self, ttl: float = 86400, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            if entry.expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return entry.value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = _Entry(value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            # 최대 항목 수를 넘으면 가장 오래 사용되지 않은 항목부터 제거
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, None)
+        if entry is None or entry.expires_at <= time.monotonic():
+            return default
+        return entry.value
+
+    def sweep(self) -> int:
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, entry in self._data.items() if entry.expires_at <= now]
+            for key in expired:
+                del self._data[key]
+        return len(expired)
+
+    def __len__(self) -> int:
+        """만료되지 않은 항목 수 (아직 정리되지 않은 만료 항목은 세지 않음)"""
+        now = time.monotonic()
+        with self._lock:
+            return sum(1 for entry in self._data.values() if entry.expires_at > now)
+
+
+class SQLiteSessionStore(SessionStore):
+    """SQLite 파일 기반 저장소 (여러 프로세스에서 동시에 사용 가능)"""
+
+    def __init__(self, path: str, namespace: str, ttl: float = 86400, max_entries: int = 10000):
+        self.path = path
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        # fork 이후나 다른 스레드에서는 새 연결을 사용
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS sessions_expiry ON sessions (namespace, expires_at)")
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str, default: Any = None) -> Any:
+        row = self._connect().execute(
+            "SELECT value FROM sessions WHERE namespace = ? AND key = ? AND expires_at > ?",
+            (self.namespace, key, time.time()),
+        ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set(self, key: str, value: Any) -> None:
+        self._connect().execute(
+            "INSERT OR REPLACE INTO sessions (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+            (self.namespace, key, json.dumps(value, ensure_ascii=False), time.time() + self.ttl),
+        )
+
+    def delete(self, key: str) -> bool:
+        cursor = self._connect().execute(
+            "DELETE FROM sessions WHERE namespace = ? AND key = ?", (self.namespace, key)
+        )
+        return cursor.rowcount > 0
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        # 조회와 삭제 사이에 다른 프로세스가 같은 값을 꺼내지 않도록 쓰기 잠금을 잡은 트랜잭션에서 처리
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT value, expires_at FROM sessions WHERE namespace = ? AND key = ?", (self.namespace, key)
+            ).fetchone()
+            if row is not None:
+                conn.execute("DELETE FROM sessions WHERE namespace = ? AND key = ?", (self.namespace, key))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        if row is None or row[1] <= time.time():
+            return default
+        return json.loads(row[0])
+
+    def sweep(self) -> int:
+        conn = self._connect()
+        removed = conn.execute(
+            "DELETE FROM sessions WHERE namespace = ? AND expires_at <= ?", (self.namespace, time.time())
+        ).rowcount
+        # 최대 항목 수를 넘는 경우 만료가 가장 가까운(가장 오래 기록되지 않은) 항목부터 제거
+        removed += conn.execute(
+            "DELETE FROM sessions WHERE namespace = ? AND key IN ("
+            " SELECT key FROM sessions WHERE namespace = ?"
+            " ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self.namespace, self.namespace, self.max_entries),
+        ).rowcount
+        return removed
+
+    def __len__(self) -> int:
+        row = self._connect().execute(
+            "SELECT COUNT(*) FROM sessions WHERE namespace = ? AND expires_at > ?",
+            (self.namespace, time.time()),
+        ).fetchone()
+        return row[0]
+
+
+def create_session_store(namespace: str, ttl: Optional[float] = None) -> SessionStore:
+    """환경 변수 설정에 따라 세션 저장소 생성"""
+    backend = os.getenv("SESSION_BACKEND", "memory").lower()
+    ttl = ttl if ttl is not None else float(os.getenv("SESSION_TTL_SECONDS", 86400))
+    max_entries = int(os.getenv("SESSION_MAX_ENTRIES", 10000))
+
+    if backend == "sqlite":
+        path = os.getenv("SESSION_DB_PATH", "sessions.db")
+        return SQLiteSessionStore(path, namespace, ttl=ttl, max_entries=max_entries)
+    if backend == "memory":
+        return MemorySessionStore(ttl=ttl, max_entries=max_entries)
+    raise ValueError(f"지원하지 않는 SESSION_BACKEND 입니다: {backend}")
@@ -0,0 +1,52 @@
+"""시작 시 사용할 사전 구성 객체 파일
+
+키워드 매칭기, 유사 문자열 색인, 카테고리별 프롬프트 조각을 미리 만들어 파일로 저장해 두고
+서버 시작 시 mmap 으로 읽어 바로 사용합니다.
+키워드 목록이나 카탈로그가 바뀌면 키가 달라져 파일을 무시하고 새로 만듭니다.
+pickle 형식이므로 직접 만든 파일만 사용해야 합니다.
+
+    python startup_artifact.py startup.artifact
+"""
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import sys
+from typing import Any, Dict, Optional
+
+ARTIFACT_VERSION = 4
+
+
+def artifact_key(*parts: Any) -> str:
+    """아티팩트를 만든 입력값의 해시"""
+    raw = json.dumps([ARTIFACT_VERSION, *parts], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def save_artifact(path: str, key: str, objects: Dict[str, Any]) -> None:
+    """임시 파일에 쓴 뒤 교체 (읽는 중인 프로세스가 깨진 파일을 보지 않도록)"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump({"key": key, "objects": objects}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def load_artifact(path: str, key: str) -> Optional[Dict[str, Any]]:
+    """키가 일치하는 아티팩트의 객체들을 반환 (없거나 오래되었거나 읽을 수 없으면 None)"""
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            data = pickle.loads(mapped)
+    except (OSError, ValueError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if not isinstance(data, dict) or data.get("key") != key:
+        return None
+    return data["objects"]
+
+
+if __name__ == "__main__":
+    import main
+
+    path = sys.argv[1] if len(sys.argv) > 1 else (main.STARTUP_ARTIFACT_PATH or "startup.artifact")
+    save_artifact(path, main.STARTUP_ARTIFACT_KEY, main.build_startup_objects())
+    print(f"📦 시작 아티팩트 저장: {path} ({os.path.getsize(path):,} bytes)")
@@ -0,0 +1,256 @@
+"""대화 처리 추적 (trace span)
+
+웹훅 턴 하나를 루트 span 으로 두고 슬롯 추출, 유사도 매칭, 견적 작업 등록, 견적 생성, LLM 호출을
+하위 span 으로 기록합니다. 파일에는 OpenTelemetry OTLP/JSON 형식(한 줄에 resourceSpans 하나)으로 추가하므로
+OpenTelemetry Collector 의 otlpjsonfile 수신기로 그대로 읽을 수 있습니다.
+
+- 샘플링은 trace id 로 정하므로 한 턴의 span 은 모두 기록되거나 모두 버려짐
+- 샘플링되지 않은 턴도 slow_seconds 이상 걸렸거나 오류가 난 경우에는 기록 (느리거나 반복되는 턴 추적용)
+- 현재 span 은 contextvars 로 전달됨. 스레드 풀이나 응답 후 실행되는 백그라운드 작업처럼
+  컨텍스트가 이어지지 않는 곳에는 parent 로 span 을 직접 넘기거나 bind() 로 감싸고,
+  다른 프로세스(worker.py)에는 W3C traceparent 문자열로 전달
+- 가장 바깥 span 을 내보낸 뒤에 끝난 하위 span (타임아웃 후에 끝난 LLM 호출 등)은 같은 trace 로 따로 내보냄
+
+    tail -n 1 traces.jsonl | python -m json.tool
+"""
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Union
+
+# OTLP span kind / status code
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+STATUS_ERROR = 2
+
+_CURRENT: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar("current_span", default=None)
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}  # OTLP/JSON 은 64비트 정수를 문자열로 표기
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(item) for item in value]}}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+class Span:
+    """기록 중인 span 하나"""
+
+    __slots__ = ("name", "kind", "trace_id", "span_id", "parent_id", "sampled", "is_root", "local_root",
+                 "attributes", "events", "error", "start_ns", "end_ns", "_started", "_finished")
+
+    def __init__(self, name: str, kind: int, trace_id: str, parent_id: str, sampled: bool,
+                 local_root: Optional["Span"], attributes: Dict[str, Any]):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.is_root = not parent_id
+        self.local_root = local_root or self  # 이 프로세스/작업 안에서 가장 바깥 span (여기서 한꺼번에 내보냄)
+        self.attributes = attributes
+        self.events: List[Dict[str, Any]] = []
+        self.error = ""
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self._started = time.perf_counter_ns()
+        self._finished: Optional[List[Span]] = []  # 끝난 하위 span (내보낸 뒤에는 None)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def add_event(self, name: str, **attributes: Any) -> None:
+        self.events.append({"timeUnixNano": str(time.time_ns()), "name": name, "attributes": _otlp_attributes(attributes)})
+
+    def record_error(self, error: Union[BaseException, str]) -> None:
+        self.error = str(error) or type(error).__name__
+        if isinstance(error, BaseException):
+            self.add_event("exception", **{"exception.type": type(error).__name__, "exception.message": str(error)})
+
+    @property
+    def duration(self) -> float:
+        """초 단위 소요 시간 (끝나지 않았으면 지금까지)"""
+        if self.end_ns:
+            return (self.end_ns - self.start_ns) / 1e9
+        return (time.perf_counter_ns() - self._started) / 1e9
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _otlp_attributes(self.attributes),
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.events:
+            span["events"] = self.events
+        if self.error:
+            span["status"] = {"code": STATUS_ERROR, "message": self.error}
+        return span
+
+
+class _NoopSpan:
+    """추적을 끈 경우 사용하는 아무것도 기록하지 않는 span"""
+
+    sampled = False
+    traceparent = ""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, **attributes: Any) -> None:
+        pass
+
+    def add_event(self, name: str, **attributes: Any) -> None:
+        pass
+
+    def record_error(self, error: Union[BaseException, str]) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class FileSpanExporter:
+    """span 묶음을 OTLP/JSON 한 줄로 파일에 추가 (fork 한 프로세스도 같은 파일에 기록할 수 있도록 한 번의 write 로 기록)"""
+
+    def __init__(self, path: str, service_name: str = "kakao-estimate-bot"):
+        self.path = path
+        self.service_name = service_name
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        line = json.dumps({"resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": self.service_name, "process.pid": os.getpid()})},
+            "scopeSpans": [{"scope": {"name": "kakao.webhook"}, "spans": [span.to_otlp() for span in spans]}],
+        }]}, ensure_ascii=False) + "\n"
+        with self._lock:
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, line.encode("utf-8"))
+            finally:
+                os.close(fd)
+
+
+class Tracer:
+    """span 을 만들고 가장 바깥 span 이 끝날 때 샘플링 여부에 따라 내보냄"""
+
+    def __init__(self, exporter: Optional[FileSpanExporter] = None, sample_rate: float = 0.1, slow_seconds: float = 1.0):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.slow_seconds = slow_seconds
+        self._lock = threading.Lock()  # 실행기 스레드에서 끝나는 span 과 묶음 교체를 직렬화
+
+        # 지표
+        self.exported = 0
+        self.dropped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def current_span(self) -> Union[Span, _NoopSpan]:
+        return _CURRENT.get() or NOOP_SPAN
+
+    def _start(self, name: str, kind: int, parent: Union[Span, _NoopSpan, str, None], attributes: Dict[str, Any]) -> Span:
+        if parent is None:
+            parent = _CURRENT.get()
+        if isinstance(parent, Span):
+            # 부모가 이미 끝났으면(응답 후 실행되는 작업 등) 이 span 에서 따로 내보냄
+            local_root = parent.local_root if not parent.end_ns else None
+            return Span(name, kind, parent.trace_id, parent.span_id, parent.sampled, local_root, attributes)
+        if isinstance(parent, str) and parent.count("-") == 3:
+            # 다른 프로세스에서 전달한 W3C traceparent (00-trace_id-span_id-flags)
+            _, trace_id, parent_id, flags = parent.split("-")
+            return Span(name, kind, trace_id, parent_id, flags == "01", None, attributes)
+        trace_id = f"{random.getrandbits(128):032x}"
+        sampled = int(trace_id[:8], 16) < self.sample_rate * 0x100000000
+        return Span(name, kind, trace_id, "", sampled, None, attributes)
+
+    def _finish(self, span: Span) -> None:
+        span.end_ns = span.start_ns + (time.perf_counter_ns() - span._started)
+        root = span.local_root
+        with self._lock:
+            late = root._finished is None
+            if not late:
+                root._finished.append(span)
+                if root is not span:
+                    return
+                spans, span._finished = span._finished, None
+        if late:
+            # 묶음을 이미 내보낸 뒤에 끝난 span (타임아웃으로 턴이 먼저 끝난 뒤의 LLM 호출 등)은 따로 내보냄
+            spans = [span]
+            if root.sampled:
+                span.sampled = True
+        # 샘플링되지 않았어도 오류가 있거나 느린 턴은 기록하고, 이후 이어지는 작업도 기록되도록 표시
+        if not span.sampled and (any(s.error for s in spans) or (span.is_root and span.duration >= self.slow_seconds)):
+            span.sampled = True
+        if not span.sampled:
+            self.dropped += len(spans)
+            return
+        try:
+            self.exporter.export(spans)
+            self.exported += len(spans)
+        except OSError as e:
+            self.dropped += len(spans)
+            print(f"⚠️ 추적 정보를 기록하지 못했습니다 ({self.exporter.path}): {e}")
+
+    @contextlib.contextmanager
+    def span(self, name: str, kind: int = SPAN_KIND_INTERNAL, parent: Union[Span, _NoopSpan, str, None] = None,
+             **attributes: Any) -> Iterator[Union[Span, _NoopSpan]]:
+        """span 을 시작하고 현재 span 으로 설정 (parent: 이어 붙일 span 또는 traceparent, 없으면 현재 span)"""
+        if self.exporter is None:
+            yield NOOP_SPAN
+            return
+        span = self._start(name, kind, parent, attributes)
+        token = _CURRENT.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            _CURRENT.reset(token)
+            self._finish(span)
+
+    def bind(self, name: str, func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        """지금의 span 을 부모로 하는 span 안에서 func 를 실행하는 함수 (응답 후 실행되는 백그라운드 작업용)"""
+        parent = _CURRENT.get()
+        if self.exporter is None or parent is None:
+            return func
+
+        @functools.wraps(func)
+        async def traced(*args, **kwargs):
+            with self.span(name, parent=parent):
+                return await func(*args, **kwargs)
+        return traced
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, "sample_rate": self.sample_rate, "exported": self.exported, "dropped": self.dropped}
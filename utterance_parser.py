@@ -0,0 +1,239 @@
+"""발화에서 기간/예산 수량을 한 번에 추출하는 파서
+
+미리 컴파일한 정규식 하나로 발화를 토큰으로 나누고, 토큰을 한 번만 훑으면서
+숫자(아라비아 숫자, 한자어 수사 "삼백", 고유어 수사 "두 달")와 단위를 묶어 수량으로 만듭니다.
+
+- 예산: 조/억/만/천/백/십 + 원 (예: 500만원, 1억 5천만원, 삼백만원, 300~500만원)
+  단위 "원" 이 없으면 억/조 단위일 때만 예산으로 인정
+- 기간: 개월/달/주 (예: 3개월, 두 달, 6주, 2~3개월, 이삼 개월, 일주일)
+  "사주", "이주", "이 달" 처럼 다른 뜻이 흔한 한자어 수사 + 주/달 조합은 기간으로 보지 않음
+  (한자어 수사 + 개월/주일은 기간, 띄어 쓴 경우는 개월만 인정)
+"""
+import re
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple
+
+_TOKEN_PATTERNS = (
+    r"(?P<num>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)"
+    r"|(?P<period>개월|달(?!러)|주(?:일|간)?(?![제문소년식말]))"
+    r"|(?P<big>조|억|만)"
+    r"|(?P<small>천|백|십)"
+    r"|(?P<won>원)"
+    r"|(?P<native>하나|다섯|여섯|일곱|여덟|아홉|한|두|둘|세|셋|석|넉|네|넷|열)"
+    r"|(?P<sino>[영일이삼사오육칠팔구])"
+    r"|(?P<range>~|∼|〜|-|에서)"
+    r"|(?P<space>\s+)"
+)
+_TOKEN_RE = re.compile(_TOKEN_PATTERNS)
+
+# 단위 토큰을 하나 이상 포함한, 토큰이 연속된 구간
+# (단위가 없는 구간과 구간 밖의 문자는 수량이 될 수 없으므로 정규식 엔진 안에서 건너뜀)
+_ANY_TOKEN = re.sub(r"\?P<\w+>", "?:", _TOKEN_PATTERNS)
+_NUMBER_TOKEN = r"\d|[영일이삼사오육칠팔구십백천]|하나|다섯|여섯|일곱|여덟|아홉|[한두둘세셋석넉네넷열]"
+_UNIT_TOKEN = r"개월|달(?!러)|주(?:일|간)?(?![제문소년식말])|[조억만천백십원]"
+_SPAN_RE = re.compile(f"(?={_NUMBER_TOKEN})(?:{_ANY_TOKEN})*?(?:{_UNIT_TOKEN})(?:{_ANY_TOKEN})*")
+_UNIT_CHARS_RE = re.compile(r"[개달주조억만천백십원]")
+_SPACED_MONTHS_RE = re.compile(r"\s+개월")  # 한자어 수사와 띄어 쓴 기간 단위 ("삼 개월")
+
+_SINO_DIGITS = {ch: i for i, ch in enumerate("영일이삼사오육칠팔구")}
+_NATIVE_NUMBERS = {
+    "한": 1, "하나": 1, "두": 2, "둘": 2, "세": 3, "셋": 3, "석": 3, "네": 4, "넉": 4, "넷": 4,
+    "다섯": 5, "여섯": 6, "일곱": 7, "여덟": 8, "아홉": 9, "열": 10,
+}
+_SMALL_UNITS = {"십": 10, "백": 100, "천": 1000}
+_BIG_UNITS = {"만": 10 ** 4, "억": 10 ** 8, "조": 10 ** 12}
+
+
+class Quantity(NamedTuple):
+    kind: str  # "budget" / "period"
+    low: int  # 범위가 아니면 high 와 같음
+    high: int
+    unit: str  # 예산은 "원", 기간은 "개월" / "주"
+    start: int
+    end: int
+
+
+class ParsedUtterance(NamedTuple):
+    budget: str  # 정규화된 예산 (예: 5,000,000원, 3,000,000~5,000,000원), 없으면 ""
+    period: str  # 정규화된 기간 (예: 3개월, 2~3개월, 6주), 없으면 ""
+    budget_value: int  # 예산 상한 (원), 없으면 0
+    quantities: Tuple[Quantity, ...]
+
+
+_EMPTY = ParsedUtterance("", "", 0, ())
+
+
+class _Number:
+    """아직 단위가 정해지지 않은 수 표현 (예: "1억 5천", "삼백")"""
+    __slots__ = ("start", "total", "group", "current", "kind", "numbers", "units", "last_big")
+
+    def __init__(self, start: int):
+        self.start = start
+        self.total = 0.0  # 만/억/조 단위까지 확정된 값
+        self.group = 0.0  # 만 미만 자리 (천/백/십 적용 값)
+        self.current: Optional[float] = None  # 단위가 붙지 않은 마지막 숫자
+        self.kind = ""  # 마지막 숫자 종류 (num / sino / native)
+        self.numbers = 0
+        self.units: List[str] = []
+        self.last_big = ""
+
+    def value(self) -> float:
+        return self.total + self.group + (self.current or 0)
+
+
+def _apply_units(number: float, units: List[str]) -> float:
+    """숫자에 단위 목록을 차례로 적용 (300, [만] → 3,000,000)"""
+    total, group, current = 0.0, 0.0, number
+    for unit in units:
+        if unit in _SMALL_UNITS:
+            group += (current if current is not None else 1) * _SMALL_UNITS[unit]
+        else:
+            group += current or 0
+            total += (group or 1) * _BIG_UNITS[unit]
+            group = 0.0
+        current = None
+    return total + group + (current or 0)
+
+
+def _range_low_budget(low: _Number, high: _Number) -> Optional[float]:
+    """범위 앞쪽 금액에 뒤쪽 단위를 나눠 적용 (300~500만원, 5천~7천만원, 3~5천만원)"""
+    if low.total:
+        return low.value()
+    if not low.units and high.numbers == 1:
+        return _apply_units(low.value(), high.units)
+    if all(unit in _SMALL_UNITS for unit in low.units):
+        return _apply_units(low.value(), [unit for unit in high.units if unit in _BIG_UNITS])
+    return None
+
+
+def _round_half_up(value: float) -> int:
+    """소수 수량을 반올림 (round() 는 짝수 쪽으로 반올림하므로 2.5개월 → 2 가 됨)"""
+    return int(value + 0.5)
+
+
+def format_budget(low: int, high: int) -> str:
+    return f"{high:,}원" if low == high else f"{low:,}~{high:,}원"
+
+
+def format_period(low: int, high: int, unit: str) -> str:
+    return f"{high}{unit}" if low == high else f"{low}~{high}{unit}"
+
+
+@lru_cache(maxsize=4096)
+def parse_utterance(text: str) -> ParsedUtterance:
+    """발화를 한 번 훑어 예산/기간 수량을 모두 추출 ("3개월", "500만원" 처럼 반복되는 발화는 캐시)"""
+    if _UNIT_CHARS_RE.search(text) is None:
+        return _EMPTY
+    quantities: List[Quantity] = []
+    number: Optional[_Number] = None
+    low: Optional[_Number] = None  # 범위 앞쪽 수 표현 (300~500만원 의 300)
+    merge: Optional[int] = None  # 범위 앞쪽이 이미 완성된 수량일 때 그 위치 (2개월~3개월)
+
+    def emit(kind: str, unit: str, end: int):
+        nonlocal number, low, merge
+        high = number.value()
+        low_value, start = high, number.start
+        if low is not None:
+            if kind == "budget":
+                value = _range_low_budget(low, number)
+            else:
+                value = None if low.units else low.value()
+            if value is not None and value < high:
+                low_value, start = value, low.start
+        quantity = Quantity(kind, _round_half_up(low_value), _round_half_up(high), unit, start, end)
+        previous = quantities[merge] if merge is not None else None
+        if previous is not None and previous.kind == kind and previous.unit == unit and previous.high < quantity.high:
+            quantities[merge] = quantity._replace(low=previous.low, start=previous.start)
+        else:
+            quantities.append(quantity)
+        number, low, merge = None, None, None
+
+    def flush(end: int):
+        """수 표현이 끝났을 때 억/조 단위 금액이면 예산으로 인정"""
+        nonlocal number, low, merge
+        if number is not None and number.last_big in ("억", "조") and number.current is None:
+            emit("budget", "원", end)
+        number, low, merge = None, None, None
+
+    for span in _SPAN_RE.finditer(text):
+        for match in _TOKEN_RE.finditer(text, span.start(), span.end()):
+            kind, token = match.lastgroup, match.group()
+
+            if kind == "space":
+                if (number is not None and number.kind == "sino" and number.current is not None and not number.units
+                        and not _SPACED_MONTHS_RE.match(text, match.start())):
+                    number = None  # "예산이 백만원" 처럼 조사로 쓰인 한자어 수사는 버림
+                continue
+
+            if kind in ("num", "sino", "native"):
+                if kind == "num":
+                    value = float(token.replace(",", ""))
+                elif kind == "sino":
+                    value = float(_SINO_DIGITS[token])
+                else:
+                    value = float(_NATIVE_NUMBERS[token])
+                if number is None:
+                    number = _Number(match.start())
+                elif (number.current is not None and kind == number.kind != "num" and not number.units
+                      and value == number.current + 1):
+                    # "이삼개월", "두세 달" 처럼 이어진 수사는 범위로 처리
+                    low, number = number, _Number(match.start())
+                number.current = value
+                number.kind = kind
+                number.numbers += 1
+                continue
+
+            if kind in ("small", "big", "won") and number is not None and number.kind == "native":
+                number = None  # 고유어 수사는 기간에만 사용 ("네 천만원" 의 "네")
+
+            if kind == "small":
+                if number is None:
+                    number = _Number(match.start())
+                number.group += (number.current if number.current is not None else 1) * _SMALL_UNITS[token]
+                number.current = None
+                number.kind = "unit"
+                number.units.append(token)
+                continue
+
+            if kind == "range":
+                if number is not None:
+                    low, number, merge = number, None, None
+                elif quantities and not text[quantities[-1].end:match.start()].strip():
+                    merge = len(quantities) - 1
+                continue
+
+            if number is None:
+                low, merge = None, None
+                continue
+
+            if kind == "big":
+                number.group += number.current or 0
+                number.total += (number.group or 1) * _BIG_UNITS[token]
+                number.group = 0.0
+                number.current = None
+                number.kind = "unit"
+                number.units.append(token)
+                number.last_big = token
+            elif kind == "won":
+                emit("budget", "원", match.end())
+            elif (number.total or any(unit != "십" for unit in number.units)
+                  or (number.kind == "sino" and token not in ("개월", "주일"))):
+                number, low, merge = None, None, None  # 금액 단위가 붙은 수 / "사주" 같은 조합은 기간이 아님
+            else:
+                emit("period", "개월" if token in ("개월", "달") else "주", match.end())
+        flush(span.end())  # 구간 사이의 다른 문자
+
+    if not quantities:
+        return _EMPTY
+    budget = period = None
+    for quantity in quantities:
+        if quantity.kind == "budget":
+            budget = budget or quantity
+        else:
+            period = period or quantity
+    return ParsedUtterance(
+        budget=format_budget(budget.low, budget.high) if budget else "",
+        period=format_period(period.low, period.high, period.unit) if period else "",
+        budget_value=budget.high if budget else 0,
+        quantities=tuple(quantities),
+    )
@@ -0,0 +1,121 @@
+"""견적 생성 워커
+
+ESTIMATE_QUEUE=sqlite 로 실행한 웹 프로세스가 등록한 작업을 가져가 GPT 견적을 생성합니다.
+웹 프로세스와 별도로 필요한 만큼 실행할 수 있고, 종료되어도 작업은 큐에 남아 다른 워커가 이어서 처리합니다.
+
+    ESTIMATE_QUEUE=sqlite SESSION_BACKEND=sqlite uvicorn main:app
+    SESSION_BACKEND=sqlite python worker.py --concurrency 4
+"""
+import argparse
+import asyncio
+import signal
+import time
+
+import main
+from job_queue import DONE, Job, JobQueue
+
+
+async def keep_lease(queue: JobQueue, job_id: str):
+    """처리하는 동안 주기적으로 lease 연장"""
+    while True:
+        await asyncio.sleep(queue.lease_seconds / 3)
+        queue.touch(job_id)
+
+
+async def run_job(queue: JobQueue, job: Job):
+    payload = job.payload
+    heartbeat = asyncio.create_task(keep_lease(queue, job.job_id))
+
+    async def generate():
+        # 웹 프로세스에서 작업을 등록한 턴의 추적에 이어서 기록
+        with main.TRACER.span("estimate.job", parent=payload.get("traceparent"),
+                              **{"job.id": job.job_id, "job.attempt": job.attempts}):
+            return await main.process_gpt(
+                job.user_id,
+                payload["user_input"],
+                payload.get("topic", ""),
+                payload.get("output", ""),
+                payload.get("expected_budget", ""),
+                payload.get("period", ""),
+            )
+
+    task = asyncio.ensure_future(generate())
+    try:
+        if job.user_id in main.KAKAO_CALLBACKS:
+            # 콜백 유효 시간(작업 등록 시점부터)이 지나면 그때까지의 견적을 먼저 보내고 생성은 계속 진행
+            remaining = job.created_at + main.KAKAO_CALLBACK_DEADLINE_SECONDS - time.time()
+            try:
+                await asyncio.wait_for(asyncio.shield(task), max(0.0, remaining))
+            except asyncio.TimeoutError:
+                await main.send_pending_callback(job.user_id)
+        status, response = await task
+    except Exception as e:
+        # 결과를 안내하기 전에 실패했으므로 재시도 횟수가 남아 있으면 다시 대기열로
+        queue.fail(job.job_id, str(e))
+        print(f"⚠️ 작업 처리 실패 ({job.job_id}, {job.attempts}회차): {e}")
+        return
+    finally:
+        heartbeat.cancel()
+        # 웹 프로세스가 콜백 응답으로 답한 요청이면 결과(실패 시 카탈로그 기준 견적)를 콜백 URL 로 전송
+        await main.send_pending_callback(job.user_id)
+
+    if status == DONE:
+        queue.complete(job.job_id, response)
+    else:
+        # 카탈로그 기준 견적을 이미 안내(콜백 전송 포함)했으므로 재시도해서 덮어쓰지 않고 종료
+        queue.fail(job.job_id, status, response, retry=False)
+
+
+async def work(queue: JobQueue, stop: asyncio.Event, poll_interval: float):
+    """작업을 하나씩 가져와 처리 (대기 작업이 없으면 poll_interval 만큼 쉼)"""
+    while not stop.is_set():
+        job = queue.claim()
+        if job is None:
+            try:
+                await asyncio.wait_for(stop.wait(), poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            continue
+        await run_job(queue, job)
+
+
+async def purge_finished_jobs(queue: JobQueue, stop: asyncio.Event, retention: float):
+    """완료/실패 후 보관 기간이 지난 작업 정리"""
+    while not stop.is_set():
+        queue.purge(retention)
+        try:
+            await asyncio.wait_for(stop.wait(), 600)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run(args):
+    queue = main.JOB_QUEUE or JobQueue(
+        main.JOB_QUEUE_PATH, max_attempts=main.JOB_MAX_ATTEMPTS, lease_seconds=main.JOB_LEASE_SECONDS
+    )
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    started = time.monotonic()
+    print(f"🛠️ 견적 워커 시작: {queue.path} (동시 처리 {args.concurrency}건)")
+    await asyncio.gather(
+        purge_finished_jobs(queue, stop, args.retention),
+        *(work(queue, stop, args.poll_interval) for _ in range(args.concurrency)),
+    )
+    await main.CALLBACK_CLIENT.close()
+    main.ESTIMATE_EXECUTOR.shutdown()
+    print(f"🛠️ 견적 워커 종료 ({time.monotonic() - started:.0f}초 실행, 작업 현황: {queue.counts()})")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 처리할 작업 수")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="대기 작업이 없을 때 다시 확인하는 간격(초)")
+    parser.add_argument("--retention", type=float, default=86400, help="완료/실패 작업 보관 기간(초)")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main_cli()